@@ -4,6 +4,7 @@ import sys
 
 
 from easier68k.assembler import assembler
+from easier68k.assembler.project import Project
 
 from util import split_args, autocomplete_file
 from subcommandline_run import subcommandline_run
@@ -30,7 +31,7 @@ class CLI(cmd.Cmd):
             in_file = open(args[0])
             
             out_file = open(args[1], 'w') if length == 2 else sys.stdout
-            assembled, issues = assembler.parse(in_file.read(-1))
+            assembled, issues = assembler.parse(in_file.read(-1), path=args[0])
             
             
             pretty_json = json.loads(assembled.to_json())
@@ -54,6 +55,35 @@ class CLI(cmd.Cmd):
         print('syntax: assemble in_file[, out_file]')
         print('reads in and assembles the assembly from in_file and outputs the list file to out_file if specified or to stdout')
         print('')
+
+
+    def do_build(self, args):
+        args = split_args(args, 1, 1)
+        if(args == None):
+            return False
+
+        try:
+            assembled, issues = Project(args[0]).build()
+
+            pretty_json = json.dumps(json.loads(assembled.to_json()), indent=4, sort_keys=True)
+            if len(args) == 2:
+                with open(args[1], 'w') as out_file:
+                    out_file.write(pretty_json)
+            else:
+                sys.stdout.write(pretty_json)
+
+            if(len(issues) != 0):
+                print('----- ISSUES -----')
+                for issue in issues:
+                    print('{}: {}\n'.format(issue[1], issue[0]))
+        except FileNotFoundError as not_found:
+            print('[Error] file: ' + str(not_found) + ' does not exist')
+
+    def help_build(self):
+        print('syntax: build main_file[, out_file]')
+        print('assembles main_file and the files it includes, only assembling the files which changed since the last build')
+        print('and outputs the list file to out_file if specified or to stdout')
+        print('')
         
         
     # run a sub-command line with options like step instruction, run, print registers, etc...
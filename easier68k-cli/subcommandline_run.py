@@ -4,6 +4,7 @@ from easier68k.simulator.m68k import M68K
 from easier68k.simulator.memory import Memory
 from easier68k.core.models.list_file import ListFile
 from easier68k.core.enum.register import Register
+from easier68k.core.enum.stop_reason import StopReason
 from util import split_args, long_hex, autocomplete_file, autocomplete_getarg
 
 class Run_CLI(cmd.Cmd):
@@ -18,7 +19,7 @@ class Run_CLI(cmd.Cmd):
     
     def do_run(self, args):
         self.simulator.clock_auto_cycle = True
-        self.simulator.run()
+        self.print_stop(self.simulator.run())
         
     def do_step(self, args):
         self.simulator.clock_auto_cycle = False
@@ -197,7 +198,110 @@ class Run_CLI(cmd.Cmd):
         print('accessing values outside of memory causes an error')
         print('assigning a value larger or smaller than the range can hold is an error')
     
-    # break points when we add that too!
+    def print_stop(self, reason):
+        """prints why the simulator stopped running"""
+        if(reason == StopReason.HALTED):
+            print('halted')
+        elif(reason == StopReason.BREAKPOINT):
+            print('stopped at breakpoint ' + long_hex(self.simulator.triggered_breakpoint))
+        elif(reason == StopReason.WATCHPOINT):
+            print('stopped by ' + str(self.simulator.memory.triggered_watchpoint) +
+                  ' accessed at ' + long_hex(self.simulator.memory.triggered_location))
+        elif(reason == StopReason.WAITING_FOR_INPUT):
+            print('stopped waiting for input')
+        elif(reason == StopReason.ERROR):
+            print('[ERROR] ' + repr(self.simulator.last_error))
+    
+    
+    
+    def do_break(self, args):
+        args = split_args(args, 0, 1)
+        if(args == None):
+            return False
+        
+        if(len(args) == 0):
+            # list them
+            for location in sorted(self.simulator.breakpoints):
+                print(long_hex(location))
+        else:
+            self.simulator.add_breakpoint(int(args[0], 0))
+    
+    def help_break(self):
+        print('syntax: break [location]')
+        print('stops running before the instruction at location is executed')
+        print('if no location is given then all of the breakpoints are printed')
+    
+    
+    
+    def do_watch(self, args):
+        args = split_args(args, 0, 3)
+        if(args == None):
+            return False
+        
+        memory = self.simulator.memory
+        if(len(args) == 0):
+            # list them
+            for watchpoint in memory.get_watchpoints():
+                print(watchpoint)
+            return False
+        
+        location = int(args[0], 0)
+        length = 1
+        if(len(args) > 1):
+            length = int(args[1], 0)
+        mode = 'w'
+        if(len(args) > 2):
+            mode = args[2].lower()
+        
+        if(mode not in ['r', 'w', 'rw']):
+            print('[ERROR] unrecognized watch mode ' + mode)
+            return False
+        
+        memory.add_watchpoint(location, length, on_read='r' in mode, on_write='w' in mode)
+    
+    def help_watch(self):
+        print('syntax: watch [location, length, mode]')
+        print('stops running after an instruction accesses memory in the range [location, location+length)')
+        print('mode is r to stop on reads, w to stop on writes or rw for both, w by default')
+        print('length is 1 by default')
+        print('if no location is given then all of the watchpoints are printed')
+    
+    
+    
+    def do_delete(self, args):
+        args = split_args(args, 2, 0)
+        if(args == None):
+            return False
+        
+        kind = args[0].lower()
+        location = int(args[1], 0)
+        if(kind == 'break'):
+            self.simulator.remove_breakpoint(location)
+        elif(kind == 'watch'):
+            memory = self.simulator.memory
+            for watchpoint in memory.get_watchpoints():
+                if(watchpoint.location == location):
+                    memory.remove_watchpoint(watchpoint)
+        else:
+            print('[ERROR] expected break or watch, but got ' + args[0])
+            return False
+    
+    def help_delete(self):
+        print('syntax: delete break|watch, location')
+        print('removes the breakpoint or the watchpoints starting at location')
+    
+    def complete_delete(self, text, line, begidx, endidx):
+        arg = autocomplete_getarg(line).lower()
+        return [x for x in ['break', 'watch'] if x.find(arg) == 0]
+    
+    
+    
+    def do_continue(self, args):
+        self.print_stop(self.simulator.resume())
+    
+    def help_continue(self):
+        print('syntax: continue')
+        print('continues running from a breakpoint or watchpoint')
     
 
 def subcommandline_run(file_name):
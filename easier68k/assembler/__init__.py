@@ -1,3 +1,4 @@
 __all__ = [
-    'assembler'
-]
\ No newline at end of file
+    'assembler',
+    'project'
+]
@@ -2,7 +2,9 @@ from ..core.util.parsing import strip_comments, has_label, get_label, strip_labe
     parse_literal
 import types
 import re
+import os
 import binascii
+from concurrent.futures import ProcessPoolExecutor
 from ..core import opcodes
 from ..core.models.list_file import ListFile
 
@@ -13,6 +15,12 @@ from ..core.opcodes import *
 
 MAX_MEMORY_LOCATION = 16777216  # 2^24
 
+# the fewest lines to encode that are spread across processes, for less it takes longer to start them
+MIN_PARALLEL_LINES = 4096
+
+# the encoding that included source files are read with
+SOURCE_ENCODING = 'utf-8'
+
 
 def for_line_stripped_comments(full_text: str):
     for line_index, line in enumerate(full_text.splitlines()):
@@ -33,6 +41,118 @@ def for_line_opcode_parse(full_text: str):
         yield get_label(stripped) if has_label(stripped) else None, get_opcode(stripped), strip_opcode(stripped)
 
 
+class AssemblyLine:
+    """
+    One line of source, split into its parts once so that every pass can use them
+    """
+
+    def __init__(self, line_number: int, label: str, opcode: str, contents: str, label_contents: str = '',
+                 file: str = None):
+        """
+        Constructor
+        :param line_number: the line number in the source, starting at 1
+        :param label: the label on the line, or None
+        :param opcode: the opcode, in upper case with its size (e.g. 'MOVE.B')
+        :param contents: the operands of the opcode, with symbols not yet replaced
+        :param label_contents: everything after the label
+        :param file: the path of the file the line is in, or None if it isn't from a file
+        """
+        self.line_number = line_number
+        self.label = label
+        self.opcode = opcode
+        self.contents = contents
+        self.label_contents = label_contents
+        self.file = file
+
+        # the contents of the file an INCBIN includes
+        self.data = None
+
+        # the class that assembles the opcode, found by the sizing pass
+        self.op_class = None
+
+        # where the line is assembled to and its length in words, found by the sizing pass
+        self.location = None
+        self.length = 0
+
+
+def split_line(line: str) -> tuple:
+    """
+    Splits a line of source into its parts
+
+    >>> split_line('a MOVE.B D0, D1 ; copy')
+    ('a', 'MOVE.B', 'D0, D1', 'MOVE.B D0, D1')
+
+    >>> split_line('  ; nothing here')
+
+    :param line: the line, with its comments
+    :return: the label (or None), opcode, opcode contents and everything after the label,
+        or None if there is nothing on the line besides comments
+    """
+    stripped = strip_comments(line)
+    if not stripped.strip():
+        return None
+
+    if has_label(stripped):
+        label = get_label(stripped)
+        label_contents = strip_label(stripped).strip()
+    else:
+        label = None
+        label_contents = ''
+    return label, get_opcode(stripped), strip_opcode(stripped), label_contents
+
+
+def split_lines(text: str) -> list:
+    """
+    Splits the source into the lines which have something on them besides comments
+
+    >>> [(line.line_number, line.label, line.opcode, line.contents) for line in split_lines('a MOVE.B D0, D1\\n\\n TRAP #15 ; done')]
+    [(1, 'a', 'MOVE.B', 'D0, D1'), (3, None, 'TRAP', '#15')]
+
+    :param text: The file text to parse
+    :return: An AssemblyLine for each line
+    """
+    lines = []
+    for line_index, line in enumerate(text.splitlines()):
+        parts = split_line(line)
+        if parts is not None:
+            label, opcode, contents, label_contents = parts
+            lines.append(AssemblyLine(line_index + 1, label, opcode, contents, label_contents))
+    return lines
+
+
+def get_include_path(contents: str, including_file: str = None) -> str:
+    """
+    Gets the path of the file that an INCLUDE or INCBIN refers to
+    Paths are relative to the directory of the file they are in
+
+    >>> get_include_path("'defs.x68'", 'src/main.x68').replace('\\\\', '/')
+    'src/defs.x68'
+
+    >>> get_include_path('defs.x68')
+    'defs.x68'
+
+    :param contents: the operand of the directive, the path with or without quotes
+    :param including_file: the path of the file with the directive, or None
+    :return: the path
+    """
+    path = contents.strip()
+    if len(path) >= 2 and path[0] == path[-1] and path[0] in '\'"':
+        path = path[1:-1]
+    if including_file is not None and not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(including_file), path)
+    return path
+
+
+def read_file(path: str) -> bytes:
+    """
+    Reads the whole of a file
+    :param path:
+    :return:
+    """
+    with open(path, 'rb') as file:
+        return file.read()
+
+
 def find_labels(text: str) -> (dict, dict, list):
     """
     Finds all labels from a file
@@ -40,40 +160,89 @@ def find_labels(text: str) -> (dict, dict, list):
     :return: In order, labels (dict of label to line index + label contents), equates (dict of label to contents), and
              issues (list of message + severity)
     """
+    return find_line_labels(split_lines(text))
+
+
+def find_line_labels(lines: list) -> (dict, dict, list):
+    """
+    Finds all labels from the lines of a file
+    :param lines: The AssemblyLines to search through for labels
+    :return: the same as find_labels
+    """
     labels = {}
     equates = {}
     issues = []
 
-    for line_index, stripped in for_line_stripped_comments(text):
-        if has_label(stripped):
-            label = get_label(stripped)
-
-            # Remove extra spaces at this point because they're no use
-            # and could only have negative implications
-            label_contents = strip_label(stripped).strip()
+    for line in lines:
+        label = line.label
+        if label is None:
+            continue
 
-            if label in labels.keys():
-                issues.append(('Label {} already declared'.format(label), 'ERROR'))
-            else:
-                labels[label] = (line_index, label_contents)
-                if get_opcode(stripped) == 'EQU':
-                    equates[label] = strip_opcode(stripped)
+        if label in labels.keys():
+            issues.append(('Label {} already declared'.format(label), 'ERROR'))
+        else:
+            labels[label] = (line.line_number, line.label_contents)
+            if line.opcode == 'EQU':
+                equates[label] = line.contents
 
     return labels, equates, issues
 
 
-def replace_equates(contents: str, equates: dict) -> str:
-    for equate in equates.items():
-        contents = contents.replace(equate[0], equate[1])
+# the parts of an operand which symbols are looked for in: quoted strings, number
+# literals ($hex, %binary, @octal, decimal), sizes (.L) and identifiers
+# only whole identifiers can be symbols, so nothing else is ever replaced
+_OPERAND_TOKENS = re.compile(r"'[^']*'?|[$%@]\w*|\.\w+|[A-Za-z_]\w*|\d\w*")
+_IDENTIFIER = re.compile(r"[A-Za-z_]")
+
 
-    return contents
+def substitute_symbols(contents: str, symbols: dict) -> str:
+    """
+    Replaces every identifier in the contents which is a symbol with the text it stands for
+    The contents are only scanned once, however many symbols there are
 
+    >>> substitute_symbols('#data, D0', {'data': '$AB', 'D': 'wrong'})
+    '#$AB, D0'
 
-def replace_label_addresses(contents: str, label_addresses: dict) -> str:
-    for label in label_addresses.items():
-        contents = contents.replace(label[0], '(${0:08x}).L'.format(label[1]))
+    >>> substitute_symbols("#len, 'len'", {'len': '5', 'l': 'wrong'})
+    "#5, 'len'"
+
+    :param contents: the operands of a line
+    :param symbols: symbol name -> the text that replaces it
+    :return: the contents with the symbols replaced
+    """
+    if not symbols:
+        return contents
+    return _OPERAND_TOKENS.sub(lambda match: symbols.get(match.group(0), match.group(0)), contents)
 
-    return contents
+
+def resolve_equates(equates: dict, symbols: dict = None) -> dict:
+    """
+    Substitutes the equates and symbols used in the value of each equate,
+    so that each value only has to be substituted once
+    :param equates: equate name -> value
+    :param symbols: other symbols the values can use, like labels
+    :return: equate name -> resolved value
+    """
+    resolved = dict(equates)
+    # equates can be made of other equates, up to as many levels as there are equates
+    for _ in range(len(resolved)):
+        changed = {name: substitute_symbols(value, resolved) for name, value in resolved.items()}
+        if changed == resolved:
+            break
+        resolved = changed
+
+    if symbols:
+        resolved = {name: substitute_symbols(value, symbols) for name, value in resolved.items()}
+    return resolved
+
+
+def replace_equates(contents: str, equates: dict) -> str:
+    return substitute_symbols(contents, equates)
+
+
+def replace_label_addresses(contents: str, label_addresses: dict) -> str:
+    return substitute_symbols(contents, {label: '(${0:08x}).L'.format(address)
+                                         for label, address in label_addresses.items()})
 
 
 def replace_labels_with_temps(contents: str, labels: dict) -> str:
@@ -83,130 +252,425 @@ def replace_labels_with_temps(contents: str, labels: dict) -> str:
     :param labels: The labels
     :return: The string with labels replaced
     """
-    for label in labels.items():
-        contents = contents.replace(label[0], '($00000000).L')
+    return substitute_symbols(contents, {label: '($00000000).L' for label in labels})
+
 
-    return contents
+def find_symbol_names(contents: str) -> tuple:
+    """
+    Finds the identifiers in the operands of a line, which are the symbols it could use
 
+    >>> find_symbol_names("#len, (A0), 'text'")
+    ('A0', 'len')
 
-def parse(text: str) -> (ListFile, list):
+    :param contents: the operands of a line
+    :return: the names, sorted and without repeats
     """
-    Parses an assembly file and returns a list file, along with errors/warnings from the parsing process.
-    :param text: The assembly file text to parse
-    :return: The parsed list file
+    return tuple(sorted({token for token in _OPERAND_TOKENS.findall(contents) if _IDENTIFIER.match(token)}))
+
+
+class AssemblerSession:
     """
-    # --- PART 1: process for labels and equates ---
-    labels, equates, issues = find_labels(text)
+    Assembles a source again and again as it is edited, such as in an editor
 
-    # --- PART 2: process operations for sizing and lay out memory ---
-    to_return = ListFile()
-    current_memory_location = 0x00000000
-    label_addresses = {}  # Stores all of the label memory locations
+    The length and the encoding of each line are remembered, along with the values of
+    the symbols the line uses, so after an edit only the lines whose text changed, or
+    which use a symbol that moved, are sized and encoded again.
+    Everything else is only laid out again, which is much faster.
+    """
 
-    for label, opcode, contents in for_line_opcode_parse(text):
-        # Equates have already been processed, skip them
-        # ENDs aren't processed until phase 3, skip them for now
-        # (this idea could be expanded for more preprocessor directives)
-        if opcode == 'EQU' or opcode == 'END':
-            continue
+    def __init__(self):
+        """
+        Constructor
+        """
+        # line text -> the parts of the line, see split_line
+        self._split = {}
+        # operands -> the names of the symbols they could use
+        self._names = {}
+        # (opcode, operands, values of the symbols used) -> (opcode class, length in words)
+        self._sizes = {}
+        # (opcode, operands, values of the symbols used) -> (the hex data or None, issues)
+        self._encodings = {}
+
+        # the results of the last update
+        self.list_file = None
+        self.issues = []
+
+        # path -> the contents of each file that was included by the last update
+        self.files = {}
+        # path -> the paths of the files it includes, in order
+        self.includes = {}
+        # the opcodes and operands of the lines that weren't sized or encoded before the last update
+        self.assembled = set()
+
+    def split_source(self, text: str, path: str = None) -> (list, list):
+        """
+        Splits the source into lines like split_lines, reusing the parts of lines seen before
+        The lines of included files are put in place of each INCLUDE,
+        and the contents of the files are read for each INCBIN
+        :param text: The assembly file text to parse
+        :param path: the path of the file the text is from, which includes are relative to
+        :return: the AssemblyLines, and the issues with the includes
+        """
+        self.files = {}
+        self.includes = {}
+        split = {}
+        lines = []
+        issues = []
+        self._split_text(text, path, [path], split, lines, issues)
+
+        # only the lines still in the source are kept, so edits don't make this grow forever
+        self._split = split
+        return lines, issues
+
+    def _split_text(self, text: str, path: str, including: list, split: dict, lines: list, issues: list):
+        """
+        Splits the text of one file, see split_source
+        :param text:
+        :param path: the path of the file, or None
+        :param including: the paths of the files which are including this one, so circular includes can be found
+        :param split: line text -> the parts of the line, of the lines seen so far
+        :param lines: the list the AssemblyLines are added to
+        :param issues: the list the issues are added to
+        :return:
+        """
+        for line_index, line in enumerate(text.splitlines()):
+            if line in split:
+                parts = split[line]
+            else:
+                parts = self._split[line] if line in self._split else split_line(line)
+                split[line] = parts
+            if parts is None:
+                continue
 
-        # Replace all substitutions in the current line with their corresponding values
-        contents = replace_equates(contents, equates)
-        # Replace all labels with temporary addresses because we don't know their actual values yet
-        contents = replace_labels_with_temps(contents, labels)
+            label, opcode, contents, label_contents = parts
+            if opcode != 'INCLUDE' and opcode != 'INCBIN':
+                lines.append(AssemblyLine(line_index + 1, label, opcode, contents, label_contents, path))
+                continue
 
-        if label is not None:
-            label_addresses[label] = current_memory_location
-            to_return.define_symbol(label, current_memory_location)
+            included = get_include_path(contents, path)
+            self.includes.setdefault(path, []).append(included)
+            if opcode == 'INCLUDE' and included in including:
+                issues.append(('File {} includes itself'.format(included), 'ERROR'))
+                continue
 
-        if opcode == 'ORG':  # This will shift our current memory location, it's a special case
             try:
-                new_memory_location = parse_literal(contents)
-            except:
-                issues.append(('Error parsing ORG value', 'ERROR'))
+                data = self.files[included] if included in self.files else self.read_file(included)
+            except OSError:
+                issues.append(('File {} could not be read'.format(included), 'ERROR'))
                 continue
-            if not (0 <= new_memory_location < MAX_MEMORY_LOCATION):
-                issues.append(('ORG address must be between 0 and 2^24!', 'ERROR'))
+            self.files[included] = data
+
+            if opcode == 'INCLUDE':
+                self._split_text(data.decode(SOURCE_ENCODING), included, including + [included], split, lines, issues)
+            else:
+                line = AssemblyLine(line_index + 1, label, opcode, contents, label_contents, path)
+                line.data = data
+                lines.append(line)
+
+    def read_file(self, path: str) -> bytes:
+        """
+        Reads a file that is included, which can be replaced to get files from somewhere else
+        :param path:
+        :return:
+        """
+        return read_file(path)
+
+    def get_cache(self, operations: set) -> dict:
+        """
+        Gets the lengths and encodings that are remembered for some of the lines, so they can be saved
+        :param operations: the opcode and operands of each of the lines
+        :return: a dict of lists, which can be saved as JSON
+        """
+        return {
+            'sizes': [[opcode, contents, values, length]
+                      for (opcode, contents, values), (op_class, length) in self._sizes.items()
+                      if (opcode, contents) in operations],
+            'encodings': [[opcode, contents, values, data, issues]
+                          for (opcode, contents, values), (data, issues) in self._encodings.items()
+                          if (opcode, contents) in operations]
+        }
+
+    def add_cache(self, cache: dict):
+        """
+        Adds lengths and encodings that were saved, so those lines aren't assembled again by the next update
+        :param cache: a dict from get_cache()
+        :return:
+        """
+        for opcode, contents, values, length in cache['sizes']:
+            self._sizes[opcode, contents, tuple(values)] = find_opcode_cls(opcode), length
+        for opcode, contents, values, data, issues in cache['encodings']:
+            self._encodings[opcode, contents, tuple(values)] = data, [tuple(issue) for issue in issues]
+
+    def _get_key(self, line: AssemblyLine, symbols: dict) -> tuple:
+        """
+        Gets what the size and encoding of a line depend on
+        :param line:
+        :param symbols: symbol name -> the text that replaces it
+        :return:
+        """
+        contents = line.contents
+        names = self._names.get(contents)
+        if names is None:
+            names = find_symbol_names(contents)
+            self._names[contents] = names
+        return line.opcode, contents, tuple(symbols.get(name) for name in names)
+
+    def update(self, text: str, max_workers: int = 1, path: str = None) -> (ListFile, list):
+        """
+        Assembles the latest version of the source
+        :param text: The assembly file text to parse
+        :param max_workers: the number of processes the lines are encoded with, see encode_lines
+        :param path: the path of the file the text is from, which includes are relative to
+        :return: The parsed list file and the issues, the same as parse()
+        """
+        # every line is split into its parts here, and the passes below work on those parts
+        lines, issues = self.split_source(text, path)
+        return self.assemble(lines, issues, max_workers)
+
+    def assemble(self, lines: list, issues: list = None, max_workers: int = 1) -> (ListFile, list):
+        """
+        Assembles the lines of a source
+        The issues of every line are returned in the order of the lines, and an unknown
+        opcode is only reported once, when the lines are sized
+        :param lines: the AssemblyLines, see split_source
+        :param issues: the issues found before assembling, which the rest are added to
+        :param max_workers: the number of processes the lines are encoded with, see encode_lines
+        :return: The parsed list file and the issues, the same as parse()
+        """
+        issues = [] if issues is None else issues
+        self.assembled = set()
+
+        # --- PART 1: process for labels and equates ---
+        labels, equates, label_issues = find_line_labels(lines)
+        issues.extend(label_issues)
+        equates = resolve_equates(equates)
+
+        # all labels are replaced with temporary addresses because we don't know their actual values yet
+        temp_labels = {label: '($00000000).L' for label in labels}
+        symbols = dict(temp_labels)
+        symbols.update(resolve_equates(equates, temp_labels))
+
+        # --- PART 2: process operations for sizing and lay out memory ---
+        to_return = ListFile()
+        current_memory_location = 0x00000000
+        label_addresses = {}  # Stores all of the label memory locations
+        sizes = {}
+
+        for line in lines:
+            opcode = line.opcode
+            label = line.label
+
+            # Equates have already been processed, skip them
+            # ENDs aren't processed until phase 3, skip them for now
+            # (this idea could be expanded for more preprocessor directives)
+            if opcode == 'EQU' or opcode == 'END':
                 continue
-            current_memory_location = new_memory_location
-            # Update the label with the new address, if it exists
+
             if label is not None:
                 label_addresses[label] = current_memory_location
                 to_return.define_symbol(label, current_memory_location)
-            continue
 
-        # TODO: Possibly cache this (and the module search) for Part 3 later so we don't have to redo introspection?
-        op_class = find_opcode_cls(opcode)
-        # We don't know this opcode, there's no module for it
-        if op_class is None:
-            issues.append(('Opcode {} is not known: skipping and continuing'.format(opcode), 'ERROR'))
-            continue
+            if opcode == 'ORG':  # This will shift our current memory location, it's a special case
+                # Replace all equates and labels in the current line with their corresponding values
+                contents = substitute_symbols(line.contents, symbols)
+                try:
+                    new_memory_location = parse_literal(contents)
+                except:
+                    issues.append(('Error parsing ORG value', 'ERROR'))
+                    continue
+                if not (0 <= new_memory_location < MAX_MEMORY_LOCATION):
+                    issues.append(('ORG address must be between 0 and 2^24!', 'ERROR'))
+                    continue
+                current_memory_location = new_memory_location
+                # Update the label with the new address, if it exists
+                if label is not None:
+                    label_addresses[label] = current_memory_location
+                    to_return.define_symbol(label, current_memory_location)
+                continue
 
-        length = op_class.get_word_length(opcode, contents)
+            if opcode == 'INCBIN':  # The included data goes here as it is, rounded up to a full word
+                if line.data:
+                    line.location = current_memory_location
+                    current_memory_location += (len(line.data) + 1) // 2 * 2
+                continue
 
-        current_memory_location += length * 2
+            key = self._get_key(line, symbols)
+            size = sizes.get(key)
+            if size is None:
+                size = self._sizes.get(key)
+            if size is None:
+                op_class = find_opcode_cls(opcode)
+                # labels are always replaced with an absolute long address, whether it is the
+                # temporary one or the real one, so the length found here is the final length
+                length = 0 if op_class is None else \
+                    op_class.get_word_length(opcode, substitute_symbols(line.contents, symbols))
+                size = op_class, length
+                self.assembled.add(key[:2])
+            sizes[key] = size
+
+            op_class, length = size
+            # We don't know this opcode, there's no module for it
+            if op_class is None:
+                issues.append(('Opcode {} is not known: skipping and continuing'.format(opcode), 'ERROR'))
+                continue
 
-    current_memory_location = 0x00000000
+            line.op_class = op_class
+            line.location = current_memory_location
+            line.length = length
+
+            current_memory_location += length * 2
+
+        # now the labels can be replaced with their proper values (that's the difference in this step)
+        address_labels = {label: '(${0:08x}).L'.format(address) for label, address in label_addresses.items()}
+        symbols = dict(address_labels)
+        symbols.update(resolve_equates(equates, address_labels))
+
+        # End doesn't take an absolute long address, so its labels are replaced differently
+        end_labels = {label: '${:x}'.format(address) for label, address in label_addresses.items()}
+        end_symbols = dict(end_labels)
+        end_symbols.update(resolve_equates(equates, end_labels))
+
+        # --- PART 3: actually create the list file ---
+        encodings = {}
+        to_encode = []  # the lines that weren't encoded before, along with their keys and operands
+        encoded_lines = []  # the lines that are put in the list file, along with their keys
+        for line in lines:
+            opcode = line.opcode
+
+            if opcode == 'END':  # This will set our end memory location, it's a special case
+                start_location = parse_literal(substitute_symbols(line.contents, end_symbols))
+                if not (0 <= start_location < MAX_MEMORY_LOCATION):
+                    continue
+                to_return.set_starting_execution_address(start_location)
+                continue
 
-    # --- PART 3: actually create the list file ---
-    for l, opcode, contents in for_line_opcode_parse(text):
-        # Equates have already been processed, skip them
-        # (this idea could be expanded for more preprocessor directives)
-        if opcode == 'EQU':
-            continue
+            if opcode == 'INCBIN':
+                if line.data:
+                    to_return.insert_data(line.location, str(binascii.hexlify(line.data))[2:-1])
+                continue
 
-        # Replace all substitutions in the current line with their corresponding values
-        contents = replace_equates(contents, equates)
+            # Equates and ORGs were handled while sizing, and the opcodes which
+            # weren't known were already reported, so only the operations are left
+            if line.op_class is None:
+                continue
 
-        if opcode == 'END':
-            # End doesn't take an absolute long address, replace it differently
-            for label in label_addresses.items():
-                contents = contents.replace(label[0], '${:x}'.format(label[1]))
-        else:
-            # Replace all memory labels with their proper values (that's the difference in this step)
-            contents = replace_label_addresses(contents, label_addresses)
+            key = self._get_key(line, symbols)
+            if key not in encodings:
+                encoding = self._encodings.get(key)
+                if encoding is None:
+                    # Replace all equates and labels in the current line with their corresponding values
+                    to_encode.append((key, line.op_class, opcode, substitute_symbols(line.contents, symbols)))
+                    self.assembled.add(key[:2])
+                encodings[key] = encoding
+            encoded_lines.append((line, key))
+
+        for key, encoding in zip([work[0] for work in to_encode],
+                                 encode_lines([work[1:] for work in to_encode], max_workers)):
+            encodings[key] = encoding
+
+        # the results are put together in the order of the lines, however they were encoded
+        for line, key in encoded_lines:
+            data, line_issues = encodings[key]
+            issues.extend(line_issues)
+            if data:
+                to_return.insert_data(line.location, data)
+
+        # only the lines still in the source are kept, so edits don't make these grow forever
+        self._sizes = sizes
+        self._encodings = encodings
+        self._names = {key[1]: self._names[key[1]] for key in sizes}
+
+        self.list_file = to_return
+        self.issues = issues
+        return to_return, issues
+
+
+def encode_line(op_class: type, opcode: str, contents: str) -> tuple:
+    """
+    Encodes a line
 
-        if opcode == 'ORG':  # This will shift our current memory location, it's a special case
-            try:
-                new_memory_location = parse_literal(contents)
-            except:
-                # Don't need to print assertion, we already did that earlier
-                continue
-            if not (0 <= new_memory_location < MAX_MEMORY_LOCATION):
-                continue
-            current_memory_location = new_memory_location
-            continue
+    >>> from ..core.opcodes.move import Move
+    >>> encode_line(Move, 'MOVE.B', 'D0, D1')
+    ('1200', [])
 
-        if opcode == 'END':  # This will set our end memory location, it's a special case
-            start_location = parse_literal(contents)
-            if not (0 <= start_location < MAX_MEMORY_LOCATION):
-                continue
-            to_return.set_starting_execution_address(start_location)
-            continue
+    :param op_class: the class of the opcode
+    :param opcode: the opcode, with its size
+    :param contents: the operands with the symbols replaced
+    :return: the hex data (or None if it couldn't be encoded) and the issues with the line
+    """
+    # check that the input is valid the opcode at the module level
+    is_valid, issues = op_class.is_valid(opcode, contents)
 
-        # TODO: Possibly use a cached version?
-        op_class = find_opcode_cls(opcode)
+    # if valid, then actually construct the opcode
+    if not is_valid:
+        return None, issues
 
-        if op_class is None:
-            issues.append(('Opcode {} is not known: skipping and continuing'.format(opcode), 'ERROR'))
-            continue
+    # make the opcode
+    data = op_class.from_str(opcode, contents)
+
+    # ensure that the data was built correctly
+    if data is None:
+        return None, issues
+
+    # instead of converting to a string here, we should make this a method of the base opcode class
+    return str(binascii.hexlify(data.assemble()))[2:-1], issues
+
+
+def _encode_chunk(chunk: list) -> list:
+    """
+    Encodes some of the lines, in a process of the pool
+    The opcode classes are found again in the process, rather than being sent to it
+    :param chunk: the opcode and operands of each line
+    :return: the encoding of each line
+    """
+    return [encode_line(find_opcode_cls(opcode), opcode, contents) for opcode, contents in chunk]
 
-        # check that the input is valid the opcode at the module level
-        is_valid, issues = op_class.is_valid(opcode, contents)
 
-        # if valid, then actually construct the opcode
-        if is_valid:
-            # get the length of the operation in # of words
-            length = op_class.get_word_length(opcode, contents)
-            # make the opcode
-            data = op_class.from_str(opcode, contents)
+def _is_built_in(op_class: type) -> bool:
+    """
+    Checks whether an opcode class is one of the ones in this package, which every
+    process of the pool has registered, rather than one registered while running
+    :param op_class:
+    :return:
+    """
+    return op_class.__module__.startswith(opcodes.__name__ + '.')
 
-            # ensure that the data was built correctly and append it
-            if data is not None:
-                # instead of converting to a string here, we should make this a method of the base opcode class
-                to_return.insert_data(current_memory_location, str(binascii.hexlify(data.assemble()))[2:-1])
 
-                # Increment our memory counter
-                current_memory_location += length * 2
+def encode_lines(lines: list, max_workers: int = 1) -> list:
+    """
+    Encodes many lines, optionally spread over a pool of processes
+    The lines are split into chunks, and the encodings are put back together in the same order
+    Lines are only spread over processes when all of their opcodes are built in, as the
+    processes may not have the opcodes registered at run time
+    :param lines: the op class, opcode and operands of each line
+    :param max_workers: the number of processes, 1 to encode in this process or None for one for each core
+    :return: the encoding of each line, see encode_line
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1 or len(lines) < MIN_PARALLEL_LINES or \
+            not all(_is_built_in(op_class) for op_class in {line[0] for line in lines}):
+        return [encode_line(op_class, opcode, contents) for op_class, opcode, contents in lines]
+
+    # a few chunks for each process, so that a slow chunk doesn't leave the others waiting
+    chunk_length = -(-len(lines) // (max_workers * 4))
+    chunks = [[(opcode, contents) for op_class, opcode, contents in lines[i:i + chunk_length]]
+              for i in range(0, len(lines), chunk_length)]
 
-    return to_return, issues
+    encodings = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_encodings in executor.map(_encode_chunk, chunks):
+            encodings.extend(chunk_encodings)
+    return encodings
+
+
+def parse(text: str, max_workers: int = 1, path: str = None) -> (ListFile, list):
+    """
+    Parses an assembly file and returns a list file, along with errors/warnings from the parsing process.
+    :param text: The assembly file text to parse
+    :param max_workers: the number of processes to encode the lines with, 1 to encode them all in
+        this process or None for one for each core. Only worth it for very large files
+    :param path: the path of the file the text is from, which INCLUDE and INCBIN paths are relative to
+    :return: The parsed list file, and the issues with every line, see AssemblerSession.assemble()
+    """
+    return AssemblerSession().update(text, max_workers, path)
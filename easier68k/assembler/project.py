@@ -0,0 +1,149 @@
+"""
+Project
+
+Assembles a source made of many files, joined together with INCLUDE, keeping an object
+for each file in a cache directory between builds.
+The object of a file holds the length and encoding of each of its lines, along with the
+values of the symbols each one used. It is keyed by a hash of the file and of the files it
+includes, so it is only used while none of them have changed.
+
+After a file is changed, only its lines are assembled again, along with the lines in
+other files that use a symbol which moved. Everything else is taken from the cache, and
+linking the lines together into the list file is the only work left.
+"""
+
+import os
+import json
+import hashlib
+from .assembler import AssemblerSession, read_file, SOURCE_ENCODING
+from ..core.models.list_file import ListFile
+
+# changed whenever the objects would be made differently, so old ones aren't used
+CACHE_VERSION = 1
+
+# the name of the cache directory, which is put next to the main file by default
+DEFAULT_CACHE_DIR = '.easier68k_cache'
+
+
+class Project:
+    """
+    A main source file and the files it includes
+    """
+
+    def __init__(self, main_file: str, cache_dir: str = None):
+        """
+        Constructor
+        :param main_file: the path of the file assembly starts from
+        :param cache_dir: the directory the objects are kept in,
+            by default DEFAULT_CACHE_DIR in the directory of the main file
+        """
+        self.main_file = main_file
+        self.cache_dir = os.path.join(os.path.dirname(main_file), DEFAULT_CACHE_DIR) if cache_dir is None \
+            else cache_dir
+        self.session = AssemblerSession()
+
+        # the files which had lines assembled in the last build, rather than taken from the cache
+        self.assembled_files = set()
+
+    def get_file_keys(self) -> dict:
+        """
+        Gets the key of the object of each file in the last build
+        :return: path -> key
+        """
+        files = self.session.files
+        includes = self.session.includes
+        keys = {}
+
+        def get_key(path: str) -> str:
+            if path not in keys:
+                # set first, so a file that includes itself doesn't recurse forever
+                keys[path] = ''
+                digest = hashlib.sha256(str(CACHE_VERSION).encode())
+                digest.update(hashlib.sha256(files[path]).digest())
+                for included in includes.get(path, []):
+                    if included in files:
+                        digest.update(get_key(included).encode())
+                keys[path] = digest.hexdigest()
+            return keys[path]
+
+        for path in files:
+            get_key(path)
+        return keys
+
+    def _get_object_path(self, key: str) -> str:
+        """
+        Gets where the object with a key is kept
+        :param key:
+        :return:
+        """
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def _load_object(self, key: str) -> dict:
+        """
+        Loads the object with a key from the cache
+        :param key:
+        :return: the object, or None if it isn't in the cache
+        """
+        try:
+            with open(self._get_object_path(key)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            # a missing or broken object is made again
+            return None
+
+    def _save_object(self, key: str, obj: dict):
+        """
+        Saves an object in the cache
+        The object is written to a temporary file first, so a build which is
+        stopped part way through can't leave half of an object behind
+        :param key:
+        :param obj:
+        :return:
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._get_object_path(key)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(obj, file)
+        os.replace(temp_path, path)
+
+    def build(self, max_workers: int = 1) -> (ListFile, list):
+        """
+        Assembles the project, using the objects in the cache for the files that haven't changed
+        :param max_workers: the number of processes the lines are encoded with, see encode_lines
+        :return: The parsed list file and the issues, the same as assembler.parse()
+        """
+        session = self.session
+        main_file = self.main_file
+        contents = read_file(main_file)
+
+        lines, issues = session.split_source(contents.decode(SOURCE_ENCODING), main_file)
+        session.files[main_file] = contents
+
+        # put the lines which are in the cache in the session, so it doesn't assemble them again
+        keys = self.get_file_keys()
+        loaded = set()
+        for path, key in keys.items():
+            obj = self._load_object(key)
+            if obj is not None:
+                session.add_cache(obj)
+                loaded.add(path)
+
+        to_return, issues = session.assemble(lines, issues, max_workers)
+
+        # save the objects of the files which had anything assembled again
+        by_file = {}
+        for line in lines:
+            by_file.setdefault(line.file, set()).add((line.opcode, line.contents))
+
+        self.assembled_files = set()
+        for path, operations in by_file.items():
+            if path not in keys:
+                continue
+            if operations & session.assembled:
+                self.assembled_files.add(path)
+            elif path in loaded:
+                continue
+            self._save_object(keys[path], session.get_cache(operations))
+
+        return to_return, issues
@@ -0,0 +1,189 @@
+"""
+Batch
+
+Runs many programs, or one program with many different inputs, across all of the cores of a machine.
+Each job is run by a BatchWorker, and every worker process keeps a single
+simulator which is reset between jobs by restoring a snapshot, so only the memory
+that a job changed has to be put back. When a worker gets a job for the same
+list file as its last job, the program doesn't have to be loaded again either.
+"""
+
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from .simulator.m68k import M68K
+from .simulator.console import Console
+from .simulator.snapshot import SNAPSHOT_PAGE_SHIFT
+from .core.models.list_file import ListFile
+from .core.enum.register import Register
+from .core.enum.stop_reason import StopReason
+
+# the instruction budget of a job, so that a program which never halts can't keep a worker forever
+DEFAULT_MAX_INSTRUCTIONS = 10000000
+
+
+class BatchJob:
+    """
+    A program to run, and what to run it with
+    """
+
+    def __init__(self, list_file: ListFile, registers: dict = None, memory: dict = None, stdin: str = '',
+                 max_instructions: int = DEFAULT_MAX_INSTRUCTIONS, max_cycles: int = None, timeout: float = None):
+        """
+        Constructor
+        :param list_file: the program to run, which is pickled to send it to the worker processes
+        :param registers: Register -> the unsigned int value it starts with
+        :param memory: location -> the bytes written there before running
+        :param stdin: the text that is read as input
+        :param max_instructions: see M68K.run()
+        :param max_cycles: see M68K.run()
+        :param timeout: see M68K.run()
+        """
+        assert isinstance(list_file, ListFile), 'The program of a job must be a ListFile!'
+        self.list_file = list_file
+        self.registers = {} if registers is None else registers
+        self.memory = {} if memory is None else memory
+        self.stdin = stdin
+        self.max_instructions = max_instructions
+        self.max_cycles = max_cycles
+        self.timeout = timeout
+
+
+class BatchResult:
+    """
+    The state of the simulator after running a job
+    """
+
+    def __init__(self, stop_reason: StopReason, registers: list, cycles: int, output: str,
+                 memory_digest: str, error: str = None):
+        """
+        Constructor
+        :param stop_reason: why the job stopped running
+        :param registers: the unsigned int values of all of the registers, indexed by Register
+        :param cycles: the number of clock cycles the job ran for
+        :param output: everything written as output
+        :param memory_digest: a hash of all of memory, see BatchWorker.get_memory_digest()
+        :param error: a description of the error, if the job stopped because of one
+        """
+        self.stop_reason = stop_reason
+        self.registers = registers
+        self.cycles = cycles
+        self.output = output
+        self.memory_digest = memory_digest
+        self.error = error
+
+    def get_register(self, register: Register) -> int:
+        """
+        Gets the value a register had at the end of the job
+        :param register:
+        :return:
+        """
+        return self.registers[register]
+
+
+class BatchWorker:
+    """
+    Runs jobs one after another on the same simulator
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.simulator = M68K()
+
+        # the state before any program is loaded, and after the last program was loaded
+        self._clean = self.simulator.snapshot()
+        self._loaded = None
+        self._loaded_list_file = None
+        self._loaded_digest = None
+
+    def _load(self, list_file: ListFile):
+        """
+        Resets the simulator to the state right after the list file is loaded
+        :param list_file:
+        :return:
+        """
+        simulator = self.simulator
+        if self._loaded is not None and self._loaded_list_file == list_file:
+            simulator.restore(self._loaded)
+            return
+
+        simulator.restore(self._clean)
+        simulator.load_list_file(list_file)
+        memory = simulator.memory
+        self._loaded_digest = hashlib.sha256(memory.read_bytes(0, len(memory))).digest()
+        self._loaded = simulator.snapshot()
+        self._loaded_list_file = list_file
+
+    def get_memory_digest(self) -> str:
+        """
+        Gets a hash of all of memory, without having to hash all of it
+        The hash is made from the contents of memory when the program was loaded,
+        along with the pages which are different now
+        :return: the hex digest
+        """
+        memory = self.simulator.memory
+        digest = hashlib.sha256(self._loaded_digest)
+        for page, contents in sorted(self._loaded.saved_pages.items()):
+            location = page << SNAPSHOT_PAGE_SHIFT
+            current = memory.read_bytes(location, len(contents))
+            if current != contents:
+                digest.update(location.to_bytes(4, 'big'))
+                digest.update(current)
+        return digest.hexdigest()
+
+    def run(self, job: BatchJob) -> BatchResult:
+        """
+        Runs a job from the state right after its program was loaded
+        :param job:
+        :return:
+        """
+        self._load(job.list_file)
+        simulator = self.simulator
+
+        for location, data in job.memory.items():
+            simulator.memory.write_bytes(location, data)
+        for register, value in job.registers.items():
+            simulator.set_register_int(register, value)
+
+        output = io.StringIO()
+        simulator.console = Console(output, io.StringIO(job.stdin))
+        reason = simulator.run(max_instructions=job.max_instructions, max_cycles=job.max_cycles,
+                               timeout=job.timeout)
+
+        error = None
+        if reason is StopReason.ERROR:
+            error = repr(simulator.last_error)
+
+        return BatchResult(reason, list(simulator.registers), simulator.get_cycles(), output.getvalue(),
+                           self.get_memory_digest(), error)
+
+
+# the worker used by run_job in this process, made on first use
+_worker = None
+
+
+def run_job(job: BatchJob) -> BatchResult:
+    """
+    Runs a job in this process
+    :param job:
+    :return:
+    """
+    global _worker
+    if _worker is None:
+        _worker = BatchWorker()
+    return _worker.run(job)
+
+
+def run_batch(jobs: list, max_workers: int = None, chunksize: int = 16) -> list:
+    """
+    Runs all of the jobs on a pool of processes
+    :param jobs: the BatchJobs to run
+    :param max_workers: the number of processes, by default one for each core
+    :param chunksize: the number of jobs sent to a process at once,
+        jobs for the same program run faster when they are sent together
+    :return: the BatchResult for each job, in the same order as the jobs
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_job, jobs, chunksize=chunksize))
@@ -5,6 +5,7 @@ __all__ = ['condition',
            'op_size',
            'register',
            'srecordtype',
+           'stop_reason',
            'system_status_code',
            'trap_task',
            'trap_vector']
@@ -37,3 +37,7 @@ class ConditionStatusCode:
     Zero = Z
     Overflow = V
     Carry = C
+
+    # groups of codes which are set together in a single call, see M68K.set_condition_status_codes
+    ALL = X | N | Z | V | C
+    NZVC = N | Z | V | C
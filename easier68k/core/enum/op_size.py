@@ -222,3 +222,9 @@ class OpSize(Enum):
             return OpSize.WORD
         if code == 'L':
             return OpSize.LONG
+
+
+# the bits used by and the most significant (sign) bit of a value of each OpSize
+# these are indexed by OpSize.value, since OpSize can't be used as a dict key
+OP_SIZE_MASKS = (0, 0xFF, 0xFFFF, 0, 0xFFFFFFFF)
+OP_SIZE_MSBS = (0, 0x80, 0x8000, 0, 0x80000000)
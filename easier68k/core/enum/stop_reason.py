@@ -0,0 +1,48 @@
+"""
+Stop Reason Enum
+Why M68K.run() returned
+
+>>> StopReason.HALTED
+<StopReason.HALTED: 0>
+
+>>> StopReason.TIMEOUT.is_budget_exhausted()
+True
+
+>>> StopReason.BREAKPOINT.is_budget_exhausted()
+False
+"""
+
+from enum import Enum
+
+
+class StopReason(Enum):
+    # the simulator was halted, by SIMHALT, the terminate trap task or halt()
+    HALTED = 0
+
+    # clock_auto_cycle was turned off, such as when running a single instruction
+    PAUSED = 1
+
+    # the instruction at a breakpoint is next
+    BREAKPOINT = 2
+
+    # the last instruction accessed memory that is being watched
+    WATCHPOINT = 3
+
+    # the instruction, cycle or time budget given to run() ran out
+    INSTRUCTION_LIMIT = 4
+    CYCLE_LIMIT = 5
+    TIMEOUT = 6
+
+    # an instruction raised an error, which is kept in M68K.last_error
+    ERROR = 7
+
+    # a TRAP #15 task needs input, but the console has run out
+    # the TRAP is executed again by the next run(), so more input can be given first
+    WAITING_FOR_INPUT = 8
+
+    def is_budget_exhausted(self) -> bool:
+        """
+        Checks if this is one of the reasons that a budget ran out
+        :return:
+        """
+        return self in [StopReason.INSTRUCTION_LIMIT, StopReason.CYCLE_LIMIT, StopReason.TIMEOUT]
@@ -10,7 +10,7 @@ from ..enum.register import Register, ALL_ADDRESS_REGISTERS
 from ...simulator.m68k import M68K
 from ..util.conversions import to_word
 from ..models.memory_value import MemoryValue
-from ..enum.op_size import OpSize
+from ..enum.op_size import OpSize, OP_SIZE_MASKS
 
 # should try to make this a constant only defined once
 MAX_MEMORY_LOCATION = 16777216  # 2^24
@@ -86,57 +86,86 @@ class AssemblyParameter:
             # get the value of the register, that's it
             return simulator.get_register(addr_register)
 
+        if self.mode is EAMode.AddressRegisterIndirect:
+            return MemoryValue(OpSize(length), unsigned_int=self.get_value_unsigned(simulator, length))
+
+        # the remaining modes are always a long word
+        return MemoryValue(OpSize.LONG, unsigned_int=self.get_value_unsigned(simulator, length))
+
+    def get_value_unsigned(self, simulator: M68K, length: OpSize = OpSize.WORD) -> int:
+        """
+        Gets the value for this EAMode from the simulator as an unsigned int
+        This is the same as get_value, without making a MemoryValue
+        :param simulator: reference to the 68k simulator
+        :param length: the length in bytes associated with this operation, must be 1 2 or 4
+        :return: the unsigned value associated with this assembly parameter
+        """
+        if not isinstance(length, OpSize):
+            length = OpSize(length)
+
+        # immediates are assumed to be signed values
+        if self.mode is EAMode.IMM:
+            mask = OP_SIZE_MASKS[length.value]
+            if self.data < 0:
+                assert -(mask >> 1) - 1 <= self.data, 'The immediate value must fit in the length of the operation!'
+                # the twos complement for the length
+                return self.data & mask
+            assert self.data <= mask, 'The immediate value must fit in the length of the operation!'
+            return self.data
+
+        if self.mode is EAMode.DRD:
+            # convert the data into the register value
+            assert 0 <= self.data <= 7
+            return simulator.get_register_int(self.data)
+
+        if self.mode is EAMode.AddressRegisterDirect:
+            # address register direct gets the value of the register
+            assert 0 <= self.data <= 7
+            # offset the value to compensate for the enum offset
+            return simulator.get_register_int(self.data + Register.A0)
+
         if self.mode is EAMode.AddressRegisterIndirect:
             # address register indirect gets the value that the register points to
             # check that the register number is valid
-            assert Register.A0.value <= self.data + Register.A0.value <= Register.A7.value
-            # offset the value to compensate for the enum offset
-            addr_register = Register(self.data + Register.A0.value)
+            assert 0 <= self.data <= 7
             # this gets the value of the register, which points to a location
             # in memory where the target value is
-            register_value = simulator.get_register(addr_register)
+            register_value = simulator.get_register_int(self.data + Register.A0)
             # now get the value in memory of that register
-            val = simulator.memory.get(length, register_value.get_value_unsigned())
-            return val
+            return simulator.memory.read_unsigned(length, register_value)
 
         if self.mode is EAMode.AddressRegisterIndirectPostIncrement:
             # address register indirect gets the value that the register points to
             # check that the register number is valid
-            assert Register.A0.value <= self.data + Register.A0.value <= Register.A7.value
+            assert 0 <= self.data <= 7
             # offset the value to compensate for the enum offset
-            addr_register = Register(self.data + Register.A0.value)
+            addr_register = self.data + Register.A0
             # this gets the value of the register, which points to a location
             # in memory where the target value is
-            register_value = simulator.get_register(addr_register)
+            register_value = simulator.get_register_int(addr_register)
             # now get the value in memory of that register
-            val = simulator.memory.get(OpSize.LONG, register_value.get_value_unsigned())
-            total = register_value.get_value_unsigned() + OpSize.LONG.value
-            mv = MemoryValue(OpSize.LONG, unsigned_int=total)
+            val = simulator.memory.read_u32(register_value)
 
             # do the post increment
-            simulator.set_register(addr_register, mv)
+            simulator.set_register_int(addr_register, register_value + OpSize.LONG.value)
 
             return val
 
         if self.mode is EAMode.AddressRegisterIndirectPreDecrement:
             # address register indirect gets the value that the register points to
             # check that the register number is valid
-            assert Register.A0 <= self.data + Register.A0 <= Register.A7
+            assert 0 <= self.data <= 7
             # offset the value to compensate for the enum offset
-            addr_register = Register(self.data + Register.A0)
-            # this gets the value of the register, which points to a location
-            # in memory where the target value is
-            register_value = simulator.get_register(addr_register)
+            addr_register = self.data + Register.A0
 
-            total = register_value.get_value_unsigned() - OpSize.LONG.value
-            mv = MemoryValue(OpSize.LONG, unsigned_int=total)
+            total = simulator.get_register_int(addr_register) - OpSize.LONG.value
 
-            # do the pre decrement (this does not update the value of register_value)
-            simulator.set_register(addr_register, mv)
+            # do the pre decrement
+            simulator.set_register_int(addr_register, total)
 
-            # now get the value in memory of that register
+            # now get the value in memory of the decremented register
             # and return that value
-            return simulator.memory.get(OpSize.LONG, register_value.get_value_unsigned())
+            return simulator.memory.read_u32(total)
 
         if self.mode in [EAMode.AbsoluteLongAddress, EAMode.AbsoluteWordAddress]:
             # if mode is absolute long or word address
@@ -145,15 +174,12 @@ class AssemblyParameter:
             # ensure that the data is valid
             assert 0 <= self.data <= MAX_MEMORY_LOCATION, 'The address must be in the range [0, 2^24]!'
 
-            # get the address being looked for
-            addr = self.data
-
             # if word address, mask out extra bits
             if self.mode is EAMode.AbsoluteWordAddress:
-                addr = to_word(addr)
+                return to_word(self.data)
 
             # now get the value of that absolute long address
-            return MemoryValue(OpSize.LONG, unsigned_int=addr)
+            return self.data
 
         # if nothing was done by now, surely something must be wrong
         assert False, 'Invalid effective addressing mode!'
@@ -163,20 +189,32 @@ class AssemblyParameter:
         Sets the value of a destination mode
         :param simulator: the reference to the simulator
         :param value: the value to set for this assembly parameter
-        :param length: the number of bits associated for this instruction, must be 1 2 or 4
         :return:
         """
         if not isinstance(value, MemoryValue):
             raise AssertionError("The value parameter must be of type MemoryValue")
 
+        self.set_value_unsigned(simulator, value.get_size(), value.get_value_unsigned())
+
+    def set_value_unsigned(self, simulator: M68K, length: OpSize, value: int):
+        """
+        Sets the value of a destination mode from an unsigned int
+        This is the same as set_value, without needing a MemoryValue
+        :param simulator: the reference to the simulator
+        :param length: the length of the value, must be 1 2 or 4 bytes
+        :param value: the unsigned value to set for this assembly parameter
+        :return:
+        """
+        if not isinstance(length, OpSize):
+            length = OpSize(length)
+
         if self.mode is EAMode.Immediate:
             assert False, 'Cannot set the value of an immediate.'
 
         if self.mode is EAMode.DRD:
             # set the value for the data register
             assert 0 <= self.data <= 7
-            data_register = Register(self.data)
-            simulator.set_register(data_register, value)
+            simulator.set_register_int(self.data, value, length)
 
         if self.mode is EAMode.AddressRegisterDirect:
             # set the value for the address register
@@ -184,48 +222,45 @@ class AssemblyParameter:
             # since this is a direct addressing mode, and not treated as a 'pointer'
             # to memory, this is not bounded by the number of address lines
             assert 0 <= self.data <= 7
-            addr_register = Register(self.data + Register.A0)
-            simulator.set_register(addr_register, value)
+            simulator.set_register_int(self.data + Register.A0, value)
 
         if self.mode is EAMode.AddressRegisterIndirect:
             # sets the value in memory that the address register points to
             assert 0 <= self.data <= 7
-            assert 0 <= value.get_value_unsigned() <= MAX_MEMORY_LOCATION, 'The value must fit in the memory space [0, 2^24]'
-            addr_register = Register(self.data + Register.A0)
-            location = simulator.get_register(addr_register).get_value_unsigned()
-            simulator.memory.set(value.length, location, value)
+            assert 0 <= value <= MAX_MEMORY_LOCATION, 'The value must fit in the memory space [0, 2^24]'
+            location = simulator.get_register_int(self.data + Register.A0)
+            simulator.memory.write_unsigned(length, location, value)
 
         if self.mode is EAMode.AddressRegisterIndirectPreDecrement:
             # sets the value in memory that the address register points to
             assert 0 <= self.data <= 7
-            assert 0 <= value.get_value_unsigned() <= MAX_MEMORY_LOCATION, 'The value must fit in the memory space [0, 2^24]'
-            addr_register = Register(self.data + Register.A0)
-            location = simulator.get_register(addr_register).get_value_unsigned()
-            location -= value.length.get_number_of_bytes()
-            simulator.set_register(addr_register, MemoryValue(OpSize.LONG, unsigned_int=location))
-            simulator.memory.set(value.length, location, value)
+            assert 0 <= value <= MAX_MEMORY_LOCATION, 'The value must fit in the memory space [0, 2^24]'
+            addr_register = self.data + Register.A0
+            location = simulator.get_register_int(addr_register)
+            location -= length.get_number_of_bytes()
+            simulator.set_register_int(addr_register, location)
+            simulator.memory.write_unsigned(length, location, value)
 
         if self.mode is EAMode.AddressRegisterIndirectPostIncrement:
             # sets the value in memory that the address register points to
             assert 0 <= self.data <= 7
-            assert 0 <= value.get_value_unsigned() <= MAX_MEMORY_LOCATION, 'The value must fit in the memory space [0, 2^24]'
-
-            addr_register = Register(self.data + Register.A0)
-            location = simulator.get_register(addr_register).get_value_unsigned()
-            simulator.memory.set(value.length, location, value)
-            location += value.length.get_number_of_bytes()
-            simulator.set_register(addr_register, MemoryValue(OpSize.LONG, unsigned_int=location))
+            assert 0 <= value <= MAX_MEMORY_LOCATION, 'The value must fit in the memory space [0, 2^24]'
 
+            addr_register = self.data + Register.A0
+            location = simulator.get_register_int(addr_register)
+            simulator.memory.write_unsigned(length, location, value)
+            location += length.get_number_of_bytes()
+            simulator.set_register_int(addr_register, location)
 
         if self.mode in [EAMode.AbsoluteLongAddress, EAMode.AbsoluteWordAddress]:
             # assert that the value fits in the bounds of memory
             assert 0 <= self.data <= MAX_MEMORY_LOCATION
-            assert 0 <= value.get_value_unsigned() <= 0xFFFFFFFF, 'The value must fit inside of a long word!'
+            assert 0 <= value <= 0xFFFFFFFF, 'The value must fit inside of a long word!'
 
             # if the mode is a word
             if self.mode is EAMode.AbsoluteWordAddress:
                 # mask it to only be a word
-                value = MemoryValue(value.length, unsigned_int=to_word(value.get_value_unsigned()))
+                value = to_word(value)
 
             # set the value in memory to that
-            simulator.memory.set(value.length, self.data, value)
+            simulator.memory.write_unsigned(length, self.data, value)
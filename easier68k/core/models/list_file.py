@@ -1,5 +1,9 @@
 import json
 import re
+import struct
+import binascii
+from types import MappingProxyType
+from bisect import bisect_left, bisect_right, insort
 
 from ..enum.srecordtype import SRecordType
 
@@ -11,6 +15,16 @@ destination memory they should end up.
 """
 MAX_MEMORY_LOCATION = 16777216  # 2^24
 
+# the binary format, see ListFile.to_bytes()
+BINARY_MAGIC = b'L68K'
+BINARY_VERSION = 1
+# magic, version, flags (unused), starting execution address, number of symbols, number of segments
+BINARY_HEADER = struct.Struct('>4sHHIII')
+# location and length of the name, followed by the name
+BINARY_SYMBOL = struct.Struct('>IH')
+# location and length of a segment
+BINARY_SEGMENT = struct.Struct('>II')
+
 class ListFile:
     """
     Represents assembled instructions and their locations in memory
@@ -19,14 +33,134 @@ class ListFile:
         """
         Constructor
         """
-        # the keys of data must be strings so that they will work with JSON
-        # but when working with it, integers are a lot cleaner and make more sense
-        # so all of the interfaces that work with it are going to use ints
-        # but internally it will use strings
-        self.data = {}
+        # the data is kept as segments, runs of bytes which data next to each other is joined into
+        # the start locations are kept sorted, so the segment with any location can be found with a binary search
+        self._starts = []
+        # the bytes of each segment, a bytearray, or a memoryview of the buffer loaded by from_buffer
+        self._segments = []
+        # the locations data was inserted at, kept sorted, so that the data can still be
+        # looked at a piece at a time, see the data property
+        self._entries = []
+        # the locations of the pieces of data that were inserted as upper case hex, so they are given back that way
+        self._upper_entries = set()
+
         self.symbols = {}
         self.starting_execution_address = 0
 
+    @property
+    def data(self) -> MappingProxyType:
+        """
+        The hex data of each piece of data inserted, keyed by its location as a string
+        This is made from the segments each time, so it is read only,
+        use insert_data() and clear_location() to change the data
+        :return:
+        """
+        return MappingProxyType({str(location): self.get_starting_data(location) for location in self._entries})
+
+    @data.setter
+    def data(self, data: dict):
+        """
+        Replaces all of the data
+        :param data: the hex data keyed by the location as a string
+        :return:
+        """
+        self._starts = []
+        self._segments = []
+        self._entries = []
+        self._upper_entries = set()
+        for key, value in data.items():
+            self.insert_data(int(key), value)
+
+    def _find_segment(self, location: int) -> int:
+        """
+        Finds the segment which a location is in
+        :param location:
+        :return: the index of the segment, or -1 if the location isn't in one
+        """
+        index = bisect_right(self._starts, location) - 1
+        if index >= 0 and location < self._starts[index] + len(self._segments[index]):
+            return index
+        return -1
+
+    def _write(self, location: int, data: bytes):
+        """
+        Puts bytes into the segments, over any that are already there,
+        joining together the segments that they touch
+        :param location:
+        :param data:
+        :return:
+        """
+        starts = self._starts
+        segments = self._segments
+        end = location + len(data)
+
+        # the segments that overlap or are next to the new bytes, from first to last - 1
+        first = bisect_left(starts, location)
+        if first > 0 and starts[first - 1] + len(segments[first - 1]) >= location:
+            first -= 1
+        last = bisect_right(starts, end)
+
+        if first == last:
+            starts.insert(first, location)
+            segments.insert(first, bytearray(data))
+            return
+
+        start = min(location, starts[first])
+        joined = segments[first]
+        if starts[first] != start or not isinstance(joined, bytearray):
+            joined = bytearray(joined)
+            if starts[first] != start:
+                joined[0:0] = bytes(starts[first] - start)
+
+        # most of the time this is only adding onto the end of a segment, as code is assembled in order
+        for index in range(first + 1, last):
+            gap = starts[index] - start - len(joined)
+            if gap > 0:
+                joined.extend(bytes(gap))
+            joined[starts[index] - start:] = segments[index]
+        if end - start > len(joined):
+            joined.extend(bytes(end - start - len(joined)))
+        joined[location - start:end - start] = data
+
+        starts[first:last] = [start]
+        segments[first:last] = [joined]
+
+    def _get_entry_end(self, location: int) -> int:
+        """
+        Gets where the piece of data inserted at a location ends,
+        which is at the next piece of data or the end of its segment
+        :param location: the location of the piece of data
+        :return:
+        """
+        index = self._find_segment(location)
+        if index == -1:
+            return location
+        end = self._starts[index] + len(self._segments[index])
+        following = bisect_right(self._entries, location)
+        if following < len(self._entries):
+            end = min(end, self._entries[following])
+        return end
+
+    def get_bytes(self, location: int, length: int) -> bytes:
+        """
+        Gets the bytes at any location, which must all be in one segment
+
+        >>> list_file = ListFile()
+        >>> list_file.insert_data(0x400, '4e71')
+        >>> list_file.insert_data(0x402, 'abcd')
+        >>> list_file.get_bytes(0x401, 2)
+        b'q\\xab'
+
+        :param location: the first location
+        :param length: the number of bytes
+        :return:
+        """
+        index = self._find_segment(location)
+        assert index != -1, 'Location data not defined!'
+        offset = location - self._starts[index]
+        assert offset + length <= len(self._segments[index]), 'Location data not defined!'
+        return bytes(self._segments[index][offset:offset + length])
+
     def set_starting_execution_address(self, location: int):
         """
         Sets the starting execution address
@@ -47,6 +181,18 @@ class ListFile:
         """
         Inserts the data at the given location into the list file
         This data should be a string of hexadecimal data
+        Data that is already at any of the locations is written over, and a piece of
+        data inserted earlier that the new data starts inside of now ends where it starts
+        The data is given back in lower case, unless all of its letters were upper case
+        It must be a whole number of bytes, so hex with an odd number of digits raises a ValueError,
+        as that could never be loaded into memory
+
+        >>> list_file = ListFile()
+        >>> list_file.insert_data(0x400, '11223344')
+        >>> list_file.insert_data(0x402, 'AaBb')
+        >>> list_file.get_starting_data(0x400), list_file.get_starting_data(0x402)
+        ('1122', 'aabb')
+
         :param location:
         :param data:
         :return:
@@ -54,14 +200,26 @@ class ListFile:
         assert location >= 0, 'Location is invalid!'
         assert location < MAX_MEMORY_LOCATION, 'Location is beyond possible bounds!'
 
-        # ensure that the data is valid
-        # loop through every 2 or 1 characters
-        for s in re.findall('..?', data):
-            # try to convert to an int of base 16
-            # just to ensure that it is valid
-            int(data, 16)
+        if len(data) % 2 != 0:
+            raise ValueError('Data must be a whole number of bytes!')
+
+        # ensure that the data is valid, this raises a ValueError if it isn't hexadecimal
+        decoded = bytes.fromhex(data)
+        if not decoded:
+            raise ValueError('No data to insert!')
 
-        self.data[str(location)] = data
+        self._write(location, decoded)
+
+        if data.isupper():
+            self._upper_entries.add(location)
+        else:
+            self._upper_entries.discard(location)
+
+        entries = self._entries
+        if not entries or location > entries[-1]:
+            entries.append(location)
+        elif entries[bisect_left(entries, location)] != location:
+            insort(entries, location)
 
     def insert_data_at_symbol(self, name: str, data: str):
         """
@@ -80,9 +238,22 @@ class ListFile:
         """
         assert location >= 0, 'Location is invalid!'
         assert location < MAX_MEMORY_LOCATION, 'Location is beyond possible bounds!'
-        assert str(location) in self.data, 'Location not defined in data!'
+        entry = bisect_left(self._entries, location)
+        assert entry < len(self._entries) and self._entries[entry] == location, 'Location not defined in data!'
+
+        end = self._get_entry_end(location)
+        del self._entries[entry]
+        self._upper_entries.discard(location)
 
-        self.data.pop(str(location), None)
+        # split the segment around the data that is cleared
+        index = self._find_segment(location)
+        start = self._starts[index]
+        segment = self._segments[index]
+        before = segment[:location - start]
+        after = segment[end - start:]
+
+        self._starts[index:index + 1] = [begin for begin, part in [(start, before), (end, after)] if len(part)]
+        self._segments[index:index + 1] = [bytearray(part) for part in [before, after] if len(part)]
 
     def define_symbol(self, name: str, location: int):
         """
@@ -127,16 +298,103 @@ class ListFile:
         assert name in self.symbols, 'Symbol key was not in the labels dictionary'
         return self.get_starting_data(self.get_symbol_location(name))
 
-    def get_starting_data(self, location: int) -> int:
+    def get_starting_data(self, location: int) -> str:
         """
         Gets the data starting at the given location
         :param location:
-        :return:
+        :return: the hex data that was inserted there
         """
         assert location >= 0, 'Location is invalid!'
         assert location < MAX_MEMORY_LOCATION, 'Location is beyond possible bounds!'
-        assert str(location) in self.data, 'Location data not defined!'
-        return self.data[str(location)]
+        entry = bisect_left(self._entries, location)
+        assert entry < len(self._entries) and self._entries[entry] == location, 'Location data not defined!'
+        data = binascii.hexlify(self.get_bytes(location, self._get_entry_end(location) - location)).decode()
+        return data.upper() if location in self._upper_entries else data
+
+    def get_segments(self) -> list:
+        """
+        Gets the data as runs of bytes, with the data that is next to each other joined together
+        >>> list_file = ListFile()
+        >>> list_file.insert_data(0x402, '5678')
+        >>> list_file.insert_data(0x400, '1234')
+        >>> list_file.insert_data(0x500, 'ab')
+        >>> [(location, bytes(segment)) for location, segment in list_file.get_segments()]
+        [(1024, b'\\x124Vx'), (1280, b'\\xab')]
+
+        :return: a list of the location and bytes of each segment, in order of location
+        """
+        return list(zip(self._starts, self._segments))
+
+    def to_bytes(self) -> bytes:
+        """
+        Dumps the current object into the binary format, which is smaller and faster to load than JSON
+        It is made of a header, the symbols, the location and length of each segment, and then
+        the bytes of all of the segments one after another
+        :return:
+        """
+        segments = self.get_segments()
+        symbols = sorted(self.symbols.items())
+
+        parts = [BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, self.starting_execution_address,
+                                    len(symbols), len(segments))]
+        for name, location in symbols:
+            encoded = name.encode()
+            parts.append(BINARY_SYMBOL.pack(location, len(encoded)))
+            parts.append(encoded)
+        for location, segment in segments:
+            parts.append(BINARY_SEGMENT.pack(location, len(segment)))
+        for location, segment in segments:
+            parts.append(segment)
+        return b''.join(parts)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """
+        Loads a list file from the binary format made by to_bytes()
+        The segments are views of the buffer rather than copies, so they can be loaded
+        into memory without being decoded, and the buffer must not be changed while they are used
+        Pickling the list file copies the segments, see __getstate__()
+        >>> list_file = ListFile()
+        >>> list_file.insert_data(0x400, '4e722700')
+        >>> list_file.define_symbol('start', 0x400)
+        >>> ListFile.from_buffer(list_file.to_bytes()) == list_file
+        True
+
+        :param buffer: the bytes, or anything else which supports the buffer protocol (such as an mmap)
+        :return: the list file
+        """
+        view = memoryview(buffer)
+        assert len(view) >= BINARY_HEADER.size, 'Not a binary list file!'
+        magic, version, flags, starting_execution_address, symbol_count, segment_count = \
+            BINARY_HEADER.unpack_from(view)
+        assert magic == BINARY_MAGIC, 'Not a binary list file!'
+        assert version == BINARY_VERSION, 'Binary list file version {} is not supported!'.format(version)
+        offset = BINARY_HEADER.size
+
+        list_file = cls()
+        list_file.starting_execution_address = starting_execution_address
+
+        for _ in range(symbol_count):
+            location, name_length = BINARY_SYMBOL.unpack_from(view, offset)
+            offset += BINARY_SYMBOL.size
+            list_file.symbols[bytes(view[offset:offset + name_length]).decode()] = location
+            offset += name_length
+
+        lengths = []
+        for _ in range(segment_count):
+            lengths.append(BINARY_SEGMENT.unpack_from(view, offset))
+            offset += BINARY_SEGMENT.size
+
+        segments = []
+        for location, length in lengths:
+            assert offset + length <= len(view), 'The binary list file is cut off!'
+            segments.append((location, view[offset:offset + length]))
+            offset += length
+        list_file._starts = [location for location, segment in segments]
+        list_file._segments = [segment for location, segment in segments]
+        list_file._entries = list(list_file._starts)
+
+        return list_file
 
     def to_json(self) -> str:
         """
@@ -144,7 +402,7 @@ class ListFile:
         :return:
         """
         ret = {}
-        ret['data'] = self.data
+        ret['data'] = dict(self.data)
         ret['symbols'] = self.symbols
         ret['startingExecutionAddress'] = self.starting_execution_address
         return json.dumps(ret, sort_keys=True)
@@ -240,13 +498,38 @@ class ListFile:
         if record_type in [SRecordType.S7, SRecordType.S8, SRecordType.S9]:
             self.starting_execution_address = address
 
+    def __getstate__(self) -> dict:
+        """
+        Gets the state that is pickled
+        Segments loaded by from_buffer are views of a buffer, which can't be pickled,
+        so every segment is copied into bytes
+        :return:
+        """
+        state = dict(self.__dict__)
+        state['_segments'] = [bytes(segment) for segment in self._segments]
+        return state
+
+    def __setstate__(self, state: dict):
+        """
+        Sets the state that was unpickled
+        :param state:
+        :return:
+        """
+        self.__dict__.update(state)
+
     def __eq__(self, other) -> bool:
         """
         Equals operator
+        List files are equal when they have the same bytes at the same locations,
+        however the data was inserted
         :param other:
         :return:
         """
-        return self.symbols == other.symbols and self.data == other.data and self.starting_execution_address == other.starting_execution_address
+        if not isinstance(other, ListFile):
+            return NotImplemented
+        return self.symbols == other.symbols and self._starts == other._starts and \
+            self._segments == other._segments and \
+            self.starting_execution_address == other.starting_execution_address
 
     def __ne__(self, other) -> bool:
         """
@@ -254,4 +537,4 @@ class ListFile:
         :param other:
         :return:
         """
-        return self.symbols != other.symbols or self.data != other.data
\ No newline at end of file
+        return not self == other
@@ -1,8 +1,9 @@
 from ...core.enum.ea_mode import EAMode
-from ...core.enum.op_size import MoveSize, OpSize
+from ...core.enum.op_size import MoveSize, OpSize, OP_SIZE_MASKS, OP_SIZE_MSBS
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import standard_cycles
 from ...core.opcodes.opcode import Opcode
 from ...core.util.split_bits import split_bits
 from ...core.util import opcode_util
@@ -17,6 +18,11 @@ class Add(Opcode):  # Forward declaration
 
 
 class Add(Opcode):
+    mnemonics = ['ADD']
+
+    # first opcode words that this opcode can be decoded from: 1101 xxx xxx xxxxxx
+    decode_patterns = [(0xF000, 0xD000)]
+
     # Allowed sizes for this opcode
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
@@ -118,14 +124,7 @@ class Add(Opcode):
             to_increment += OpSize.WORD.value
 
         # mask to apply to the source
-        mask = 0xFF
-
-        if self.size is OpSize.BYTE:
-            mask = 0xFF
-        if self.size is OpSize.WORD:
-            mask = 0xFFFF
-        if self.size is OpSize.LONG:
-            mask = 0xFFFFFFFF
+        mask = OP_SIZE_MASKS[self.size.value]
 
         # which bits of the total should not be modified
         inverted_mask = 0xFFFFFFFF ^ mask
@@ -136,38 +135,26 @@ class Add(Opcode):
 
         total = (raw_total & mask) | preserve
 
-        carry_bit = False
-
         # if the total is greater than the maximum size for the operation
         # then the carry bit will be set
-        if self.size is OpSize.BYTE and raw_total > 0xFF:
-            carry_bit = True
-        if self.size is OpSize.WORD and raw_total > 0xFFFF:
-            carry_bit = True
-        if self.size is OpSize.LONG and raw_total > 0xFFFFFFFF:
-            carry_bit = True
-
-        negative = False
-
-        if self.size is OpSize.BYTE:
-            negative = total & 0x80 > 0
-        elif self.size is OpSize.WORD:
-            negative = total & 0x8000 > 0
-        elif self.size is OpSize.LONG:
-            negative = total & 0x80000000 > 0
+        carry_bit = raw_total > mask
+
+        negative = total & OP_SIZE_MSBS[self.size.value] > 0
 
         original_negative = src_val.get_negative()
 
-        # set the same as the carry bit
-        simulator.set_condition_status_code(ConditionStatusCode.X, carry_bit)
+        # X is set the same as the carry bit, C if a carry is generated
+        ccr = ConditionStatusCode.X | ConditionStatusCode.C if carry_bit else 0
         # result is negative
-        simulator.set_condition_status_code(ConditionStatusCode.N, negative)
+        if negative:
+            ccr |= ConditionStatusCode.N
         # result is zero
-        simulator.set_condition_status_code(ConditionStatusCode.Z, (total & mask) == 0)
+        if (total & mask) == 0:
+            ccr |= ConditionStatusCode.Z
         # set if an overflow is generated, cleared otherwise
-        simulator.set_condition_status_code(ConditionStatusCode.V, negative != original_negative)
-        # set if a carry is generated, cleared otherwise
-        simulator.set_condition_status_code(ConditionStatusCode.C, carry_bit)
+        if negative != original_negative:
+            ccr |= ConditionStatusCode.V
+        simulator.set_condition_status_codes(ConditionStatusCode.ALL, ccr)
 
         # and set the value
         self.dest.set_value(simulator, MemoryValue(OpSize.LONG, unsigned_int=(total & mask)))
@@ -175,6 +162,13 @@ class Add(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return standard_cycles(self.src.mode, self.dest.mode, self.size)
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'Add command: Size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
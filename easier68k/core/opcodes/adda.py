@@ -2,6 +2,7 @@ from ...core.enum.ea_mode import EAMode
 from ...core.enum import ea_mode_bin
 from ...core.opcodes.opcode import Opcode
 from ...simulator.m68k import M68K
+from ...simulator.clock import ea_cycles, is_register_or_immediate
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...core.models.assembly_parameter import AssemblyParameter
 from ...core.util import opcode_util
@@ -14,6 +15,8 @@ class Adda(Opcode):
     pass
 
 class Adda(Opcode):
+    # first opcode words that this opcode can be decoded from: 1101 xxx x11 xxxxxx
+    decode_patterns = [(0xF0C0, 0xD0C0)]
 
     # Allowed sizes for this opcode
     valid_sizes = [OpSize.WORD, OpSize.LONG]
@@ -100,6 +103,15 @@ class Adda(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        if self.size is OpSize.LONG:
+            return (8 if is_register_or_immediate(self.src.mode) else 6) + ea_cycles(self.src.mode, self.size)
+        return 8 + ea_cycles(self.src.mode, self.size)
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'Adda command: Size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
@@ -1,8 +1,9 @@
 from ...core.enum.ea_mode import EAMode
-from ...core.enum.op_size import OpSize
+from ...core.enum.op_size import OpSize, OP_SIZE_MASKS, OP_SIZE_MSBS
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import ea_cycles
 from ...core.opcodes.opcode import Opcode
 from ...core.util.split_bits import split_bits
 from ...core.util import opcode_util
@@ -46,6 +47,9 @@ class Cmp(Opcode):
           Most assemblers automatically make the distinction.
     """
 
+    # first opcode words that this opcode can be decoded from: 1011 xxx 0xx xxxxxx
+    decode_patterns = [(0xF100, 0xB000)]
+
     # the allowed sizes for this opcode
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
@@ -114,23 +118,9 @@ class Cmp(Opcode):
         comp_mv = MemoryValue(self.size,
                               unsigned_int=mask_value_for_length(self.size, comp_mv.get_value_unsigned()))
 
-        negative = False
-
-        if self.size is OpSize.BYTE:
-            negative = comparison & 0x80 > 0
-        elif self.size is OpSize.WORD:
-            negative = comparison & 0x8000 > 0
-        elif self.size is OpSize.LONG:
-            negative = comparison & 0x80000000 > 0
+        negative = comparison & OP_SIZE_MSBS[self.size.value] > 0
 
-        max_val = 0  # Maximum value allowed for the given memory size
-
-        if self.size is OpSize.BYTE:
-            max_val = 0xFF
-        elif self.size is OpSize.WORD:
-            max_val = 0xFFFF
-        elif self.size is OpSize.LONG:
-            max_val = 0xFFFFFFFF
+        max_val = OP_SIZE_MASKS[self.size.value]  # Maximum value allowed for the given memory size
 
         # Overflow occurs if the result cannot be represented by the memory size
         # Get the signed value
@@ -146,14 +136,19 @@ class Cmp(Opcode):
         # ignore the carry bit
 
         # set negative w/ (dest - src) < 0
-        simulator.set_condition_status_code(ConditionStatusCode.Negative, negative)
+        ccr = ConditionStatusCode.Negative if negative else 0
         # set zero w/ (dest_val - src_val) == 0
-        simulator.set_condition_status_code(ConditionStatusCode.Zero, comparison == 0)
+        if comparison == 0:
+            ccr |= ConditionStatusCode.Zero
         # set if an overflow occurs
-        simulator.set_condition_status_code(ConditionStatusCode.Overflow, overflow)
+        if overflow:
+            ccr |= ConditionStatusCode.Overflow
         # set if a borrow occurs
         # (this is the same as if src > dest)
-        simulator.set_condition_status_code(ConditionStatusCode.Carry, raw_total < 0)
+        if raw_total < 0:
+            ccr |= ConditionStatusCode.Carry
+        # X is not affected
+        simulator.set_condition_status_codes(ConditionStatusCode.NZVC, ccr)
 
         # set the number of bytes to increment equal to the length of the
         # instruction (1 word)
@@ -167,6 +162,14 @@ class Cmp(Opcode):
         # increment PC
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        # the destination is always a data register
+        return (6 if self.size is OpSize.LONG else 4) + ea_cycles(self.src.mode, self.size)
+
     def __str__(self):
         return 'CMP Size {}, Src {}, Dest {}'.format(self.size, self.src, self.dest)
 
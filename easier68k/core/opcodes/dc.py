@@ -8,6 +8,11 @@ import math
 
 
 class DC(Opcode):
+    mnemonics = ['DC']
+
+    # DC is processed by the assembler and is never decoded from memory
+    decode_patterns = []
+
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
     QUOTE_DELIMETER = "'"
 
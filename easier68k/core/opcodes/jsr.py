@@ -2,6 +2,7 @@ from ...core.enum.ea_mode import EAMode
 from ...core.enum.op_size import OpSize
 from ...core.enum import ea_mode_bin
 from ...simulator.m68k import M68K
+from ...simulator.clock import JSR_CYCLES
 from ...core.opcodes.opcode import Opcode
 from ...core.util.split_bits import split_bits
 from ...core.util import opcode_util
@@ -28,6 +29,13 @@ class Jsr(Opcode):
                                   Only control addressing modes can be used as listed in the following tables.
         Valid Modes - (An), (xxx).W, (xxx).L
     """
+
+    # first opcode words that this opcode can be decoded from: 0100111010 xxxxxx
+    decode_patterns = [(0xFFC0, 0x4E80)]
+
+    # jumps to the subroutine
+    ends_basic_block = True
+
     def __init__(self, params: list):
         assert len(params) == 1
         assert isinstance(params[0], AssemblyParameter)
@@ -77,20 +85,26 @@ class Jsr(Opcode):
         simulator.increment_program_counter(to_increment)
 
         # get the value of src from the simulator
-        dest_val = self.dest.get_value(simulator, OpSize.LONG)
-        sp_val = simulator.get_register(Register.A7)
-        new_sp_val = sp_val.get_value_unsigned() - 4
+        dest_val = self.dest.get_value_unsigned(simulator, OpSize.LONG)
+        new_sp_val = simulator.get_register_int(Register.A7) - 4
 
         # SP – 4 -> SP
-        simulator.set_register(Register.A7, MemoryValue(OpSize.LONG, unsigned_int=new_sp_val))
+        simulator.set_register_int(Register.A7, new_sp_val)
 
         pc_val = simulator.get_program_counter_value()
 
         # PC -> (SP)
-        AssemblyParameter(EAMode.ALA, new_sp_val).set_value(simulator, MemoryValue(OpSize.LONG, unsigned_int=pc_val))
+        simulator.memory.write_u32(new_sp_val, pc_val)
 
         # Destination Address -> PC
-        simulator.set_register(Register.PC, dest_val)
+        simulator.set_program_counter_value(dest_val)
+
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return JSR_CYCLES[self.dest.mode.value]
 
     def __str__(self):
         # Makes this a bit easier to read in doctest output
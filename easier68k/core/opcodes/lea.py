@@ -3,6 +3,7 @@ from ...core.models.assembly_parameter import AssemblyParameter
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import LEA_CYCLES
 from ...core.opcodes.opcode import Opcode
 from ...core.util import opcode_util
 from ...core.enum.op_size import OpSize
@@ -15,6 +16,11 @@ class Lea(Opcode):
 
 
 class Lea(Opcode):
+    mnemonics = ['LEA']
+
+    # first opcode words that this opcode can be decoded from: 0100 xxx 111 xxxxxx
+    decode_patterns = [(0xF1C0, 0x41C0)]
+
     
     def __init__(self, params: list):
         assert len(params) == 2
@@ -58,10 +64,10 @@ class Lea(Opcode):
         val_len = OpSize.LONG.get_number_of_bytes()
 
         # get the value of the source
-        src_val = self.src.get_value(simulator, val_len)
+        src_val = self.src.get_value_unsigned(simulator, val_len)
 
         # set the value in the dest
-        self.dest.set_value(simulator, src_val)
+        self.dest.set_value_unsigned(simulator, OpSize.LONG, src_val)
 
         # increment the program counter by at least 2 bytes (1 word)
         to_increment = 2
@@ -78,6 +84,13 @@ class Lea(Opcode):
         simulator.increment_program_counter(to_increment)
 
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return LEA_CYCLES[self.src.mode.value]
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'LEA command: src {}, dest {}'.format(self.src, self.dest)
@@ -1,8 +1,9 @@
 from ...core.enum.ea_mode import EAMode
-from ...core.enum.op_size import MoveSize, OpSize
+from ...core.enum.op_size import MoveSize, OpSize, OP_SIZE_MASKS
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import ea_cycles, MOVE_DESTINATION_CYCLES
 from ...core.opcodes.opcode import Opcode
 from ...core.util.split_bits import split_bits
 from ...core.util import opcode_util
@@ -15,6 +16,11 @@ class Move(Opcode):  # Forward declaration
 
 
 class Move(Opcode):
+    mnemonics = ['MOVE']
+
+    # first opcode words that this opcode can be decoded from: 00 ss xxxxxx xxxxxx, where ss is not 00
+    decode_patterns = [(0xF000, 0x1000), (0xF000, 0x2000), (0xF000, 0x3000)]
+
     # Allowed sizes for this opcode
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
@@ -75,11 +81,11 @@ class Move(Opcode):
         :param simulator: The simulator to execute the command on
         :return: Nothing
         """
-        # get the value of src from the simulator
-        src_val = self.src.get_value(simulator, self.size)
+        # get the value of src from the simulator, only the bits used by the size of the operation are moved
+        src_val = self.src.get_value_unsigned(simulator, self.size) & OP_SIZE_MASKS[self.size.value]
 
         # and set the value
-        self.dest.set_value(simulator, src_val)
+        self.dest.set_value_unsigned(simulator, self.size, src_val)
 
         # increment the program counter by the length of the instruction (1 word)
         to_increment = OpSize.WORD.value
@@ -112,6 +118,14 @@ class Move(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return 4 + ea_cycles(self.src.mode, self.size) + \
+            MOVE_DESTINATION_CYCLES[self.dest.mode.value][self.size is OpSize.LONG]
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'Move command: Size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
@@ -2,6 +2,7 @@ from ...core.enum.ea_mode import EAMode
 from ...core.enum import ea_mode_bin
 from ...core.opcodes.opcode import Opcode
 from ...simulator.m68k import M68K
+from ...simulator.clock import ea_cycles
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...core.models.assembly_parameter import AssemblyParameter
 from ...core.util import opcode_util
@@ -33,6 +34,9 @@ class Movea(Opcode):
             Valid Modes - All
     """
 
+    # first opcode words that this opcode can be decoded from: 00 ss xxx 001 xxxxxx, where ss is 10 or 11
+    decode_patterns = [(0xF1C0, 0x2040), (0xF1C0, 0x3040)]
+
     # Allowed sizes for this opcode
     valid_sizes = [OpSize.WORD, OpSize.LONG]
 
@@ -105,6 +109,13 @@ class Movea(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return 4 + ea_cycles(self.src.mode, self.size)
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'Movea command: Size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
@@ -1,8 +1,9 @@
 from ...core.enum.ea_mode import EAMode
-from ...core.enum.op_size import OpSize
+from ...core.enum.op_size import OpSize, OP_SIZE_MASKS, OP_SIZE_MSBS
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import immediate_cycles
 from ...core.opcodes.opcode import Opcode
 from ...core.util.split_bits import split_bits
 from ...core.util import opcode_util
@@ -37,6 +38,9 @@ class Neg(Opcode):
             Valid Modes - Dn, (An), (An)+, -(An), (xxx).W, (xxx).L
     """
 
+    # first opcode words that this opcode can be decoded from: 01000100 xx xxxxxx
+    decode_patterns = [(0xFF00, 0x4400)]
+
     # Allowed sizes for this opcode
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
@@ -100,14 +104,7 @@ class Neg(Opcode):
             to_increment += OpSize.WORD.value
 
         # mask to apply to the source
-        mask = 0xFF
-
-        if self.size is OpSize.BYTE:
-            mask = 0xFF
-        if self.size is OpSize.WORD:
-            mask = 0xFFFF
-        if self.size is OpSize.LONG:
-            mask = 0xFFFFFFFF
+        mask = OP_SIZE_MASKS[self.size.value]
 
         # which bits of the total should not be modified
         inverted_mask = 0xFFFFFFFF ^ mask
@@ -118,14 +115,7 @@ class Neg(Opcode):
 
         total = (raw_total & mask) | preserve
 
-        negative_bit = 0
-
-        if self.size is OpSize.BYTE:
-            negative_bit = 0x80
-        elif self.size is OpSize.WORD:
-            negative_bit = 0x8000
-        elif self.size is OpSize.LONG:
-            negative_bit = 0x80000000
+        negative_bit = OP_SIZE_MSBS[self.size.value]
 
         negative = total & negative_bit > 0
 
@@ -146,16 +136,18 @@ class Neg(Opcode):
         # Cleared if the result is 0.
         carry_bit = total != 0
 
-        # set the same as the 'C' bit
-        simulator.set_condition_status_code(ConditionStatusCode.X, carry_bit)
+        # X is set the same as the 'C' bit, C if a borrow is generated
+        ccr = ConditionStatusCode.X | ConditionStatusCode.C if carry_bit else 0
         # set if result is negative
-        simulator.set_condition_status_code(ConditionStatusCode.N, negative)
+        if negative:
+            ccr |= ConditionStatusCode.N
         # set if result is zero
-        simulator.set_condition_status_code(ConditionStatusCode.Z, total == 0)
+        if total == 0:
+            ccr |= ConditionStatusCode.Z
         # set if an overflow is generated, cleared otherwise
-        simulator.set_condition_status_code(ConditionStatusCode.V, overflow)
-        # set if a borrow is generated, cleared otherwise
-        simulator.set_condition_status_code(ConditionStatusCode.C, carry_bit)
+        if overflow:
+            ccr |= ConditionStatusCode.V
+        simulator.set_condition_status_codes(ConditionStatusCode.ALL, ccr)
 
         # and set the value
         self.dest.set_value(simulator, MemoryValue(OpSize.LONG, unsigned_int=total))
@@ -163,6 +155,13 @@ class Neg(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return immediate_cycles(self.dest.mode, self.size, (4, 6), (8, 12))
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'Neg command: Size {}, dest {}'.format(self.size, self.dest)
@@ -1,11 +1,41 @@
 from ...simulator.m68k import M68K
+from ..util.opcode_registry import opcode_registry
+
+
+class OpcodeMeta(type):
+    """
+    Registers every opcode class which lists its own mnemonics when it is created
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        # only the classes that set mnemonics themselves, not the ones that inherit them
+        if namespace.get('mnemonics'):
+            opcode_registry.register(cls)
 
 
 class Opcode:
     pass
 
 
-class Opcode:
+class Opcode(metaclass=OpcodeMeta):
+    # the mnemonics this opcode is written with (e.g. ['MOVE']), which register it with
+    # the opcode registry, so it can be assembled and simulated
+    mnemonics = []
+
+    # (mask, value) pairs describing which first opcode words this opcode can be
+    # disassembled from, a word is a candidate when word & mask == value
+    # None means that any word may be a candidate
+    decode_patterns = None
+
+    # whether execution may not continue on to the next instruction in memory
+    # after this opcode (like jumping or halting), which ends a basic block
+    ends_basic_block = False
+
+    # the number of clock cycles this instruction takes, which is set from get_cycles()
+    # when the instruction is decoded by the simulator, so it is only calculated once
+    cycles = 0
+
     def assemble(self) -> bytes:
         """
         Assembles this opcode into hex to be inserted into memory
@@ -21,6 +51,13 @@ class Opcode:
         """
         pass
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return 0
+
     def __str__(self):
         return "Generic command base"
 
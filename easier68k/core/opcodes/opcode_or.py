@@ -3,15 +3,21 @@ from ...core.models.assembly_parameter import AssemblyParameter
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import standard_cycles
 from ...core.util.split_bits import split_bits
 from ...core.opcodes.opcode import Opcode
 from ...core.util import opcode_util
-from ...core.enum.op_size import OpSize
+from ...core.enum.op_size import OpSize, OP_SIZE_MSBS
 from ..util.parsing import parse_assembly_parameter
 from ..enum.condition_status_code import ConditionStatusCode
 
 
 class Or(Opcode):
+    mnemonics = ['OR']
+
+    # first opcode words that this opcode can be decoded from: 1000 xxx xxx xxxxxx
+    decode_patterns = [(0xF000, 0x8000)]
+
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
     def __init__(self, params: list, size: OpSize=OpSize.WORD):
@@ -113,20 +119,14 @@ class Or(Opcode):
         result = src_val | dest_val
         result_unsigned = result.get_value_unsigned()
 
-        msb_bit = 0
-
-        if self.size is OpSize.BYTE:
-            msb_bit = 0x80
-        elif self.size is OpSize.WORD:
-            msb_bit = 0x8000
-        elif self.size is OpSize.LONG:
-            msb_bit = 0x80000000
+        msb_bit = OP_SIZE_MSBS[self.size.value]
 
         # set status codes
-        simulator.set_condition_status_code(ConditionStatusCode.N, msb_bit & result_unsigned != 0)
-        simulator.set_condition_status_code(ConditionStatusCode.Z, result_unsigned == 0)
-        simulator.set_condition_status_code(ConditionStatusCode.V, False)
-        simulator.set_condition_status_code(ConditionStatusCode.C, False)
+        # N and Z from the result, V and C are always cleared, X is not affected
+        ccr = ConditionStatusCode.N if msb_bit & result_unsigned != 0 else 0
+        if result_unsigned == 0:
+            ccr |= ConditionStatusCode.Z
+        simulator.set_condition_status_codes(ConditionStatusCode.NZVC, ccr)
 
         # and set the value
         self.dest.set_value(simulator, result)
@@ -134,6 +134,13 @@ class Or(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return standard_cycles(self.src.mode, self.dest.mode, self.size)
+
     def __str__(self):
         return 'Or command: size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
 
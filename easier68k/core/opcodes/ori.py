@@ -3,10 +3,11 @@ from ...core.models.assembly_parameter import AssemblyParameter
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import immediate_cycles
 from ...core.util.split_bits import split_bits
 from ...core.opcodes.opcode import Opcode
 from ...core.util import opcode_util
-from ...core.enum.op_size import OpSize
+from ...core.enum.op_size import OpSize, OP_SIZE_MSBS
 from ..util.parsing import parse_assembly_parameter
 from ..enum.condition_status_code import ConditionStatusCode
 from ..models.memory_value import MemoryValue
@@ -17,6 +18,9 @@ class Ori(Opcode):  # Forward declaration
 
 
 class Ori(Opcode):
+    # first opcode words that this opcode can be decoded from: 00000000 xx xxxxxx
+    decode_patterns = [(0xFF00, 0x0000)]
+
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
     def __init__(self, params: list, size: OpSize=OpSize.WORD):
@@ -95,19 +99,13 @@ class Ori(Opcode):
 
         result_unsigned = src_val.get_value_unsigned() | dest_val.get_value_unsigned()
 
-        msb_bit = 0
-
-        if self.size is OpSize.BYTE:
-            msb_bit = 0x80
-        elif self.size is OpSize.WORD:
-            msb_bit = 0x8000
-        elif self.size is OpSize.LONG:
-            msb_bit = 0x80000000
+        msb_bit = OP_SIZE_MSBS[self.size.value]
 
-        simulator.set_condition_status_code(ConditionStatusCode.N, msb_bit & result_unsigned != 0)
-        simulator.set_condition_status_code(ConditionStatusCode.Z, result_unsigned == 0)
-        simulator.set_condition_status_code(ConditionStatusCode.V, False)
-        simulator.set_condition_status_code(ConditionStatusCode.C, False)
+        # N and Z from the result, V and C are always cleared, X is not affected
+        ccr = ConditionStatusCode.N if msb_bit & result_unsigned != 0 else 0
+        if result_unsigned == 0:
+            ccr |= ConditionStatusCode.Z
+        simulator.set_condition_status_codes(ConditionStatusCode.NZVC, ccr)
 
         # and set the value
         self.dest.set_value(simulator, MemoryValue(OpSize.LONG, unsigned_int=result_unsigned))
@@ -115,6 +113,13 @@ class Ori(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return immediate_cycles(self.dest.mode, self.size, (8, 16), (12, 20))
+
     def __str__(self):
         return 'Ori command: size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
 
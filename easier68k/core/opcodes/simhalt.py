@@ -9,6 +9,14 @@ class Simhalt(Opcode):
 
 
 class Simhalt(Opcode):
+    mnemonics = ['SIMHALT']
+
+    # first opcode words that this opcode can be decoded from: 1111111111111111
+    decode_patterns = [(0xFFFF, 0xFFFF)]
+
+    # halts the simulator
+    ends_basic_block = True
+
     def __init__(self):
         pass  # Nothing to initialize: SIMHALT is parameterless
 
@@ -32,6 +40,14 @@ class Simhalt(Opcode):
         # increment the program counter
         simulator.increment_program_counter(OpSize.LONG.value)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        # not a real instruction, so this is the time of a NOP
+        return 4
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'SIMHALT command'
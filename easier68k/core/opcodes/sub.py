@@ -1,8 +1,9 @@
 from ...core.enum.ea_mode import EAMode
-from ...core.enum.op_size import OpSize
+from ...core.enum.op_size import OpSize, OP_SIZE_MASKS, OP_SIZE_MSBS
 from ...core.enum import ea_mode_bin
 from ...core.enum.ea_mode_bin import parse_ea_from_binary
 from ...simulator.m68k import M68K
+from ...simulator.clock import standard_cycles
 from ...core.opcodes.opcode import Opcode
 from ...core.util.split_bits import split_bits
 from ...core.util import opcode_util
@@ -17,6 +18,9 @@ class Sub(Opcode):  # Forward declaration
 
 
 class Sub(Opcode):
+    # first opcode words that this opcode can be decoded from: 1001 xxx xxx xxxxxx
+    decode_patterns = [(0xF000, 0x9000)]
+
     # Allowed sizes for this opcode
     valid_sizes = [OpSize.BYTE, OpSize.WORD, OpSize.LONG]
 
@@ -116,14 +120,7 @@ class Sub(Opcode):
             to_increment += OpSize.WORD.value
 
         # mask to apply to the source
-        mask = 0xFF
-
-        if self.size is OpSize.BYTE:
-            mask = 0xFF
-        if self.size is OpSize.WORD:
-            mask = 0xFFFF
-        if self.size is OpSize.LONG:
-            mask = 0xFFFFFFFF
+        mask = OP_SIZE_MASKS[self.size.value]
 
         # which bits of the total should not be modified
         inverted_mask = 0xFFFFFFFF ^ mask
@@ -138,14 +135,7 @@ class Sub(Opcode):
         # negative, then a borrow has been generated.
         borrow_bit = (mask & dest_val.get_value_unsigned()) - src_val.get_value_unsigned() < 0
 
-        negative_bit = 0
-
-        if self.size is OpSize.BYTE:
-            negative_bit = 0x80
-        elif self.size is OpSize.WORD:
-            negative_bit = 0x8000
-        elif self.size is OpSize.LONG:
-            negative_bit = 0x80000000
+        negative_bit = OP_SIZE_MSBS[self.size.value]
 
         negative = total & negative_bit > 0
 
@@ -161,16 +151,18 @@ class Sub(Opcode):
                     overflow = True
                     set_val = total      # The value overflowed, so return the entire amount
 
-        # set the same as the 'C' bit
-        simulator.set_condition_status_code(ConditionStatusCode.X, borrow_bit)
+        # X is set the same as the 'C' bit, C if a borrow is generated
+        ccr = ConditionStatusCode.X | ConditionStatusCode.C if borrow_bit else 0
         # set if result is negative
-        simulator.set_condition_status_code(ConditionStatusCode.N, negative)
+        if negative:
+            ccr |= ConditionStatusCode.N
         # set if result is zero
-        simulator.set_condition_status_code(ConditionStatusCode.Z, set_val == 0)
+        if set_val == 0:
+            ccr |= ConditionStatusCode.Z
         # set if an overflow is generated, cleared otherwise
-        simulator.set_condition_status_code(ConditionStatusCode.V, overflow)
-        # set if a borrow is generated, cleared otherwise
-        simulator.set_condition_status_code(ConditionStatusCode.C, borrow_bit)
+        if overflow:
+            ccr |= ConditionStatusCode.V
+        simulator.set_condition_status_codes(ConditionStatusCode.ALL, ccr)
 
         # and set the value
         self.dest.set_value(simulator, MemoryValue(OpSize.LONG, unsigned_int=set_val))
@@ -178,6 +170,13 @@ class Sub(Opcode):
         # set the program counter value
         simulator.increment_program_counter(to_increment)
 
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return standard_cycles(self.src.mode, self.dest.mode, self.size)
+
     def __str__(self):
         # Makes this a bit easier to read in doctest output
         return 'Sub command: Size {}, src {}, dest {}'.format(self.size, self.src, self.dest)
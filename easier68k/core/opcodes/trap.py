@@ -1,18 +1,28 @@
 from ..opcodes.opcode import Opcode
 from ...simulator.m68k import M68K
+from ...simulator.clock import TRAP_CYCLES
 from ..util.parsing import parse_assembly_parameter, from_str_util
 from ..util.split_bits import split_bits
 from ..models.trap_vector import TrapVector
 from ..enum.trap_task import TrapTask
 from ..enum.register import Register
 from ..enum.op_size import OpSize
-from ..util.input import get_input
 from ..enum.trap_vector import TrapVectors
 
+# the most characters that can be read by ReadNullTermString
+MAX_INPUT_STRING_LENGTH = 80
+
 class Trap(Opcode): # forward declaration
     pass
 
 class Trap(Opcode):
+    mnemonics = ['TRAP']
+
+    # first opcode words that this opcode can be decoded from: 010011100100 xxxx
+    decode_patterns = [(0xFFF0, 0x4E40)]
+
+    # may halt or wait on I/O
+    ends_basic_block = True
 
     def __init__(self, param: TrapVectors):
         assert isinstance(param, TrapVectors)
@@ -48,50 +58,55 @@ class Trap(Opcode):
         """
         if self.trpVector.value == TrapVectors.IO:
 
-            task = TrapTask(simulator.get_register(Register.D0).get_value_unsigned())
+            task = TrapTask(simulator.get_register_int(Register.D0))
 
             if task is TrapTask.DisplayNullTermString:
-
-                # get the value of A1
-                location = simulator.get_register(Register.A1).get_value_unsigned()
-                value = simulator.memory.get(1, location).get_value_unsigned()
-                while value != 0:
-                    print(chr(value), end='')
-                    location += 1
-                    value = simulator.memory.get(1, location).get_value_unsigned()
+                # display the string at (A1)
+                simulator.console.write(self._read_string(simulator))
 
             if task is TrapTask.DisplayNullTermStringWithCRLF:
-                # get the value of A1
-                location = simulator.get_register(Register.A1).get_value_unsigned()
-                value = simulator.memory.get(1, location).get_value_unsigned()
-                while value != 0:
-                    print(chr(value), end='')
-                    location += 1
-                    value = simulator.memory.get(1, location).get_value_unsigned()
-                print('')
+                # display the string at (A1) and a new line
+                simulator.console.write(self._read_string(simulator) + '\n')
 
             if task is TrapTask.DisplayNullTermStringAndReadNumberFromKeyboard:
-                # get the value of A1
-                location = simulator.get_register(Register.A1).get_value_unsigned()
-                value = simulator.memory.get(1, location).get_value_unsigned()
-                while value != 0:
-                    print(chr(value), end='')
-                    location += 1
-                    value = simulator.memory.get(1, location).get_value_unsigned()
+                # display the string at (A1), only once if this has to wait for input
+                simulator.console.write_prompt(self._read_string(simulator))
 
                 # read a number from the keyboard
+                self._read_number(simulator)
+
+            if task is TrapTask.ReadNullTermString:
+                # read a line into (A1), and its length into D1.W
+                line = self._read_line(simulator)[:MAX_INPUT_STRING_LENGTH]
+                data = line.encode('latin-1', 'replace')
+                simulator.memory.write_bytes(simulator.get_register_int(Register.A1), data + b'\x00')
+                d1 = simulator.get_register_int(Register.D1)
+                simulator.set_register_int(Register.D1, (d1 & 0xFFFF0000) | len(data))
+
+            if task is TrapTask.ReadNumberFromKeyboard:
+                # read a number into D1.L
+                self._read_number(simulator)
+
+            if task is TrapTask.ReadSingleCharacterFromKeyboard:
+                # read a character into D1.B
+                if self.use_debug_input:
+                    character = self.debug_input[0:1] or '\r'
+                else:
+                    character = simulator.console.read_character()
+                d1 = simulator.get_register_int(Register.D1)
+                simulator.set_register_int(Register.D1, (d1 & 0xFFFFFF00) | (ord(character) & 0xFF))
 
             if task is TrapTask.DisplaySignedNumber:
                 # get the value of D1.L
                 value = simulator.get_register(Register.D1)
-                print(value.get_value_signed(), end='')
+                simulator.console.write(str(value.get_value_signed()))
 
             if task is TrapTask.DisplaySingleCharacter:
                 # get the value of D1.B
-                value = simulator.get_register(Register.D1).get_value_unsigned()
+                value = simulator.get_register_int(Register.D1)
                 # mask it
                 v = 0xFF & value
-                print(chr(v), end='')
+                simulator.console.write(chr(v))
 
             if task is TrapTask.Terminate:
                 # same as SIMHALT
@@ -100,6 +115,48 @@ class Trap(Opcode):
         # increment the program counter
         simulator.increment_program_counter(OpSize.WORD.value)
 
+    def _read_line(self, simulator: M68K) -> str:
+        """
+        Reads a line of input from the console of the simulator, or the debug input
+        :param simulator:
+        :return:
+        """
+        if self.use_debug_input:
+            simulator.console.prompt_shown = False
+            return self.debug_input
+        return simulator.console.read_line()
+
+    def _read_number(self, simulator: M68K):
+        """
+        Reads a number from a line of input into D1.L
+        Anything that isn't a number is read as 0
+        :param simulator:
+        :return:
+        """
+        try:
+            value = int(self._read_line(simulator).strip())
+        except ValueError:
+            value = 0
+        simulator.set_register_int(Register.D1, value & 0xFFFFFFFF)
+
+    @staticmethod
+    def _read_string(simulator: M68K) -> str:
+        """
+        Gets the null terminated string at the location in A1
+        :param simulator:
+        :return:
+        """
+        location = simulator.get_register_int(Register.A1)
+        # every byte is a character, like chr() of each byte
+        return simulator.memory.read_null_terminated(location).decode('latin-1')
+
+    def get_cycles(self) -> int:
+        """
+        Gets the number of clock cycles it takes to execute this instruction
+        :return:
+        """
+        return TRAP_CYCLES
+
     def __str__(self):
         return 'TRAP {}'.format(self.trpVector)
 
@@ -3,6 +3,7 @@ __all__ = [
     'parsing',
     'opcode_util',
     'find_module',
+    'opcode_registry',
     'split_bits',
     'input'
 ]
@@ -1,36 +1,23 @@
-# This *is* actually a necessary import due to using "reflection" style code further down
+# This *is* actually a necessary import, so that all of the opcodes are registered
 # noinspection PyUnresolvedReferences
 from ..opcodes import *
-from types import ModuleType
-import sys
-
-valid_opcode_classes = [
-    'easier68k.core.opcodes.move.Move',
-    'easier68k.core.opcodes.simhalt.Simhalt',
-    'easier68k.core.opcodes.dc.DC',
-    'easier68k.core.opcodes.lea.Lea',
-    'easier68k.core.opcodes.trap.Trap',
-    'easier68k.core.opcodes.opcode_or.Or',
-    'easier68k.core.opcodes.add.Add'
-]
-
-valid_opcodes = [
-    x.split('.')[-1].upper() for x in valid_opcode_classes
-]
+from .opcode_registry import opcode_registry, build_decode_table
 
 
 def find_opcode_cls(opcode: str) -> type:  # classes are of type "type" Really python?
     """
-    Finds the proper module and module class based on the opcode
+    Finds the opcode class for an opcode, from the opcode registry
+
+    >>> find_opcode_cls('MOVE.B').__name__
+    'Move'
+
+    >>> find_opcode_cls('LEA').__name__
+    'Lea'
+
+    >>> find_opcode_cls('MOV') is None
+    True
+
     :param opcode: The opcode to search for
-    :return: The module and class found (or (None, None) if it doesn't find any)
+    :return: The class found (or None if it doesn't find any)
     """
-    for m in valid_opcode_classes:
-        split = m.split('.')
-        mod_name = '.'.join(split[:-1])  # Trims the class name (the last part after the period)
-        mod = sys.modules[mod_name]
-        cls = getattr(mod, split[-1])
-        if cls.command_matches(opcode):
-            return cls
-
-    return None
+    return opcode_registry.find(opcode)
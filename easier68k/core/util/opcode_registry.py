@@ -0,0 +1,140 @@
+"""
+Opcode Registry
+
+Keeps track of every opcode class that can be assembled and simulated.
+Opcode classes register themselves when they are created, by listing their
+mnemonics in a `mnemonics` class attribute (see OpcodeMeta in opcodes/opcode.py),
+so an opcode from outside of this package only has to be imported to be usable.
+"""
+
+# the number of different first words of an instruction
+DECODE_TABLE_SIZE = 0x10000
+
+
+def build_decode_table(opcode_classes: list) -> list:
+    """
+    Builds a table indexed by the first word of an instruction, which holds
+    the opcode classes that could disassemble an instruction starting with that word
+
+    >>> from ..opcodes.add import Add
+    >>> from ..opcodes.trap import Trap
+    >>> table = build_decode_table([Add, Trap])
+
+    >>> len(table)
+    65536
+
+    >>> [cls.__name__ for cls in table[0xD307]]
+    ['Add']
+
+    >>> [cls.__name__ for cls in table[0x4E4F]]
+    ['Trap']
+
+    >>> table[0x0000]
+    ()
+
+    :param opcode_classes: The opcode classes to include in the table
+    :return: A list of 65536 tuples, the classes in each are in the order they should be tried
+    """
+    entries = []
+    for cls in opcode_classes:
+        patterns = cls.decode_patterns
+        if patterns is None:
+            patterns = [(0x0000, 0x0000)]
+        for mask, value in patterns:
+            entries.append((cls, mask, value))
+
+    # the most specific patterns are tried first, so that more general
+    # opcodes (like MOVE) don't shadow the ones that share their bits (like MOVEA)
+    entries.sort(key=lambda entry: -bin(entry[1]).count('1'))
+
+    table = [()] * DECODE_TABLE_SIZE
+    for cls, mask, value in entries:
+        # walk through every combination of the bits which aren't part of the mask
+        free_bits = ~mask & 0xFFFF
+        bits = free_bits
+        while True:
+            word = value | bits
+            if cls not in table[word]:
+                table[word] = table[word] + (cls,)
+            if bits == 0:
+                break
+            bits = (bits - 1) & free_bits
+
+    return table
+
+
+class OpcodeRegistry:
+    """
+    The opcode classes, by mnemonic and by the first word of their instructions
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        # upper case mnemonic (e.g. 'MOVE') -> opcode class
+        self.classes = {}
+        # the classes in the order they were registered, which is the order they are tried in
+        self._order = []
+
+        # the decode table for the registered classes, built when it is first needed
+        self._decode_table = None
+
+    def register(self, cls: type):
+        """
+        Adds an opcode class, under each of its mnemonics
+        A class registered with the same mnemonic as an earlier one replaces it
+        :param cls: the opcode class
+        :return:
+        """
+        for mnemonic in cls.mnemonics:
+            self.classes[mnemonic.upper()] = cls
+        if cls not in self._order:
+            self._order.append(cls)
+
+        # the table has to be built again to include it
+        self._decode_table = None
+
+    def unregister(self, cls: type):
+        """
+        Removes an opcode class
+        :param cls: the opcode class
+        :return:
+        """
+        self.classes = {mnemonic: registered for mnemonic, registered in self.classes.items() if registered is not cls}
+        if cls in self._order:
+            self._order.remove(cls)
+        self._decode_table = None
+
+    def get_classes(self) -> list:
+        """
+        Gets every registered opcode class, in the order they were registered
+        :return:
+        """
+        # leave out the classes which have had all of their mnemonics replaced
+        registered = set(self.classes.values())
+        return [cls for cls in self._order if cls in registered]
+
+    def find(self, command: str) -> type:
+        """
+        Finds the opcode class for a command
+        :param command: The command to search for (e.g. 'MOVE.B', 'LEA')
+        :return: The class, or None if no class matches
+        """
+        cls = self.classes.get(command.split('.')[0].upper())
+        if cls is not None and cls.command_matches(command):
+            return cls
+        return None
+
+    def get_decode_table(self) -> list:
+        """
+        Gets the decode table of all of the registered classes, see build_decode_table
+        :return:
+        """
+        if self._decode_table is None:
+            self._decode_table = build_decode_table(self.get_classes())
+        return self._decode_table
+
+
+# the registry that opcode classes add themselves to
+opcode_registry = OpcodeRegistry()
@@ -37,10 +37,24 @@ def from_str_util(command: str, parameters: str) -> (OpSize, list, list):
 
     return OpSize.parse(size), params, parts
 
+# operand text -> the AssemblyParameter parsed from it, see parse_assembly_parameter
+_parsed_parameters = {}
+
+# the most operands that are remembered, so assembling huge files can't use up memory
+MAX_PARSED_PARAMETERS = 65536
+
+
 def parse_assembly_parameter(addr: str) -> AssemblyParameter:
     """
     Parses an effective addressing mode (such as D0, (A1), #$01)
-    and makes a new AssemblyParameter
+    and makes an AssemblyParameter
+
+    The assembler asks for the same operands to be parsed several times for each line
+    (to check it, size it and encode it), so each operand is only really parsed once.
+    The same AssemblyParameter is returned for the same text, so it must not be changed
+
+    >>> parse_assembly_parameter('D3') is parse_assembly_parameter('D3')
+    True
 
     >>> parse_assembly_parameter('D')
     Traceback (most recent call last):
@@ -85,6 +99,20 @@ def parse_assembly_parameter(addr: str) -> AssemblyParameter:
     >>> str(parse_assembly_parameter('-(A2)'))
     'EA Mode: EAMode.ARIPD, Data: 2'
     """
+    parameter = _parsed_parameters.get(addr)
+    if parameter is None:
+        parameter = _parse_assembly_parameter(addr)
+        if parameter is not None and len(_parsed_parameters) < MAX_PARSED_PARAMETERS:
+            _parsed_parameters[addr] = parameter
+    return parameter
+
+
+def _parse_assembly_parameter(addr: str) -> AssemblyParameter:
+    """
+    Parses an effective addressing mode, without looking for it in the ones already parsed
+    :param addr: the operand text
+    :return: the new AssemblyParameter, or None if the text isn't an effective address
+    """
     assert len(addr) >= 2
 
     if addr[0] == 'D':
@@ -1,5 +1,13 @@
 __all__ = [
+    'block_engine',
     'clock',
+    'console',
+    'instruction_cache',
+    'journal',
     'm68k',
-    'memory'
-]
\ No newline at end of file
+    'mapped_memory',
+    'memory',
+    'paged_memory',
+    'snapshot',
+    'watchpoint'
+]
@@ -0,0 +1,164 @@
+"""
+Block Engine
+
+An alternative to executing one instruction at a time.
+Straight-line runs of instructions (basic blocks) are recorded the first time
+they are executed, and from then on each block is executed with a single dispatch.
+A block ends at any opcode that may not continue on to the next instruction in memory
+(JSR, TRAP, SIMHALT), so halting is checked at block boundaries.
+While there are breakpoints or watchpoints, M68K.run() doesn't use blocks.
+"""
+
+# the maximum number of instructions recorded in a single block
+MAX_BLOCK_LENGTH = 64
+
+
+class BasicBlock:
+    """
+    A run of instructions which always execute one after another
+    """
+
+    def __init__(self, instructions: list, generation: int, run):
+        """
+        Constructor
+        :param instructions: list of (location, opcode) in the order they execute
+        :param generation: the instruction cache generation the instructions were valid at
+        :param run: callable which executes the whole block on a simulator
+        """
+        self.instructions = instructions
+        self.generation = generation
+        self.run = run
+
+    def is_valid(self, instruction_cache) -> bool:
+        """
+        Checks that none of the instructions in this block have been overwritten
+        :param instruction_cache:
+        :return:
+        """
+        for location, op in self.instructions:
+            if instruction_cache.entries.get(location) is not op:
+                return False
+        return True
+
+
+def compile_block(instructions: list, instruction_cache):
+    """
+    Builds the callable that executes all of the instructions of a block
+    :param instructions: list of (location, opcode) in the order they execute
+    :param instruction_cache: the cache the opcodes were decoded from
+    :return: a callable taking the simulator to run the block on,
+        which returns the number of instructions executed
+    """
+    steps = tuple((op.execute, op.cycles) for location, op in instructions)
+
+    def run_block(simulator):
+        generation = instruction_cache.generation
+        executed = 0
+        for execute, cycles in steps:
+            execute(simulator)
+            simulator._clock_cycles += cycles
+            executed += 1
+            if instruction_cache.generation != generation:
+                # an instruction was overwritten, so the rest
+                # of this block may no longer be what is in memory
+                break
+        return executed
+
+    return run_block
+
+
+class BlockEngine:
+    """
+    Executes a simulator one basic block at a time
+    """
+
+    def __init__(self, simulator):
+        """
+        Constructor
+        :param simulator: the M68K to execute
+        """
+        self.simulator = simulator
+
+        # starting location -> BasicBlock
+        self.blocks = {}
+
+        # statistics
+        self.blocks_built = 0
+        self.dispatches = 0
+
+    def step_block(self):
+        """
+        Executes the block starting at the current program counter
+        If that block hasn't been seen before, it is executed one instruction
+        at a time and recorded for next time
+        :return: the number of instructions executed
+        """
+        simulator = self.simulator
+        if simulator.halted:
+            return 0
+
+        if simulator.journal is not None:
+            # every instruction has to be recorded on its own
+            simulator.step_instruction()
+            return 1
+
+        cache = simulator.instruction_cache
+        location = simulator.get_program_counter_value()
+
+        block = self.blocks.get(location)
+        if block is not None and block.generation != cache.generation:
+            # some code was overwritten since the block was built, check if it was this block
+            if block.is_valid(cache):
+                block.generation = cache.generation
+            else:
+                del self.blocks[location]
+                block = None
+
+        if block is None:
+            return self._record_block(location)
+
+        self.dispatches += 1
+        return block.run(simulator)
+
+    def _record_block(self, start: int):
+        """
+        Executes instructions one at a time from the start location until the end
+        of the block, and then compiles them for the next time the block is run
+        :param start:
+        :return: the number of instructions executed
+        """
+        simulator = self.simulator
+        cache = simulator.instruction_cache
+        generation = cache.generation
+        instructions = []
+        location = start
+
+        while len(instructions) < MAX_BLOCK_LENGTH:
+            op = simulator.fetch_instruction(location)
+            if op is None:
+                # can't decode this, let the interpreter deal with it
+                if not instructions:
+                    simulator.step_instruction()
+                return len(instructions)
+
+            instructions.append((location, op))
+            op.execute(simulator)
+            simulator._clock_cycles += op.cycles
+
+            if op.ends_basic_block or simulator.halted or cache.generation != generation:
+                break
+
+            location = simulator.get_program_counter_value()
+
+        # if the code changed while recording, the recording can't be trusted
+        if cache.generation == generation:
+            self.blocks[start] = BasicBlock(instructions, generation, compile_block(instructions, cache))
+            self.blocks_built += 1
+        return len(instructions)
+
+    def clear(self):
+        """
+        Drops all of the compiled blocks
+        :return:
+        """
+        self.blocks = {}
@@ -1,7 +1,98 @@
 """
 Used by m68k to handle stepping through actions
+
+Also holds the timing of the 68000, from the instruction execution times
+section of the M68000 user's manual. All of the times are in clock cycles,
+and include fetching the instruction and its extension words.
 """
 
+from ..core.enum.ea_mode import EAMode
+from ..core.enum.op_size import OpSize
+
+# the time taken to calculate an effective address and fetch the operand,
+# as (byte or word, long) for each EAMode value
+EA_CALCULATION_CYCLES = (
+    (0, 0),    # Dn
+    (0, 0),    # An
+    (4, 8),    # (An)
+    (4, 8),    # (An)+
+    (6, 10),   # -(An)
+    (4, 8),    # #<data>
+    (12, 16),  # (xxx).L
+    (8, 12),   # (xxx).W
+)
+
+# the time taken to write the destination of a move, as (byte or word, long) for each EAMode value
+# this is the same as the calculation time, except that a pre decrement is done while writing
+MOVE_DESTINATION_CYCLES = (
+    (0, 0),    # Dn
+    (0, 0),    # An
+    (4, 8),    # (An)
+    (4, 8),    # (An)+
+    (4, 8),    # -(An)
+    (0, 0),    # #<data> (can't be a destination)
+    (12, 16),  # (xxx).L
+    (8, 12),   # (xxx).W
+)
+
+# the time taken by LEA and JSR, which only calculate an address, for each EAMode value
+# None for the modes that can't be used
+LEA_CYCLES = (None, None, 4, None, None, None, 12, 8)
+JSR_CYCLES = (None, None, 16, None, None, None, 20, 18)
+
+# the time taken to process a trap exception
+TRAP_CYCLES = 34
+
+
+def ea_cycles(mode: EAMode, size: OpSize) -> int:
+    """
+    Gets the time taken to calculate an effective address and fetch its operand
+    :param mode: the addressing mode
+    :param size: the size of the operand
+    :return: the number of clock cycles
+    """
+    return EA_CALCULATION_CYCLES[mode.value][size is OpSize.LONG]
+
+
+def is_register_or_immediate(mode: EAMode) -> bool:
+    """
+    Some of the long word operations take longer when their source isn't memory
+    :param mode:
+    :return: true for the register direct and immediate modes
+    """
+    return mode in [EAMode.DRD, EAMode.ARD, EAMode.IMM]
+
+
+def standard_cycles(src_mode: EAMode, dest_mode: EAMode, size: OpSize) -> int:
+    """
+    Gets the time taken by ADD, SUB or OR, which can either be
+    <ea>,Dn or Dn,<ea>
+    :param src_mode:
+    :param dest_mode:
+    :param size:
+    :return: the number of clock cycles
+    """
+    if dest_mode is EAMode.DRD:
+        if size is OpSize.LONG:
+            return (8 if is_register_or_immediate(src_mode) else 6) + ea_cycles(src_mode, size)
+        return 4 + ea_cycles(src_mode, size)
+    return (12 if size is OpSize.LONG else 8) + ea_cycles(dest_mode, size)
+
+
+def immediate_cycles(dest_mode: EAMode, size: OpSize, register: tuple, memory: tuple) -> int:
+    """
+    Gets the time taken by an immediate or single operand instruction
+    :param dest_mode: the mode of the operand being modified
+    :param size:
+    :param register: the (byte or word, long) times if the operand is a data register
+    :param memory: the (byte or word, long) times before calculating the effective address otherwise
+    :return: the number of clock cycles
+    """
+    long = size is OpSize.LONG
+    if dest_mode is EAMode.DRD:
+        return register[long]
+    return memory[long] + ea_cycles(dest_mode, size)
+
 
 class Clock():
     def __init__(self):
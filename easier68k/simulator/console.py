@@ -0,0 +1,159 @@
+"""
+Console
+
+The input and output of a simulator, used by the TRAP #15 tasks.
+Output can go to any text stream, like an io.StringIO or a file, or to a callable,
+and input can come from any text stream or callable that returns a line.
+By default these are sys.stdout and the terminal, looked up whenever they
+are used so that redirecting sys.stdout also redirects the console.
+
+For runs without a terminal, input can be scripted with a ScriptedInput,
+a file or a pipe. Running out of input raises EndOfInputError instead of waiting,
+which M68K.run() stops at, so more input can be fed before running again.
+Every line read is kept in the input log, so a run can be replayed exactly.
+"""
+
+import sys
+from collections import deque
+from ..core.util.input import get_input
+
+
+class EndOfInputError(Exception):
+    pass
+
+
+class ScriptedInput:
+    """
+    Input made from lines given ahead of time
+    """
+
+    def __init__(self, lines: list = None):
+        """
+        Constructor
+        :param lines: the lines of input, without line endings
+        """
+        self._lines = deque([] if lines is None else lines)
+
+    def feed(self, text: str):
+        """
+        Adds more lines of input
+        :param text: the lines, separated by new lines
+        :return:
+        """
+        self._lines.extend(text.splitlines())
+
+    def readline(self) -> str:
+        """
+        Gets the next line, like a file would
+        :return: the line with a new line on the end, or an empty string if there are no lines left
+        """
+        if not self._lines:
+            return ''
+        return self._lines.popleft() + '\n'
+
+
+class Console:
+    """
+    Where a simulator writes output and reads input
+    """
+
+    def __init__(self, output=None, input=None):
+        """
+        Constructor
+        :param output: a text stream, or a callable which is given each piece of text written,
+            by default sys.stdout
+        :param input: a text stream, or a callable which returns the next line,
+            by default the terminal
+        """
+        self.output = output
+        self.input = input
+
+        # every line that has been read, in order
+        self.input_log = []
+
+        # what is left of the last line read by read_character
+        self._pending = ''
+
+        # whether a prompt has been written which is still waiting for its input
+        # a TRAP that ran out of input is executed again, and this stops it writing its prompt twice
+        self.prompt_shown = False
+
+    def write(self, text: str):
+        """
+        Writes text to the output, all at once
+        :param text:
+        :return:
+        """
+        output = self.output
+        if output is None:
+            sys.stdout.write(text)
+        elif hasattr(output, 'write'):
+            output.write(text)
+        else:
+            output(text)
+
+    def write_prompt(self, text: str):
+        """
+        Writes a prompt for the next line of input
+        If the prompt was already written, but its input hasn't been read yet, it isn't written again
+        :param text:
+        :return:
+        """
+        if not self.prompt_shown:
+            self.write(text)
+            self.prompt_shown = True
+
+    def flush(self):
+        """
+        Flushes the output, if it is a stream
+        :return:
+        """
+        output = sys.stdout if self.output is None else self.output
+        if hasattr(output, 'flush'):
+            output.flush()
+
+    def read_line(self) -> str:
+        """
+        Reads the next line of input, without the line ending
+        Any output is flushed first, so that prompts are shown
+        :return:
+        """
+        if self._pending:
+            # finish the line that read_character started
+            line = self._pending[:-1]
+            self._pending = ''
+            return line
+
+        self.flush()
+        source = self.input
+        if source is None:
+            try:
+                line = get_input()
+            except EOFError:
+                raise EndOfInputError
+        else:
+            if hasattr(source, 'readline'):
+                line = source.readline()
+            else:
+                line = source()
+            # streams return an empty string once they run out
+            if line == '' or line is None:
+                raise EndOfInputError
+
+        line = line.rstrip('\r\n')
+        self.input_log.append(line)
+        self.prompt_shown = False
+        return line
+
+    def read_character(self) -> str:
+        """
+        Reads the next character of input
+        Input is read a line at a time, and the end of each line is read
+        as a carriage return, like pressing enter
+        :return:
+        """
+        if not self._pending:
+            self._pending = self.read_line() + '\r'
+        character = self._pending[0]
+        self._pending = self._pending[1:]
+        return character
@@ -0,0 +1,120 @@
+"""
+Instruction Cache
+
+Keeps the already decoded opcode for each program counter location
+so that instructions which are executed many times only have to be
+disassembled once.
+Entries are dropped whenever the memory they were decoded from is written to,
+so self-modifying code still works.
+"""
+
+# the maximum number of bytes an instruction is decoded from
+# 2 bytes for the op and max 2 longs which are each 4 bytes
+MAX_INSTRUCTION_LENGTH = 10
+
+# entries are grouped into pages of 2^8 bytes so that
+# writes can quickly tell if they touch any cached instructions
+PAGE_SHIFT = 8
+
+
+class InstructionCache:
+    """
+    Maps program counter locations to their decoded opcodes
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        # program counter location -> decoded opcode
+        self.entries = {}
+
+        # page number -> set of cached locations which overlap that page
+        self._pages = {}
+
+        # incremented every time cached instructions are dropped,
+        # so that anything built from them can tell when it is stale
+        self.generation = 0
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, location: int):
+        """
+        Gets the cached opcode for the given location
+        :param location: the location of the start of the instruction
+        :return: the decoded opcode, or None if it is not cached
+        """
+        op = self.entries.get(location)
+        if op is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return op
+
+    def insert(self, location: int, op):
+        """
+        Caches the decoded opcode for the given location
+        :param location: the location of the start of the instruction
+        :param op: the decoded opcode
+        :return:
+        """
+        self.entries[location] = op
+        for page in range(location >> PAGE_SHIFT, ((location + MAX_INSTRUCTION_LENGTH - 1) >> PAGE_SHIFT) + 1):
+            self._pages.setdefault(page, set()).add(location)
+
+    def invalidate(self, location: int, length: int):
+        """
+        Drops all of the cached instructions which were decoded from
+        any of the bytes in the range [location, location + length)
+        :param location: the start of the range that was written to
+        :param length: the number of bytes that were written
+        :return:
+        """
+        if not self._pages:
+            return
+
+        end = location + length
+        first_page = location >> PAGE_SHIFT
+        last_page = (end - 1) >> PAGE_SHIFT
+
+        # large writes (like loading all of memory) only need to check the pages that are cached
+        if last_page - first_page >= len(self._pages):
+            pages = [page for page in self._pages if first_page <= page <= last_page]
+        else:
+            pages = [page for page in range(first_page, last_page + 1) if page in self._pages]
+
+        for page in pages:
+            locations = self._pages.get(page)
+            if locations is None:
+                continue
+            for cached in [x for x in locations if x < end and x + MAX_INSTRUCTION_LENGTH > location]:
+                self._remove(cached)
+
+    def _remove(self, location: int):
+        """
+        Removes a single cached instruction
+        :param location:
+        :return:
+        """
+        del self.entries[location]
+        self.invalidations += 1
+        self.generation += 1
+        for page in range(location >> PAGE_SHIFT, ((location + MAX_INSTRUCTION_LENGTH - 1) >> PAGE_SHIFT) + 1):
+            locations = self._pages[page]
+            locations.discard(location)
+            if not locations:
+                del self._pages[page]
+
+    def clear(self):
+        """
+        Drops every cached instruction
+        :return:
+        """
+        if self.entries:
+            self.generation += 1
+        self.invalidations += len(self.entries)
+        self.entries = {}
+        self._pages = {}
@@ -0,0 +1,185 @@
+"""
+Execution Journal
+
+Records what every executed instruction changed, so that execution can be run backwards.
+For every instruction the registers are saved before it executes, along with
+the previous contents of every byte of memory it writes.
+Both are kept in fixed size ring buffers of arrays, so once they are full
+the oldest instructions are forgotten, and the journal can be left on for long runs.
+
+Only memory written while an instruction is executing is recorded. Memory written
+between instructions, such as by a debugger or by loading memory, isn't part of any
+instruction, so stepping back doesn't undo it.
+"""
+
+from array import array
+from ..core.enum.op_size import OpSize
+from ..core.enum.register import Register
+
+# the default number of instructions that can be stepped back
+DEFAULT_JOURNAL_LENGTH = 16384
+
+# the default number of bytes of memory writes kept for each instruction, on average
+DEFAULT_WRITE_BYTES_PER_INSTRUCTION = 4
+
+
+class ExecutionJournal:
+    """
+    Bounded record of the state before each executed instruction
+    """
+
+    def __init__(self, simulator, length: int = DEFAULT_JOURNAL_LENGTH, write_length: int = None):
+        """
+        Constructor
+        :param simulator: the M68K being recorded
+        :param length: the maximum number of instructions that are remembered
+        :param write_length: the maximum number of bytes of memory writes that are remembered
+        """
+        assert length > 0, 'The journal must be able to hold at least one instruction!'
+        if write_length is None:
+            write_length = length * DEFAULT_WRITE_BYTES_PER_INSTRUCTION
+
+        self.simulator = simulator
+        self.length = length
+        self.write_length = write_length
+        self._register_count = len(simulator.registers)
+
+        # the state before each instruction, instruction n is in slot n % length
+        self._registers = array('I', [0]) * (length * self._register_count)
+        self._register_sizes = array('B', [0]) * (length * self._register_count)
+        self._halted = array('B', [0]) * length
+        self._auto_cycle = array('B', [0]) * length
+        self._cycles = array('Q', [0]) * length
+        # the number of memory writes recorded before each instruction started
+        self._write_starts = array('Q', [0]) * length
+
+        # the location and previous value of every byte written, byte n is in slot n % write_length
+        self._write_locations = array('I', [0]) * write_length
+        self._write_values = bytearray(write_length)
+
+        # the total number of instructions and bytes recorded, and the oldest instruction still remembered
+        self._count = 0
+        self._write_count = 0
+        self._first = 0
+
+        # set while undoing, so that the undo isn't recorded
+        self._replaying = False
+
+        # set while an instruction is executing, only its writes are recorded
+        self._executing = False
+
+    def __len__(self):
+        """
+        The number of instructions that can be stepped back
+        :return:
+        """
+        return self._count - self._first
+
+    def clear(self):
+        """
+        Forgets everything that has been recorded
+        :return:
+        """
+        self._first = self._count
+
+    def record_instruction(self):
+        """
+        Saves the state of the simulator before an instruction is executed
+        :return:
+        """
+        simulator = self.simulator
+        slot = self._count % self.length
+        start = slot * self._register_count
+
+        self._registers[start:start + self._register_count] = simulator.registers
+        sizes = self._register_sizes
+        for i, size in enumerate(simulator._register_sizes):
+            sizes[start + i] = size.value
+        self._halted[slot] = simulator.halted
+        self._auto_cycle[slot] = simulator.clock_auto_cycle
+        self._cycles[slot] = simulator._clock_cycles
+        self._write_starts[slot] = self._write_count
+
+        self._count += 1
+        if self._count - self._first > self.length:
+            self._first = self._count - self.length
+        self._executing = True
+
+    def finish_instruction(self):
+        """
+        Stops recording memory writes for the instruction that was executing
+        :return:
+        """
+        self._executing = False
+
+    def record_write(self, location: int, length: int):
+        """
+        Write listener which saves the previous contents of memory being written
+        by the instruction that is executing
+        :param location: the start of the range being written
+        :param length: the number of bytes being written
+        :return:
+        """
+        if self._replaying or not self._executing or self._count == self._first:
+            return
+
+        if length > self.write_length:
+            # can't undo this, so nothing before it can be undone either
+            self.clear()
+            return
+
+        memory = self.simulator.memory
+        length = max(0, min(length, len(memory) - location))
+        old = memory.read_bytes(location, length)
+        for i in range(length):
+            slot = self._write_count % self.write_length
+            self._write_locations[slot] = location + i
+            self._write_values[slot] = old[i]
+            self._write_count += 1
+
+        # forget the instructions whose writes have been overwritten
+        oldest_write = self._write_count - self.write_length
+        while self._first < self._count and self._write_starts[self._first % self.length] < oldest_write:
+            self._first += 1
+
+    def get_program_counter(self, back: int) -> int:
+        """
+        Gets the program counter before an instruction was executed
+        :param back: how many instructions ago, 1 is the last instruction executed
+        :return:
+        """
+        assert 0 < back <= len(self), 'That instruction is not in the journal!'
+        slot = (self._count - back) % self.length
+        return self._registers[slot * self._register_count + Register.ProgramCounter]
+
+    def step_back(self) -> bool:
+        """
+        Undoes the last instruction that was executed
+        :return: false if there was nothing to undo
+        """
+        if self._count == self._first:
+            return False
+
+        simulator = self.simulator
+        memory = simulator.memory
+        self._count -= 1
+        slot = self._count % self.length
+        write_start = self._write_starts[slot]
+
+        # put back the memory, newest write first
+        self._replaying = True
+        try:
+            while self._write_count > write_start:
+                self._write_count -= 1
+                write_slot = self._write_count % self.write_length
+                memory.write_u8(self._write_locations[write_slot], self._write_values[write_slot])
+        finally:
+            self._replaying = False
+
+        start = slot * self._register_count
+        simulator.registers[:] = self._registers[start:start + self._register_count]
+        simulator._register_sizes = [OpSize(size) for size in self._register_sizes[start:start + self._register_count]]
+        simulator.halted = bool(self._halted[slot])
+        simulator.clock_auto_cycle = bool(self._auto_cycle[slot])
+        simulator._clock_cycles = self._cycles[slot]
+        return True
@@ -3,22 +3,56 @@ Motorola 68k chip definition
 """
 
 from .memory import Memory
+from .console import Console, EndOfInputError
+from .instruction_cache import InstructionCache
+from .block_engine import BlockEngine, MAX_BLOCK_LENGTH
+from .snapshot import Snapshot
+from .journal import ExecutionJournal, DEFAULT_JOURNAL_LENGTH
 from ..core.enum.register import Register, FULL_SIZE_REGISTERS, ALL_ADDRESS_REGISTERS
 from ..core.enum.condition_status_code import ConditionStatusCode
+from ..core.enum.stop_reason import StopReason
 from ..core.models.list_file import ListFile
 import typing
 import binascii
+import time
+from array import array
 from ..core.models.memory_value import MemoryValue
 from ..core.enum.op_size import OpSize
 
 MAX_MEMORY_LOCATION = 16777216  # 2^24
 
+# the register file is indexed by the Register enum values
+# plain ints are used for these so that the lookups are as cheap as possible
+REGISTER_COUNT = 18
+_PC = int(Register.ProgramCounter)
+_CCR = int(Register.ConditionCodeRegister)
+_ADDRESS_REGISTERS = frozenset(int(r) for r in ALL_ADDRESS_REGISTERS)
+
+# the number of instructions run() executes between checks of its budgets
+BUDGET_CHECK_INTERVAL = 1024
+
+
+class IllegalInstructionError(Exception):
+    pass
+
+
 class M68K:
-    def __init__(self):
+    def __init__(self, memory: Memory = None, console: Console = None):
         """
         Constructor
+        :param memory: the memory to use, such as a PagedMemory, by default a new Memory
+        :param console: where the TRAP #15 tasks write output and read input,
+            by default sys.stdout and the terminal
         """
-        self.memory = Memory()
+        self.memory = Memory() if memory is None else memory
+        self.console = Console() if console is None else console
+
+        # decoded instructions, which are dropped when their memory is written to
+        self.instruction_cache = InstructionCache()
+        self.memory.add_write_listener(self.instruction_cache.invalidate)
+
+        # runs basic blocks of instructions at once, see run()
+        self.block_engine = BlockEngine(self)
 
         # has the simulation been halted using SIMHALT or .halt()
         self.halted = False
@@ -27,31 +61,56 @@ class M68K:
         self.clock_auto_cycle = True
         self._clock_cycles = 0
 
-        # todo add events for each clock cycle
-        # this is necessary for implementing breakpoints
-        # and watches for value changes
+        # the locations of the instructions that run() stops before, see add_breakpoint()
+        # watchpoints are kept by the memory, see Memory.add_watchpoint()
+        self.breakpoints = set()
+        # the breakpoint that run() last stopped at, or None
+        self.triggered_breakpoint = None
+        # set while the instruction run() started at hasn't been executed yet, see _step_checked()
+        self._continuing = False
+
+        # the error raised by the last run() which stopped with StopReason.ERROR
+        self.last_error = None
 
         # set up the registers to their default values
-        self.registers = {}
+        # the values of all of the registers, as unsigned ints
+        self.registers = array('I', [0] * REGISTER_COUNT)
+        # the size of the MemoryValue each register was last set with, used by get_register
+        self._register_sizes = []
         self.__init_registers()
 
+        # the snapshots which can be restored, oldest first, see snapshot()
+        self._snapshots = []
+
+        # records every instruction so that they can be undone, see enable_journal()
+        self.journal = None
+
     def __init_registers(self):
         """
         Set the registers to their default values
         :return:
         """
 
-        # loop through all of the full size registers which are just 32 bits / 4 bytes long
-        for register in FULL_SIZE_REGISTERS:
-            self.registers[register] = MemoryValue(OpSize.LONG)
-
-        # set up all of the odd registers (in this case, just the Condition Code Register)
+        # all of the full size registers are just 32 bits / 4 bytes long
+        # except for the odd registers (in this case, just the Condition Code Register)
         # which just uses 5 bits out of the lowermost byte (do we want to allocate it an entire word instead?)
-        self.registers[Register.ConditionCodeRegister] = MemoryValue(OpSize.BYTE)
+        for register in range(REGISTER_COUNT):
+            self.registers[register] = 0
+        self._register_sizes = [OpSize.LONG] * REGISTER_COUNT
+        self._register_sizes[_CCR] = OpSize.BYTE
 
     def get_register(self, register: Register) -> MemoryValue:
         """
         Gets the entire value of a register
+        This makes a new MemoryValue, use get_register_int where the int value is enough
+        :param register:
+        :return:
+        """
+        return MemoryValue(self._register_sizes[register], unsigned_int=self.registers[register])
+
+    def get_register_int(self, register: Register) -> int:
+        """
+        Gets the entire value of a register as an unsigned int
         :param register:
         :return:
         """
@@ -66,12 +125,12 @@ class M68K:
         """
         # if the register is the CCR, use that method to handle setting it
         # because of its different size
-        if register == Register.ConditionCodeRegister:
+        if register == _CCR:
             self._set_condition_code_register_value(val)
             return
 
         # if the register is an address register that is limited to fit in the bounds of memory
-        if register in ALL_ADDRESS_REGISTERS:
+        if register in _ADDRESS_REGISTERS:
             self.set_address_register_value(register, val)
             return
 
@@ -81,6 +140,24 @@ class M68K:
         assert 0 <= val.get_value_unsigned() <= 0xFFFFFFFF, 'The value for registers must fit into 4 bytes!'
 
         # set the value
+        self.registers[register] = val.get_value_unsigned()
+        self._register_sizes[register] = val.get_size()
+
+    def set_register_int(self, register: Register, val: int, size: OpSize = OpSize.LONG):
+        """
+        Sets the entire value of a register from an unsigned int
+        :param register:
+        :param val:
+        :param size: the size get_register will return the value with, only used by the data registers
+        :return:
+        """
+        if register == _CCR:
+            # since the CCR is just a single byte
+            assert 0 <= val <= 0xFF, 'The value for the CCR must fit in a single byte!'
+        else:
+            assert 0 <= val <= 0xFFFFFFFF, 'The value for registers must fit into 4 bytes!'
+            self._register_sizes[register] = size if register < Register.A0 else OpSize.LONG
+
         self.registers[register] = val
 
     def _set_condition_code_register_value(self, val: MemoryValue):
@@ -94,18 +171,14 @@ class M68K:
         assert 0 <= val.get_value_unsigned() <= 0xFF, 'The value for the CCR must fit in a single byte!'
 
         # now set the value
-        self.registers[Register.ConditionCodeRegister] = val
-
+        self.registers[_CCR] = val.get_value_unsigned()
 
     def get_program_counter_value(self) -> int:
         """
         Gets the 32-bit unsigned integer value for the program counter value
         :return:
         """
-        mv = self.get_register(Register.ProgramCounter)
-        ret = mv.get_value_unsigned()
-        return ret
-
+        return self.registers[_PC]
 
     def set_address_register_value(self, reg: Register, new_value: MemoryValue):
         """
@@ -116,11 +189,12 @@ class M68K:
         """
         # no longer assert that the address register value is a pointer to memory
         # since address register direct modes don't consider the amount of memory
-        assert reg in ALL_ADDRESS_REGISTERS, 'The register given is not an address register!'
+        assert reg in _ADDRESS_REGISTERS, 'The register given is not an address register!'
 
         # now set the value of the register
-        self.registers[reg].set_value_unsigned_int(new_value.get_value_unsigned())
-
+        val = new_value.get_value_unsigned()
+        assert 0 <= val <= 0xFFFFFFFF, 'Value must fit in the range [0, 0xFFFFFFFF].'
+        self.registers[reg] = val
 
     def set_program_counter_value(self, new_value: int):
         """
@@ -129,7 +203,8 @@ class M68K:
         :param new_value:
         :return:
         """
-        self.set_address_register_value(Register.ProgramCounter, MemoryValue(OpSize.LONG, unsigned_int=new_value))
+        assert 0 <= new_value <= 0xFFFFFFFF, 'Value must fit in the range [0, 0xFFFFFFFF].'
+        self.registers[_PC] = new_value
 
     def increment_program_counter(self, inc: int):
         """
@@ -137,8 +212,7 @@ class M68K:
         :param inc:
         :return:
         """
-        self.set_program_counter_value(
-            self.get_program_counter_value() + inc)
+        self.set_program_counter_value(self.registers[_PC] + inc)
 
     def get_condition_status_code(self, code: ConditionStatusCode) -> bool:
         """
@@ -146,9 +220,8 @@ class M68K:
         :param code:
         :return:
         """
-        ccr = self.get_register(Register.CCR).get_value_unsigned()
         # ccr is only 1 byte, bit mask away the bit being looked for
-        return (ccr & code) > 0
+        return (self.registers[_CCR] & code) > 0
 
     def set_condition_status_code(self, code: ConditionStatusCode, value: bool):
         """
@@ -156,28 +229,185 @@ class M68K:
         :param code:
         :return:
         """
-        ccr = self.get_register(Register.CCR)
-        v = ccr.get_value_unsigned()
-
         if value:
-            v |= code
+            self.registers[_CCR] |= code
         else:
-            v &= ~code
-
-        self._set_condition_code_register_value(MemoryValue(OpSize.BYTE, unsigned_int=v))
+            self.registers[_CCR] &= ~code & 0xFF
 
-    def run(self):
+    def set_condition_status_codes(self, mask: int, value: int):
         """
-        Starts the automatic execution
+        Sets all of the codes in the mask at once to the matching bits of value,
+        the codes outside of the mask are not modified
+        :param mask: the ConditionStatusCode bits to set, like ConditionStatusCode.ALL
+        :param value: the ConditionStatusCode bits which are set to true
         :return:
         """
-        if not self.halted:
+        self.registers[_CCR] = (self.registers[_CCR] & ~mask & 0xFF) | (value & mask)
+
+    def run(self, use_block_engine: bool = False, max_instructions: int = None,
+            max_cycles: int = None, timeout: float = None) -> StopReason:
+        """
+        Starts the automatic execution
+        This stops at any breakpoint, or after any instruction which triggers a watchpoint
+
+        Execution can be limited by budgets, which are counted from when run() is called.
+        To keep them cheap, the budgets are only checked after every
+        BUDGET_CHECK_INTERVAL instructions, so the cycle and time budgets can be
+        overrun by that many instructions.
+        If a budget runs out, clock_auto_cycle is left on, so run() can be called again to continue.
+        :param use_block_engine: if true, execute whole basic blocks at a time
+            instead of interpreting one instruction at a time,
+            unless there are breakpoints or watchpoints
+        :param max_instructions: the maximum number of instructions to execute
+        :param max_cycles: the maximum number of clock cycles to execute
+        :param timeout: the maximum number of seconds to run for
+        :return: why execution stopped
+        """
+        self.last_error = None
+        if self.halted:
+            return StopReason.HALTED
+
+        # only pay for checking breakpoints and watchpoints when there are some
+        checked = len(self.breakpoints) > 0 or self.memory.has_watchpoints()
+        if checked:
+            self.triggered_breakpoint = None
+            self.memory.clear_triggered_watchpoint()
+            self._continuing = True
+
+        try:
             if not self.clock_auto_cycle:
                 # run a single instruction
                 self.step_instruction()
+            elif max_instructions is not None or max_cycles is not None or timeout is not None:
+                if checked:
+                    step = self._step_checked
+                elif use_block_engine:
+                    step = self.block_engine.step_block
+                else:
+                    step = self._step_counted
+                reason = self._run_budgeted(step, max_instructions, max_cycles, timeout)
+                if reason is not None:
+                    return reason
+            elif checked:
+                while self.clock_auto_cycle:
+                    self._step_checked()
+            elif use_block_engine:
+                while self.clock_auto_cycle:
+                    self.block_engine.step_block()
             else:
                 while self.clock_auto_cycle:
                     self.step_instruction()
+        except EndOfInputError:
+            # the program counter is still at the instruction that wanted the input
+            return StopReason.WAITING_FOR_INPUT
+        except Exception as error:
+            self.last_error = error
+            self.clock_auto_cycle = False
+            return StopReason.ERROR
+
+        if self.halted:
+            return StopReason.HALTED
+        if self.triggered_breakpoint is not None:
+            return StopReason.BREAKPOINT
+        if self.memory.triggered_watchpoint is not None:
+            return StopReason.WATCHPOINT
+        return StopReason.PAUSED
+
+    def _run_budgeted(self, step: typing.Callable[[], int], max_instructions: int,
+                      max_cycles: int, timeout: float) -> StopReason:
+        """
+        Runs until clock_auto_cycle is turned off or a budget runs out
+        :param step: executes the next instruction or instructions, and returns how many were executed
+        :param max_instructions: see run()
+        :param max_cycles:
+        :param timeout:
+        :return: the budget that ran out, or None
+        """
+        executed = 0
+        end_cycles = None if max_cycles is None else self._clock_cycles + max_cycles
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self.clock_auto_cycle:
+            if max_instructions is not None and executed >= max_instructions:
+                return StopReason.INSTRUCTION_LIMIT
+            if end_cycles is not None and self._clock_cycles >= end_cycles:
+                return StopReason.CYCLE_LIMIT
+            if deadline is not None and time.monotonic() >= deadline:
+                return StopReason.TIMEOUT
+
+            batch_end = executed + BUDGET_CHECK_INTERVAL
+            if max_instructions is not None:
+                if max_instructions - executed <= MAX_BLOCK_LENGTH:
+                    # a whole block might not fit in what is left of the budget
+                    step = self._step_counted
+                    batch_end = max_instructions
+                else:
+                    batch_end = min(batch_end, max_instructions - MAX_BLOCK_LENGTH)
+            while executed < batch_end and self.clock_auto_cycle:
+                executed += step()
+
+        return None
+
+    def _step_counted(self) -> int:
+        """
+        Executes a single instruction, for _run_budgeted
+        :return: the number of instructions executed
+        """
+        self.step_instruction()
+        return 1
+
+    def _step_checked(self) -> int:
+        """
+        Executes a single instruction, unless there is a breakpoint on it,
+        and turns off clock_auto_cycle if there is a breakpoint or watchpoint
+        The first instruction run() executes is executed even if there is
+        a breakpoint on it, so that execution can continue from a breakpoint
+        :return: the number of instructions executed
+        """
+        pc = self.registers[_PC]
+        if not self._continuing and pc in self.breakpoints:
+            self.triggered_breakpoint = pc
+            self.clock_auto_cycle = False
+            return 0
+        self._continuing = False
+
+        self.step_instruction()
+
+        # stop after the instruction that accessed the watched memory
+        if self.memory.triggered_watchpoint is not None:
+            self.clock_auto_cycle = False
+        return 1
+
+    def resume(self, use_block_engine: bool = False, max_instructions: int = None,
+               max_cycles: int = None, timeout: float = None) -> StopReason:
+        """
+        Continues automatic execution after it was stopped by a breakpoint or watchpoint
+        :param use_block_engine: see run()
+        :param max_instructions:
+        :param max_cycles:
+        :param timeout:
+        :return: why execution stopped
+        """
+        if not self.halted:
+            self.clock_auto_cycle = True
+        return self.run(use_block_engine, max_instructions, max_cycles, timeout)
+
+    def add_breakpoint(self, location: int):
+        """
+        Makes run() stop before executing the instruction at the given location
+        :param location:
+        :return:
+        """
+        assert 0 <= location <= 0xFFFFFFFF, 'Value must fit in the range [0, 0xFFFFFFFF].'
+        self.breakpoints.add(location)
+
+    def remove_breakpoint(self, location: int):
+        """
+        Removes the breakpoint at the given location, if there is one
+        :param location:
+        :return:
+        """
+        self.breakpoints.discard(location)
 
     def halt(self):
         """
@@ -194,43 +424,195 @@ class M68K:
         :return:
         """
         if not self.halted:
-            # must be here or we get circular dependency issues
-            from ..core.util.find_module import find_opcode_cls, valid_opcodes
-
-            for op_str in valid_opcodes:
-                op_class = find_opcode_cls(op_str)
-
-                # We don't know this opcode, there's no module for it
-                if op_class is None:
-                    print('Opcode {} is not known: skipping and continuing'.format(op_str))
-                    assert False
-                    continue
-
-                # 10 comes from 2 bytes for the op and max 2 longs which are each 4 bytes
-                # note: this currently has the edge case that it will fail unintelligibly
-                # if encountered at the end of memory
-                pc_val = self.get_program_counter_value()
-                op = op_class.disassemble_instruction(self.memory.memory[pc_val:pc_val+10])
-                if op is not None:
+            location = self.get_program_counter_value()
+            op = self.fetch_instruction(location)
+            if op is None:
+                raise IllegalInstructionError('No instruction matches the memory at ' + hex(location))
+            if self.journal is not None:
+                self.journal.record_instruction()
+                try:
                     op.execute(self)
-                    # done exeucting after doing an operation
-                    return
+                finally:
+                    self.journal.finish_instruction()
+            else:
+                op.execute(self)
+            self._clock_cycles += op.cycles
+
+    def fetch_instruction(self, location: int):
+        """
+        Gets the decoded instruction at the given location,
+        using the instruction cache when possible
+        :param location:
+        :return: the decoded opcode, or None if no opcode matches
+        """
+        op = self.instruction_cache.get(location)
+        if op is None:
+            op = self._decode_instruction(location)
+            if op is not None:
+                op.cycles = op.get_cycles()
+                self.instruction_cache.insert(location, op)
+        return op
+
+    def _decode_instruction(self, location: int):
+        """
+        Disassembles the instruction at the given location in memory
+        :param location:
+        :return: the decoded opcode, or None if no opcode matches
+        """
+        # must be here or we get circular dependency issues
+        from ..core.util.find_module import opcode_registry
+
+        # 10 comes from 2 bytes for the op and max 2 longs which are each 4 bytes
+        # note: this currently has the edge case that it will fail unintelligibly
+        # if encountered at the end of memory
+        data = self.memory.read_bytes(location, min(10, len(self.memory) - location))
+
+        # only try the opcodes which could possibly start with this word
+        for op_class in opcode_registry.get_decode_table()[int.from_bytes(data[0:2], 'big')]:
+            op = op_class.disassemble_instruction(data)
+            if op is not None:
+                return op
+
+        return None
+
+    def enable_journal(self, length: int = DEFAULT_JOURNAL_LENGTH, write_length: int = None):
+        """
+        Starts recording every instruction that is executed, so that it can be undone
+        with step_back(). While this is on, the block engine executes one instruction at a time.
+        :param length: the maximum number of instructions that can be undone
+        :param write_length: the maximum number of bytes of memory writes that are remembered
+        :return:
+        """
+        self.disable_journal()
+        self.journal = ExecutionJournal(self, length, write_length)
+        self.memory.add_write_listener(self.journal.record_write)
+
+    def disable_journal(self):
+        """
+        Stops recording instructions and forgets the ones already recorded
+        :return:
+        """
+        if self.journal is not None:
+            self.memory.remove_write_listener(self.journal.record_write)
+            self.journal = None
+
+    def step_back(self) -> bool:
+        """
+        Undoes the last instruction that was executed
+        This needs the journal to be enabled
+        :return: false if there was nothing to undo
+        """
+        assert self.journal is not None, 'The journal must be enabled to step back!'
+        return self.journal.step_back()
+
+    def run_back_to(self, pc: int) -> bool:
+        """
+        Undoes instructions until the program counter is at the given location
+        :param pc: the location to stop at
+        :return: false if the journal ran out before getting there
+        """
+        assert self.journal is not None, 'The journal must be enabled to step back!'
+        while self.get_program_counter_value() != pc:
+            if not self.journal.step_back():
+                return False
+        return True
 
     def reload_execution(self):
         """
         restarts execution of the program
         up to the current program counter location
-        :return:
+
+        Instead of running the program again, this undoes instructions
+        back to the first time the current program counter was reached,
+        as far back as the journal goes
+        :return: false if the journal isn't enabled
         """
+        if self.journal is None:
+            return False
+
         # get the current PC
         current_pc = self.get_program_counter_value()
 
-        # reset the PC value
-        # todo, need to store the starting location
+        # find the oldest instruction that was at this PC
+        back = 0
+        for i in range(len(self.journal), 0, -1):
+            if self.journal.get_program_counter(i) == current_pc:
+                back = i
+                break
+
+        # and undo everything after it
+        for _ in range(back):
+            self.journal.step_back()
+        return True
+
+    def snapshot(self) -> Snapshot:
+        """
+        Saves the current state of the simulator so that it can be returned to with restore()
+        Once a snapshot is made, every write to memory saves the previous
+        contents of the page being written, the first time the page is written
+        :return: the snapshot
+        """
+        if not self._snapshots:
+            self.memory.add_write_listener(self._save_snapshot_pages)
+        snap = Snapshot(self)
+        self._snapshots.append(snap)
+        return snap
 
-        # set the starting PC value
+    def _save_snapshot_pages(self, location: int, length: int):
+        """
+        Write listener which saves the pages about to be written for the newest snapshot
+        :param location:
+        :param length:
+        :return:
+        """
+        if self._snapshots:
+            self._snapshots[-1].save_pages(self.memory, location, length)
 
-        # run until hits that PC value
+    def restore(self, snap: Snapshot):
+        """
+        Returns the simulator to the state it was in when the snapshot was made
+        The snapshot can be restored again later, but any snapshots made after it
+        can no longer be restored
+        :param snap: a snapshot made by this simulator
+        :return:
+        """
+        assert snap.valid and snap in self._snapshots, 'This snapshot can no longer be restored!'
+
+        # don't save the pages that are being restored
+        snapshots = self._snapshots
+        self._snapshots = []
+
+        # undo the changes made since each snapshot, newest first
+        while True:
+            newest = snapshots.pop()
+            newest.restore_pages(self.memory)
+            if newest is snap:
+                break
+            newest.valid = False
+
+        snapshots.append(snap)
+        self._snapshots = snapshots
+
+        # the journal is for the execution that was just undone
+        if self.journal is not None:
+            self.journal.clear()
+
+        self.registers[:] = snap.registers
+        self._register_sizes = list(snap.register_sizes)
+        self.halted = snap.halted
+        self.clock_auto_cycle = snap.clock_auto_cycle
+        self._clock_cycles = snap.clock_cycles
+
+    def clear_snapshots(self):
+        """
+        Drops all of the snapshots, so that writes to memory no longer save pages
+        :return:
+        """
+        if self._snapshots:
+            self.memory.remove_write_listener(self._save_snapshot_pages)
+        for snap in self._snapshots:
+            snap.valid = False
+        self._snapshots = []
 
     def get_cycles(self):
         """
@@ -258,6 +640,10 @@ class M68K:
         self.memory.load_list_file(list_file)
         self.set_program_counter_value(int(list_file.starting_execution_address))
 
+        # loading a program can't be undone
+        if self.journal is not None:
+            self.journal.clear()
+
     def load_memory(self, file : typing.BinaryIO):
         """
         saves the raw memory into the designated file
@@ -265,6 +651,9 @@ class M68K:
         """
         self.memory.load_memory(file)
 
+        if self.journal is not None:
+            self.journal.clear()
+
     def save_memory(self, file : typing.BinaryIO):
         """
         Loads the raw memory from the designated file
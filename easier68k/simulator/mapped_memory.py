@@ -0,0 +1,106 @@
+"""
+Mapped Memory
+
+A Memory which maps the whole address space directly onto a file.
+Opening an existing memory dump doesn't read it in, the pages are only loaded
+by the operating system when they are accessed, and only the pages
+that have been written to are written back to the file by flush().
+"""
+
+import mmap
+import os
+import typing
+from .memory import Memory, MEMORY_SIZE
+
+# the size of the parts of the file that are tracked as dirty
+# flushing has to start on a multiple of the allocation granularity
+DIRTY_PAGE_SIZE = max(mmap.ALLOCATIONGRANULARITY, 4096)
+
+
+class MappedMemory(Memory):
+    """
+    Memory backed by a memory mapped file
+    """
+
+    def __init__(self, path: str, size: int = MEMORY_SIZE):
+        """
+        Constructor
+        Opens the file at the path and maps memory onto it
+        If the file doesn't exist it is created, and if it is smaller than
+        the size of memory, it is extended with zeros
+        :param path: the file to map memory onto, like a file made by Memory.save_memory
+        :param size: the number of bytes of memory
+        """
+        self.path = path
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        if os.fstat(self._file.fileno()).st_size < size:
+            self._file.truncate(size)
+
+        self.memory = mmap.mmap(self._file.fileno(), size)
+
+        self._setup_accessors()
+
+        # the numbers of the pages which have been written since they were last flushed
+        self._dirty_pages = set()
+        self.add_write_listener(self._mark_dirty)
+
+    def _mark_dirty(self, location: int, length: int):
+        """
+        Write listener which records the pages being written to
+        :param location:
+        :param length:
+        :return:
+        """
+        if length <= 0:
+            return
+        self._dirty_pages.update(range(location // DIRTY_PAGE_SIZE, (location + length - 1) // DIRTY_PAGE_SIZE + 1))
+
+    def get_dirty_page_count(self) -> int:
+        """
+        Gets the number of pages written to since the last flush
+        :return:
+        """
+        return len(self._dirty_pages)
+
+    def flush(self):
+        """
+        Writes the pages that have been modified back to the file
+        :return:
+        """
+        size = len(self.memory)
+        for page in sorted(self._dirty_pages):
+            offset = page * DIRTY_PAGE_SIZE
+            if offset < size:
+                self.memory.flush(offset, min(DIRTY_PAGE_SIZE, size - offset))
+        self._dirty_pages = set()
+
+    def close(self):
+        """
+        Flushes and closes the file, this memory can't be used after it is closed
+        :return:
+        """
+        self.flush()
+        self.memory.close()
+        self._file.close()
+
+    def save_memory(self, file: typing.BinaryIO):
+        """
+        saves the raw memory into the designated file
+        NOTE: file must be opened as binary or this won't work
+        To write the changes back to the mapped file, use flush()
+        """
+        file.write(self.memory)
+
+    def load_memory(self, file: typing.BinaryIO):
+        """
+        Loads the raw memory from the designated file
+        This is copied into the mapped file
+        NOTE: file must be opened as binary or this won't work
+        """
+        data = file.read()
+        size = max(len(self.memory), len(data))
+        self._notify_write(0, size)
+
+        if len(data) != len(self.memory):
+            self.memory.resize(len(data))
+        self.memory[0:len(data)] = data
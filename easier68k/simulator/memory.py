@@ -9,10 +9,20 @@ from ..core.enum.condition import Condition
 from ..core.enum.condition_status_code import ConditionStatusCode
 from ..core.enum.system_status_code import SystemStatusCode
 from ..core.models.list_file import ListFile
+from .watchpoint import Watchpoint, WATCH_PAGE_SHIFT
 import typing
+import struct
 from ..core.models.memory_value import MemoryValue
 from ..core.enum.op_size import OpSize
 
+# big endian unsigned word and long word
+_U16 = struct.Struct('>H')
+_U32 = struct.Struct('>I')
+
+# 16777216 = 2^24
+# it is the number of bytes easy68K uses.
+MEMORY_SIZE = 16777216
+
 class UnalignedMemoryAccessError(Exception):
     pass
 
@@ -33,7 +43,7 @@ class Memory:
             size = OpSize(size)
         if(location % size.get_number_of_bytes() != 0):
             raise UnalignedMemoryAccessError
-        if(location < 0 or (location + size.get_number_of_bytes()) > len(self.memory)):
+        if(location < 0 or (location + size.get_number_of_bytes()) > len(self)):
             raise OutOfBoundsMemoryError
 
     def __init__(self):
@@ -42,9 +52,203 @@ class Memory:
         """
 
         # all of the memory that is stored by the device
-        # 16777216 = 2^24
-        # it is the number of bytes easy68K uses.
-        self.memory = bytearray(16777216)
+        self.memory = bytearray(MEMORY_SIZE)
+
+        self._setup_accessors()
+
+    def _setup_accessors(self):
+        """
+        Sets up the state shared by all kinds of memory
+        :return:
+        """
+        # callables which are given the (location, length) of every
+        # write before it happens, such as the instruction cache
+        self._write_listeners = []
+
+        # read_uN and write_uN for each OpSize, indexed by OpSize.value
+        self._readers = (None, self.read_u8, self.read_u16, None, self.read_u32)
+        self._writers = (None, self.write_u8, self.write_u16, None, self.write_u32)
+
+        # see add_watchpoint
+        # the bitmaps have a byte for each page, which is non zero if any watchpoint is in that page
+        # they are None when there are no watchpoints of that kind, so that nothing is checked
+        self._watchpoints = []
+        self._read_watch_pages = None
+        self._write_watch_pages = None
+
+        # the watchpoint that was last triggered, and the location that was accessed
+        # these are left set until clear_triggered_watchpoint is called
+        self.triggered_watchpoint = None
+        self.triggered_location = None
+
+    def __len__(self):
+        """
+        The number of bytes of memory
+        :return:
+        """
+        return len(self.memory)
+
+    def fork(self):
+        """
+        Makes a copy of this memory, which can be modified without changing this one
+        Write listeners and watchpoints are not copied
+        :return:
+        """
+        ret = Memory.__new__(Memory)
+        ret.memory = bytearray(self.memory)
+        ret._setup_accessors()
+        return ret
+
+    def add_write_listener(self, listener: typing.Callable[[int, int], None]):
+        """
+        Adds a callable which is notified with the location and length
+        of every write to memory, before the write is done
+        :param listener:
+        :return:
+        """
+        self._write_listeners.append(listener)
+
+    def remove_write_listener(self, listener: typing.Callable[[int, int], None]):
+        """
+        Removes a callable previously added with add_write_listener
+        :param listener:
+        :return:
+        """
+        self._write_listeners.remove(listener)
+
+    def _notify_write(self, location: int, length: int):
+        """
+        Notifies all of the write listeners that a range of memory is being written
+        :param location:
+        :param length:
+        :return:
+        """
+        for listener in self._write_listeners:
+            listener(location, length)
+
+    def add_watchpoint(self, location: int, length: int = 1, on_read: bool = False, on_write: bool = True) -> Watchpoint:
+        """
+        Watches a range of memory, so that reading or writing it sets triggered_watchpoint
+        Reads done with read_bytes, such as fetching instructions, don't trigger watchpoints
+        :param location: the first location to watch
+        :param length: the number of bytes to watch
+        :param on_read: trigger when any of the bytes are read
+        :param on_write: trigger when any of the bytes are written
+        :return: the watchpoint, which can be given to remove_watchpoint
+        """
+        assert 0 <= location and location + length <= len(self), 'The watchpoint must be inside of memory!'
+        watchpoint = Watchpoint(location, length, on_read, on_write)
+        self._watchpoints.append(watchpoint)
+        self._update_watch_pages()
+        return watchpoint
+
+    def remove_watchpoint(self, watchpoint: Watchpoint):
+        """
+        Stops watching a range of memory
+        :param watchpoint: a watchpoint returned by add_watchpoint
+        :return:
+        """
+        self._watchpoints.remove(watchpoint)
+        self._update_watch_pages()
+
+    def get_watchpoints(self) -> list:
+        """
+        Gets all of the watchpoints, in the order they were added
+        :return:
+        """
+        return list(self._watchpoints)
+
+    def has_watchpoints(self) -> bool:
+        """
+        Checks if there are any watchpoints
+        :return:
+        """
+        return len(self._watchpoints) > 0
+
+    def clear_triggered_watchpoint(self):
+        """
+        Forgets the last watchpoint which was triggered
+        :return:
+        """
+        self.triggered_watchpoint = None
+        self.triggered_location = None
+
+    def _update_watch_pages(self):
+        """
+        Rebuilds the bitmaps of the watched pages, after the watchpoints have changed
+        :return:
+        """
+        had_write_watch = self._write_watch_pages is not None
+        page_count = (len(self) >> WATCH_PAGE_SHIFT) + 1
+        read_pages = None
+        write_pages = None
+
+        for watchpoint in self._watchpoints:
+            if watchpoint.on_read:
+                if read_pages is None:
+                    read_pages = bytearray(page_count)
+                for page in watchpoint.get_pages():
+                    read_pages[page] = 1
+            if watchpoint.on_write:
+                if write_pages is None:
+                    write_pages = bytearray(page_count)
+                for page in watchpoint.get_pages():
+                    write_pages[page] = 1
+
+        self._read_watch_pages = read_pages
+        self._write_watch_pages = write_pages
+
+        # writes are checked by a write listener, so that there is nothing extra
+        # in the write methods, it is only there while there are write watchpoints
+        if write_pages is not None and not had_write_watch:
+            self.add_write_listener(self._check_write_watch)
+        elif write_pages is None and had_write_watch:
+            self.remove_write_listener(self._check_write_watch)
+
+    def _check_read_watch(self, location: int, length: int):
+        """
+        Looks for a watchpoint triggered by reading a range of memory
+        This is only called while there are read watchpoints
+        :param location:
+        :param length:
+        :return:
+        """
+        pages = self._read_watch_pages
+        last = min((location + length - 1) >> WATCH_PAGE_SHIFT, len(pages) - 1)
+        for page in range(location >> WATCH_PAGE_SHIFT, last + 1):
+            if pages[page]:
+                self._find_watchpoint(location, length, False)
+                return
+
+    def _check_write_watch(self, location: int, length: int):
+        """
+        Write listener which looks for a watchpoint triggered by writing a range of memory
+        :param location:
+        :param length:
+        :return:
+        """
+        pages = self._write_watch_pages
+        if pages is None or length <= 0:
+            return
+        last = min((location + length - 1) >> WATCH_PAGE_SHIFT, len(pages) - 1)
+        for page in range(location >> WATCH_PAGE_SHIFT, last + 1):
+            if pages[page]:
+                self._find_watchpoint(location, length, True)
+                return
+
+    def _find_watchpoint(self, location: int, length: int, write: bool):
+        """
+        Finds the watchpoint, if any, that an access to one of the watched pages triggers
+        :param location:
+        :param length:
+        :param write: true for a write, false for a read
+        :return:
+        """
+        for watchpoint in self._watchpoints:
+            if (watchpoint.on_write if write else watchpoint.on_read) and watchpoint.overlaps(location, length):
+                self.triggered_watchpoint = watchpoint
+                self.triggered_location = location
+                return
 
     def save_memory(self, file : typing.BinaryIO):
         """
@@ -59,7 +263,10 @@ class Memory:
         This includes programs
         NOTE: file must be opened as binary or this won't work
         """
-        self.memory = bytearray(file.read())
+        new_memory = bytearray(file.read())
+        if self._write_listeners:
+            self._notify_write(0, max(len(self.memory), len(new_memory)))
+        self.memory = new_memory
 
 
     def load_list_file(self, list_file: ListFile):
@@ -74,20 +281,160 @@ class Memory:
         :return:
         """
 
-        # for all of the locations, load the contents into memory
-        for key, value in list_file.data.items():
-            # internally stored as a string for json compatibility
-            # so convert back into an integer to represent the index
-            location = int(key)
+        # for all of the runs of data, write the bytes into memory all at once
+        for location, segment in list_file.get_segments():
+            self.write_bytes(location, segment)
 
-            # decode the data into a ByteArray
-            # and then set it
-            values = bytearray.fromhex(value)
+    def read_bytes(self, location: int, length: int) -> bytearray:
+        """
+        Gets a copy of a range of bytes of memory
+        :param location: the first location to read
+        :param length: the number of bytes to read
+        :return:
+        """
+        if location < 0 or length < 0 or location + length > len(self.memory):
+            raise OutOfBoundsMemoryError
+        return self.memory[location:location + length]
 
-            for i in range(0, len(values), 1):
-                # set one byte at a time
-                val = MemoryValue(OpSize.BYTE, bytes=values[i:i+1])
-                self.set(OpSize.BYTE, location + i, val)
+    def write_bytes(self, location: int, data: bytes):
+        """
+        Sets a range of memory to the given bytes, with a single bounds check
+        and write notification for the whole range
+        There is no alignment requirement for the location
+        :param location: the first location to write
+        :param data: the bytes to write
+        :return:
+        """
+        length = len(data)
+        if location < 0 or location + length > len(self.memory):
+            raise OutOfBoundsMemoryError
+        if length == 0:
+            return
+        if self._write_listeners:
+            self._notify_write(location, length)
+        self.memory[location:location + length] = data
+
+    def read_null_terminated(self, location: int) -> bytes:
+        """
+        Gets the bytes from the given location up to, but not including, the next 0 byte
+        :param location: the first location to read
+        :return:
+        """
+        if location < 0 or location >= len(self.memory):
+            raise OutOfBoundsMemoryError
+        end = self.memory.find(b'\x00', location)
+        if end < 0:
+            # the string runs off of the end of memory
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, end + 1 - location)
+        return bytes(self.memory[location:end])
+
+    def read_u8(self, location: int) -> int:
+        """
+        Gets the unsigned byte at the given location
+        :param location:
+        :return:
+        """
+        if location < 0 or location >= len(self.memory):
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, 1)
+        return self.memory[location]
+
+    def read_u16(self, location: int) -> int:
+        """
+        Gets the unsigned word at the given location
+        :param location:
+        :return:
+        """
+        if location & 1:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 2 > len(self.memory):
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, 2)
+        return _U16.unpack_from(self.memory, location)[0]
+
+    def read_u32(self, location: int) -> int:
+        """
+        Gets the unsigned long word at the given location
+        :param location:
+        :return:
+        """
+        if location & 3:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 4 > len(self.memory):
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, 4)
+        return _U32.unpack_from(self.memory, location)[0]
+
+    def write_u8(self, location: int, value: int):
+        """
+        Sets the byte at the given location to an unsigned value
+        :param location:
+        :param value:
+        :return:
+        """
+        if location < 0 or location >= len(self.memory):
+            raise OutOfBoundsMemoryError
+        if self._write_listeners:
+            self._notify_write(location, 1)
+        self.memory[location] = value
+
+    def write_u16(self, location: int, value: int):
+        """
+        Sets the word at the given location to an unsigned value
+        :param location:
+        :param value:
+        :return:
+        """
+        if location & 1:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 2 > len(self.memory):
+            raise OutOfBoundsMemoryError
+        if self._write_listeners:
+            self._notify_write(location, 2)
+        _U16.pack_into(self.memory, location, value)
+
+    def write_u32(self, location: int, value: int):
+        """
+        Sets the long word at the given location to an unsigned value
+        :param location:
+        :param value:
+        :return:
+        """
+        if location & 3:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 4 > len(self.memory):
+            raise OutOfBoundsMemoryError
+        if self._write_listeners:
+            self._notify_write(location, 4)
+        _U32.pack_into(self.memory, location, value)
+
+    def read_unsigned(self, size: OpSize, location: int) -> int:
+        """
+        Gets the unsigned value of the given size at the given location
+        :param size:
+        :param location:
+        :return:
+        """
+        if not isinstance(size, OpSize):
+            size = OpSize(size)
+        return self._readers[size.value](location)
+
+    def write_unsigned(self, size: OpSize, location: int, value: int):
+        """
+        Sets the value of the given size at the given location to an unsigned value
+        :param size:
+        :param location:
+        :param value:
+        :return:
+        """
+        if not isinstance(size, OpSize):
+            size = OpSize(size)
+        self._writers[size.value](location, value)
 
     def get(self, size: OpSize, location: int) -> MemoryValue:
         """
@@ -95,16 +442,7 @@ class Memory:
         """
         if not isinstance(size, OpSize):
             size = OpSize(size)
-        self.__validateLocation(size, location)
-        ret = MemoryValue(size)
-        end = location + size.value
-        b = None
-        try:
-            b = self.memory[location:end]
-        except TypeError:
-            pass
-        ret.set_value_bytes(b)
-        return ret
+        return MemoryValue(size, unsigned_int=self._readers[size.value](location))
 
     def set(self, size: OpSize, location: int, value: MemoryValue):
         """
@@ -119,4 +457,4 @@ class Memory:
         self.__validateLocation(size, location)
         if value.get_size() != size:
             raise AssignWrongMemorySizeError
-        self.memory[location:location+size.get_number_of_bytes()] = value.get_value_bytes()
+        self._writers[size.value](location, value.get_value_unsigned())
@@ -0,0 +1,280 @@
+"""
+Paged Memory
+
+A Memory which only allocates the parts of memory that are written to.
+Memory is split into pages, every page that has never been written to
+is the same shared page of zeros.
+Copies made with fork() share all of their pages with the original,
+and a page is only copied the first time either of them writes to it.
+"""
+
+import typing
+from .memory import Memory, OutOfBoundsMemoryError, UnalignedMemoryAccessError, MEMORY_SIZE, _U16, _U32
+
+# pages are 2^12 = 4 KiB
+PAGE_SHIFT = 12
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+
+# the page used for all of memory that hasn't been written
+# this is immutable, so it is always copied before being written
+ZERO_PAGE = bytes(PAGE_SIZE)
+
+
+class PagedMemory(Memory):
+    """
+    Copy-on-write memory made of pages which are allocated on demand
+    """
+
+    def __init__(self, size: int = MEMORY_SIZE):
+        """
+        Constructor
+        :param size: the number of bytes of memory
+        """
+        self._size = size
+
+        # the contents of each page, either ZERO_PAGE or a bytearray
+        self._pages = [ZERO_PAGE] * ((size + PAGE_MASK) >> PAGE_SHIFT)
+
+        # the numbers of the pages which belong to only this memory, and so can be written in place
+        # all of the other pages may be shared with a fork
+        self._owned = set()
+
+        self._setup_accessors()
+
+    def __len__(self):
+        """
+        The number of bytes of memory
+        :return:
+        """
+        return self._size
+
+    def fork(self):
+        """
+        Makes a copy of this memory, which can be modified without changing this one
+        None of the pages are copied until they are written to by either memory
+        Write listeners and watchpoints are not copied
+        :return:
+        """
+        ret = PagedMemory.__new__(PagedMemory)
+        ret._size = self._size
+        ret._pages = list(self._pages)
+        ret._owned = set()
+        ret._setup_accessors()
+
+        # the pages are now shared, so this memory also has to copy them before writing
+        self._owned = set()
+        return ret
+
+    def get_allocated_page_count(self) -> int:
+        """
+        Gets the number of pages which are not the shared zero page
+        :return:
+        """
+        return sum(1 for page in self._pages if page is not ZERO_PAGE)
+
+    def _get_writable_page(self, page_number: int) -> bytearray:
+        """
+        Gets a page which can be written in place, copying it first if it is shared
+        :param page_number:
+        :return:
+        """
+        if page_number in self._owned:
+            return self._pages[page_number]
+        page = bytearray(self._pages[page_number])
+        self._pages[page_number] = page
+        self._owned.add(page_number)
+        return page
+
+    def save_memory(self, file: typing.BinaryIO):
+        """
+        saves the raw memory into the designated file
+        NOTE: file must be opened as binary or this won't work
+        """
+        remaining = self._size
+        for page in self._pages:
+            file.write(page[:remaining] if remaining < PAGE_SIZE else page)
+            remaining -= PAGE_SIZE
+
+    def load_memory(self, file: typing.BinaryIO):
+        """
+        Loads the raw memory from the designated file
+        This includes programs
+        NOTE: file must be opened as binary or this won't work
+        """
+        data = file.read()
+        if self._write_listeners:
+            self._notify_write(0, max(self._size, len(data)))
+
+        self._size = len(data)
+        self._pages = []
+        self._owned = set()
+        for page_number, start in enumerate(range(0, len(data), PAGE_SIZE)):
+            chunk = data[start:start + PAGE_SIZE]
+            if chunk.count(0) == len(chunk) and len(chunk) == PAGE_SIZE:
+                # keep sharing the zero page for the parts of the file which are empty
+                self._pages.append(ZERO_PAGE)
+            else:
+                page = bytearray(PAGE_SIZE)
+                page[0:len(chunk)] = chunk
+                self._pages.append(page)
+                self._owned.add(page_number)
+
+    def read_bytes(self, location: int, length: int) -> bytearray:
+        """
+        Gets a copy of a range of bytes of memory
+        :param location: the first location to read
+        :param length: the number of bytes to read
+        :return:
+        """
+        if location < 0 or length < 0 or location + length > self._size:
+            raise OutOfBoundsMemoryError
+        ret = bytearray()
+        end = location + length
+        while location < end:
+            offset = location & PAGE_MASK
+            count = min(PAGE_SIZE - offset, end - location)
+            ret += self._pages[location >> PAGE_SHIFT][offset:offset + count]
+            location += count
+        return ret
+
+    def write_bytes(self, location: int, data: bytes):
+        """
+        Sets a range of memory to the given bytes, with a single bounds check
+        and write notification for the whole range
+        There is no alignment requirement for the location
+        :param location: the first location to write
+        :param data: the bytes to write
+        :return:
+        """
+        length = len(data)
+        if location < 0 or location + length > self._size:
+            raise OutOfBoundsMemoryError
+        if length == 0:
+            return
+        if self._write_listeners:
+            self._notify_write(location, length)
+        view = memoryview(data)
+        written = 0
+        while written < length:
+            offset = location & PAGE_MASK
+            count = min(PAGE_SIZE - offset, length - written)
+            self._get_writable_page(location >> PAGE_SHIFT)[offset:offset + count] = view[written:written + count]
+            location += count
+            written += count
+
+    # since accesses must be aligned to their size, they never cross a page
+
+    def read_null_terminated(self, location: int) -> bytes:
+        """
+        Gets the bytes from the given location up to, but not including, the next 0 byte
+        :param location: the first location to read
+        :return:
+        """
+        if location < 0 or location >= self._size:
+            raise OutOfBoundsMemoryError
+        parts = []
+        page_number = location >> PAGE_SHIFT
+        offset = location & PAGE_MASK
+        while True:
+            if page_number >= len(self._pages):
+                # the string runs off of the end of memory
+                raise OutOfBoundsMemoryError
+            page = self._pages[page_number]
+            end = page.find(b'\x00', offset)
+            if end >= 0:
+                if (page_number << PAGE_SHIFT) + end >= self._size:
+                    raise OutOfBoundsMemoryError
+                parts.append(page[offset:end])
+                break
+            parts.append(page[offset:])
+            page_number += 1
+            offset = 0
+
+        ret = b''.join(parts)
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, len(ret) + 1)
+        return ret
+
+    def read_u8(self, location: int) -> int:
+        """
+        Gets the unsigned byte at the given location
+        :param location:
+        :return:
+        """
+        if location < 0 or location >= self._size:
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, 1)
+        return self._pages[location >> PAGE_SHIFT][location & PAGE_MASK]
+
+    def read_u16(self, location: int) -> int:
+        """
+        Gets the unsigned word at the given location
+        :param location:
+        :return:
+        """
+        if location & 1:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 2 > self._size:
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, 2)
+        return _U16.unpack_from(self._pages[location >> PAGE_SHIFT], location & PAGE_MASK)[0]
+
+    def read_u32(self, location: int) -> int:
+        """
+        Gets the unsigned long word at the given location
+        :param location:
+        :return:
+        """
+        if location & 3:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 4 > self._size:
+            raise OutOfBoundsMemoryError
+        if self._read_watch_pages is not None:
+            self._check_read_watch(location, 4)
+        return _U32.unpack_from(self._pages[location >> PAGE_SHIFT], location & PAGE_MASK)[0]
+
+    def write_u8(self, location: int, value: int):
+        """
+        Sets the byte at the given location to an unsigned value
+        :param location:
+        :param value:
+        :return:
+        """
+        if location < 0 or location >= self._size:
+            raise OutOfBoundsMemoryError
+        if self._write_listeners:
+            self._notify_write(location, 1)
+        self._get_writable_page(location >> PAGE_SHIFT)[location & PAGE_MASK] = value
+
+    def write_u16(self, location: int, value: int):
+        """
+        Sets the word at the given location to an unsigned value
+        :param location:
+        :param value:
+        :return:
+        """
+        if location & 1:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 2 > self._size:
+            raise OutOfBoundsMemoryError
+        if self._write_listeners:
+            self._notify_write(location, 2)
+        _U16.pack_into(self._get_writable_page(location >> PAGE_SHIFT), location & PAGE_MASK, value)
+
+    def write_u32(self, location: int, value: int):
+        """
+        Sets the long word at the given location to an unsigned value
+        :param location:
+        :param value:
+        :return:
+        """
+        if location & 3:
+            raise UnalignedMemoryAccessError
+        if location < 0 or location + 4 > self._size:
+            raise OutOfBoundsMemoryError
+        if self._write_listeners:
+            self._notify_write(location, 4)
+        _U32.pack_into(self._get_writable_page(location >> PAGE_SHIFT), location & PAGE_MASK, value)
@@ -0,0 +1,69 @@
+"""
+Snapshot
+
+The saved state of a simulator, made by M68K.snapshot() and used by M68K.restore().
+Memory isn't copied when the snapshot is made. Instead, the first time each page
+of memory is written to after the snapshot, the contents it had are saved,
+so both making and restoring a snapshot only cost as much as what has changed.
+"""
+
+from array import array
+
+# pages are 2^12 = 4 KiB
+SNAPSHOT_PAGE_SHIFT = 12
+SNAPSHOT_PAGE_SIZE = 1 << SNAPSHOT_PAGE_SHIFT
+
+
+class Snapshot:
+    """
+    The state of a simulator at some point in its execution
+    """
+
+    def __init__(self, simulator):
+        """
+        Constructor
+        Saves all of the state of the simulator, other than memory
+        :param simulator: the M68K to save the state of
+        """
+        self.registers = array('I', simulator.registers)
+        self.register_sizes = list(simulator._register_sizes)
+        self.halted = simulator.halted
+        self.clock_auto_cycle = simulator.clock_auto_cycle
+        self.clock_cycles = simulator._clock_cycles
+
+        # page number -> the contents of that page when the snapshot was made,
+        # for every page which has been written to since then
+        self.saved_pages = {}
+
+        # set to false once a snapshot that was made before this one is restored
+        self.valid = True
+
+    def save_pages(self, memory, location: int, length: int):
+        """
+        Saves the current contents of the pages in a range of memory
+        which haven't already been saved
+        This is called before every write to memory
+        :param memory: the memory being written to
+        :param location: the start of the range being written
+        :param length: the number of bytes being written
+        :return:
+        """
+        if length <= 0:
+            return
+        saved_pages = self.saved_pages
+        size = len(memory)
+        for page in range(location >> SNAPSHOT_PAGE_SHIFT, ((location + length - 1) >> SNAPSHOT_PAGE_SHIFT) + 1):
+            if page not in saved_pages:
+                start = page << SNAPSHOT_PAGE_SHIFT
+                if start < size:
+                    saved_pages[page] = bytes(memory.read_bytes(start, min(SNAPSHOT_PAGE_SIZE, size - start)))
+
+    def restore_pages(self, memory):
+        """
+        Writes the saved contents of every page back into memory
+        :param memory:
+        :return:
+        """
+        for page, contents in self.saved_pages.items():
+            memory.write_bytes(page << SNAPSHOT_PAGE_SHIFT, contents)
+        self.saved_pages = {}
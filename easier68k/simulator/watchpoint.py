@@ -0,0 +1,58 @@
+"""
+Watchpoint
+
+A range of memory which stops the simulator when it is read or written,
+added with Memory.add_watchpoint().
+Memory only looks for the watchpoints of an access when the page
+being accessed is marked in a bitmap of the watched pages, and doesn't
+look at all when there are no watchpoints.
+"""
+
+# pages are 2^12 = 4 KiB
+WATCH_PAGE_SHIFT = 12
+
+
+class Watchpoint:
+    """
+    A watched range of memory
+    """
+
+    def __init__(self, location: int, length: int = 1, on_read: bool = False, on_write: bool = True):
+        """
+        Constructor
+        :param location: the first location watched
+        :param length: the number of bytes watched
+        :param on_read: trigger when any of the bytes are read
+        :param on_write: trigger when any of the bytes are written
+        """
+        assert length > 0, 'A watchpoint must watch at least one byte!'
+        assert on_read or on_write, 'A watchpoint must trigger on either reads or writes!'
+
+        self.location = location
+        self.length = length
+        self.on_read = on_read
+        self.on_write = on_write
+
+    def overlaps(self, location: int, length: int) -> bool:
+        """
+        Checks if an access to a range of memory touches any of the watched bytes
+        :param location: the start of the range accessed
+        :param length: the number of bytes accessed
+        :return:
+        """
+        return location < self.location + self.length and self.location < location + length
+
+    def get_pages(self) -> range:
+        """
+        Gets the numbers of the pages this watchpoint is in
+        :return:
+        """
+        return range(self.location >> WATCH_PAGE_SHIFT, ((self.location + self.length - 1) >> WATCH_PAGE_SHIFT) + 1)
+
+    def __str__(self):
+        """
+        to str, show the range and what it triggers on
+        :return:
+        """
+        return 'Watchpoint ' + hex(self.location) + ' length ' + str(self.length) + \
+            (' read' if self.on_read else '') + (' write' if self.on_write else '')
@@ -1,7 +1,10 @@
 import pytest
 import json
 from easier68k.core.models.list_file import ListFile
-from easier68k.assembler.assembler import parse
+from easier68k.assembler import assembler
+from easier68k.assembler.assembler import parse, AssemblerSession
+from easier68k.core.opcodes.opcode import Opcode
+from easier68k.core.util.opcode_registry import opcode_registry
 
 
 def test_basic_test_input():
@@ -28,3 +31,249 @@ def test_basic_test_input():
         assert assembled.data['1042'] == 'ffffffff'
         assert assembled.data['1046'] == 'abcd'
         assert not issues
+
+
+def test_labels_inside_other_names():
+    """
+    Test that labels and equates are only replaced as whole names
+    """
+    text = '\n'.join([
+        'D           EQU 5',
+        'val         EQU $AB',
+        '            ORG $400',
+        'start       MOVE #val, D0',
+        '            LEA data, A0',
+        '            LEA dat, A0',
+        '            SIMHALT',
+        'dat         DC.B $12, $34',
+        'data        DC.B $56, $78',
+        '            END start'
+    ])
+    assembled, issues = parse(text)
+
+    assert not issues
+    assert assembled.symbols == {'start': 1024, 'dat': 1044, 'data': 1046}
+    assert assembled.data['1024'] == '303c00ab'
+    assert assembled.data['1028'] == '41f900000416'
+    assert assembled.data['1034'] == '41f900000414'
+
+
+def test_many_labels():
+    """
+    Test that a source with thousands of labels assembles
+    """
+    count = 3000
+    lines = ['            ORG $400', 'start       LEA label{}, A0'.format(count - 1)]
+    lines += ['label{}     DC.B $AB, ${:02X}'.format(i, i % 256) for i in range(count)]
+    lines.append('            END start')
+    assembled, issues = parse('\n'.join(lines))
+
+    assert not issues
+    assert len(assembled.symbols) == count + 1
+    last = 1024 + 6 + (count - 1) * 2
+    assert assembled.symbols['label{}'.format(count - 1)] == last
+    assert assembled.data['1024'] == '41f9{:08x}'.format(last)
+
+
+def test_issues_are_kept():
+    """
+    Test that the issues found while sizing aren't lost when the list file is made
+    """
+    text = '\n'.join([
+        '            ORG $400',
+        'start       FAKE D0',
+        '            MOVE.B D0, D1',
+        '            END start'
+    ])
+    assembled, issues = parse(text)
+
+    assert issues == [('Opcode FAKE is not known: skipping and continuing', 'ERROR')]
+    assert assembled.data['1024'] == '1200'
+
+
+def test_issues_of_every_line():
+    """
+    Test that the issues of every line are returned, and each one only once
+    """
+    text = '\n'.join([
+        '            ORG $400',
+        'start       FAKE D0',
+        '            LEA D0, A1',
+        '            MOVE.B D0, D1',
+        '            END start'
+    ])
+    assembled, issues = parse(text)
+
+    assert issues == [
+        ('Opcode FAKE is not known: skipping and continuing', 'ERROR'),
+        ('Invalid addressing mode', 'ERROR')
+    ]
+    assert assembled.data == {'1024': '1200'}
+
+
+def test_session_matches_parse():
+    """
+    Test that each update of a session gives the same list file as assembling from scratch
+    """
+    lines = [
+        '            ORG $400',
+        'start       MOVE.B #val, D0',
+        '            LEA data, A0',
+        '            SIMHALT',
+        'data        DC.B $AB, $CD',
+        'val         EQU 5',
+        '            END start'
+    ]
+    session = AssemblerSession()
+
+    edits = [
+        lines,
+        # a line that changes size, which moves the label after it
+        lines[:2] + ['            MOVE.B #val, data'] + lines[2:],
+        # an equate that changes, which only the line using it depends on
+        lines[:5] + ['val         EQU 7'] + lines[6:],
+        # a line with an issue
+        lines[:3] + ['            FAKE D0'] + lines[3:],
+        lines
+    ]
+    for edit in edits:
+        text = '\n'.join(edit)
+        assembled, issues = session.update(text)
+        expected, expected_issues = parse(text)
+
+        assert assembled == expected
+        assert issues == expected_issues
+        assert session.list_file is assembled
+
+
+def test_session_reuses_encodings(monkeypatch):
+    """
+    Test that only the lines which changed, or use a symbol that moved, are encoded again
+    """
+    text = '\n'.join([
+        '            ORG $400',
+        'start       MOVE.B D0, D1',
+        '            MOVE.B D1, D2',
+        '            LEA data, A0',
+        'data        DC.B $AB, $CD',
+        '            END start'
+    ])
+    session = AssemblerSession()
+    session.update(text)
+
+    encoded = []
+    encode = assembler.encode_line
+    monkeypatch.setattr(assembler, 'encode_line',
+                        lambda op_class, opcode, contents: encoded.append(contents) or encode(op_class, opcode, contents))
+
+    text = text.replace('D1, D2', 'D1, D3')
+    session.update(text)
+    assert encoded == ['D1, D3']
+
+    # adding a word moves data, so the LEA is encoded again as well
+    encoded.clear()
+    session.update(text.replace('D0, D1', '#$1234, D1'))
+    assert encoded == ['#$1234, D1', '($0000040c).L, A0']
+
+
+def test_parallel_parse():
+    """
+    Test that encoding the lines in a pool of processes gives the same list file and issues
+    """
+    lines = ['            ORG $400', 'start       MOVE.L #val, D0']
+    for i in range(assembler.MIN_PARALLEL_LINES // 2):
+        lines.append('l{}          MOVE.B D{}, D{}'.format(i, i % 8, (i + 3) % 8))
+        lines.append('            LEA l{}, A{}'.format(i, i % 8))
+    lines += ['            FAKE D0', '            SIMHALT', 'val         EQU 5', '            END start']
+    text = '\n'.join(lines)
+
+    expected, expected_issues = parse(text)
+    assembled, issues = parse(text, max_workers=2)
+
+    assert assembled == expected
+    assert issues == expected_issues
+
+
+def test_parallel_parse_registered_opcode():
+    """
+    Test that opcodes registered at run time, which the processes don't have, can still be
+    assembled when a pool of processes is asked for
+    """
+    class Bump(Opcode):
+        mnemonics = ['BUMP']
+        decode_patterns = [(0xFFFF, 0x4AFB)]
+
+        def assemble(self) -> bytearray:
+            return bytearray.fromhex('4AFB')
+
+        @classmethod
+        def command_matches(cls, command: str) -> bool:
+            return command.upper() == 'BUMP'
+
+        @classmethod
+        def get_word_length(cls, command: str, parameters: str) -> int:
+            return 1
+
+        @classmethod
+        def is_valid(cls, command: str, parameters: str) -> (bool, list):
+            return True, []
+
+        @classmethod
+        def from_str(cls, command: str, parameters: str):
+            return cls()
+
+    try:
+        lines = ['            ORG $400']
+        for i in range(assembler.MIN_PARALLEL_LINES):
+            # the operands are ignored, they only make every line different so none are reused
+            lines.append('            BUMP {}'.format(i))
+            lines.append('            MOVE.B D{}, D{}'.format(i % 8, (i + 3) % 8))
+        lines += ['            SIMHALT', '            END $400']
+        text = '\n'.join(lines)
+
+        expected, expected_issues = parse(text)
+        assembled, issues = parse(text, max_workers=2)
+
+        assert not issues
+        assert assembled == expected
+        assert assembled.get_bytes(0x400, 4) == bytes.fromhex('4afb1600')
+    finally:
+        opcode_registry.unregister(Bump)
+
+
+def test_include(tmpdir):
+    """
+    Test that INCLUDE and INCBIN put the contents of other files in the source
+    """
+    tmpdir.mkdir('lib').join('defs.x68').write('val         EQU $AB\n')
+    tmpdir.join('lib', 'data.bin').write_binary(b'\x01\x02\x03')
+    main = tmpdir.join('main.x68')
+    main.write('\n'.join([
+        "            INCLUDE 'lib/defs.x68'",
+        '            ORG $400',
+        'start       MOVE.B #val, D0',
+        "table       INCBIN 'lib/data.bin'",
+        '            SIMHALT',
+        '            INCLUDE lib/missing.x68',
+        '            END start'
+    ]))
+
+    assembled, issues = parse(main.read(), path=str(main))
+
+    assert issues == [('File {} could not be read'.format(str(tmpdir.join('lib', 'missing.x68'))), 'ERROR')]
+    assert assembled.data['1024'] == '103c00ab'
+    assert assembled.symbols['table'] == 1028
+    assert assembled.data['1028'] == '010203'
+    assert assembled.data['1032'] == 'ffffffff'
+
+
+def test_circular_include(tmpdir):
+    """
+    Test that a file which includes itself is an issue, instead of recursing forever
+    """
+    main = tmpdir.join('main.x68')
+    main.write("            INCLUDE 'main.x68'\n            SIMHALT\n")
+
+    assembled, issues = parse(main.read(), path=str(main))
+
+    assert issues == [('File {} includes itself'.format(str(main)), 'ERROR')]
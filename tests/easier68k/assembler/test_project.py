@@ -0,0 +1,75 @@
+from easier68k.assembler.assembler import parse
+from easier68k.assembler.project import Project
+
+
+def write_project(tmpdir, value: str = '$12'):
+    tmpdir.join('defs.x68').write('val         EQU {}\n'.format(value))
+    tmpdir.join('code.x68').write('\n'.join([
+        'start       MOVE.B #val, D0',
+        '            LEA data, A0',
+        '            SIMHALT'
+    ]))
+    tmpdir.join('data.x68').write('data        DC.B $AB, $CD\n')
+    main = tmpdir.join('main.x68')
+    main.write('\n'.join([
+        "            INCLUDE 'defs.x68'",
+        '            ORG $400',
+        "            INCLUDE 'code.x68'",
+        "            INCLUDE 'data.x68'",
+        '            END start'
+    ]))
+    return main
+
+
+def test_build_matches_parse(tmpdir):
+    """
+    Test that building a project gives the same list file as assembling the main file
+    """
+    main = write_project(tmpdir)
+    project = Project(str(main))
+
+    assembled, issues = project.build()
+    expected, expected_issues = parse(main.read(), path=str(main))
+
+    assert not issues
+    assert assembled == expected
+    assert assembled.data['1024'] == '103c0012'
+    assert project.assembled_files == {str(tmpdir.join(name)) for name in ['code.x68', 'data.x68']}
+
+
+def test_rebuild_only_changed_file(tmpdir):
+    """
+    Test that a new project using the cache only assembles the file that was changed
+    """
+    main = write_project(tmpdir)
+    Project(str(main)).build()
+
+    # nothing changed, so everything comes from the cache
+    project = Project(str(main))
+    assembled, issues = project.build()
+    assert project.assembled_files == set()
+    assert assembled == parse(main.read(), path=str(main))[0]
+
+    tmpdir.join('data.x68').write('data        DC.B $AB, $EF\n')
+    project = Project(str(main))
+    assembled, issues = project.build()
+    assert project.assembled_files == {str(tmpdir.join('data.x68'))}
+    assert assembled.data['1038'] == 'abef'
+
+    # an equate changing only assembles the lines that use it
+    write_project(tmpdir, '$34')
+    project = Project(str(main))
+    assembled, issues = project.build()
+    assert project.assembled_files == {str(tmpdir.join('code.x68'))}
+    assert assembled.data['1024'] == '103c0034'
+
+
+def test_cache_dir(tmpdir):
+    """
+    Test that the objects are kept in the cache directory that is given
+    """
+    main = write_project(tmpdir)
+    cache = tmpdir.join('cache')
+    Project(str(main), str(cache)).build()
+
+    assert len(cache.listdir()) == 4
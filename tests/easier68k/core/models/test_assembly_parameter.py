@@ -244,3 +244,52 @@ def test_assembly_parameter_set_value():
     ap.set_value(sim, mv)
 
     assert sim.memory.get(OpSize.LONG, 0x120).get_value_unsigned() == 0xDD
+
+
+def test_get_set_value_unsigned():
+    """
+    Test getting and setting values as unsigned ints
+    :return:
+    """
+    sim = M68K()
+
+    # immediates are masked to the length of the operation
+    assert AssemblyParameter(EAMode.IMM, -1).get_value_unsigned(sim, OpSize.BYTE) == 0xFF
+    assert AssemblyParameter(EAMode.IMM, -2).get_value_unsigned(sim, OpSize.LONG) == 0xFFFFFFFE
+    assert AssemblyParameter(EAMode.IMM, 0x1234).get_value_unsigned(sim, OpSize.WORD) == 0x1234
+
+    with pytest.raises(AssertionError):
+        AssemblyParameter(EAMode.IMM, 0x100).get_value_unsigned(sim, OpSize.BYTE)
+
+    # data registers keep the size they were set with
+    drd = AssemblyParameter(EAMode.DRD, 2)
+    drd.set_value_unsigned(sim, OpSize.BYTE, 0x85)
+    assert drd.get_value_unsigned(sim, OpSize.BYTE) == 0x85
+    assert drd.get_value(sim, OpSize.BYTE).get_value_signed() == -123
+
+    # address register indirect modes only access the length of the operation
+    sim.set_register_int(Register.A1, 0x1000)
+    ari = AssemblyParameter(EAMode.ARI, 1)
+    ari.set_value_unsigned(sim, OpSize.LONG, 0x00ABCDEF)
+    ari.set_value_unsigned(sim, OpSize.BYTE, 0x12)
+    assert ari.get_value_unsigned(sim, OpSize.LONG) == 0x12ABCDEF
+    assert ari.get_value_unsigned(sim, OpSize.WORD) == 0x12AB
+
+    aripi = AssemblyParameter(EAMode.ARIPI, 1)
+    aripi.set_value_unsigned(sim, OpSize.WORD, 0x4567)
+    assert sim.get_register_int(Register.A1) == 0x1002
+    assert sim.memory.read_u16(0x1000) == 0x4567
+
+    aripd = AssemblyParameter(EAMode.ARIPD, 1)
+    aripd.set_value_unsigned(sim, OpSize.WORD, 0x89AB)
+    assert sim.get_register_int(Register.A1) == 0x1000
+    assert sim.memory.read_u16(0x1000) == 0x89AB
+
+    # reading decrements the register first, then reads at the decremented address
+    sim.set_register_int(Register.A1, 0x2004)
+    sim.memory.write_u32(0x2000, 0x11111111)
+    sim.memory.write_u32(0x2004, 0x22222222)
+    assert aripd.get_value_unsigned(sim, OpSize.LONG) == 0x11111111
+    assert sim.get_register_int(Register.A1) == 0x2000
+    assert aripd.get_value(sim, OpSize.LONG).get_value_unsigned() == 0x0
+    assert sim.get_register_int(Register.A1) == 0x1FFC
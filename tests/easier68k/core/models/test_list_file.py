@@ -1,5 +1,6 @@
 import pytest
 import json
+import pickle
 
 from easier68k.core.models.list_file import ListFile
 
@@ -33,8 +34,18 @@ def test_insert_data():
     with pytest.raises((TypeError, ValueError)):
         a.insert_data('123', 123)
 
+    # try to insert nothing
+    with pytest.raises(ValueError):
+        a.insert_data(0x3200, '')
+
+    # try to insert part of a byte
+    with pytest.raises(ValueError):
+        a.insert_data(0x3200, 'abc')
+    with pytest.raises(ValueError):
+        ListFile().load_from_json('{"data": {"12800": "abc"}, "symbols": {}, "startingExecutionAddress": 0}')
+
     # get starting data
-    assert a.get_starting_data(0x3100) is '12341234'
+    assert a.get_starting_data(0x3100) == '12341234'
 
     # out of bounds
     with pytest.raises(AssertionError):
@@ -75,7 +86,7 @@ def test_insert_data_at_symbol():
 
 
     # use get symbol data
-    assert a.get_symbol_data('sym') is 'DEDE'
+    assert a.get_symbol_data('sym') == 'DEDE'
 
     with pytest.raises(AssertionError):
         a.get_symbol_data('doesnotexist')
@@ -95,7 +106,7 @@ def test_clear_location():
 
     a.insert_data(1234, 'AAAA')
 
-    assert a.get_starting_data(1234) is 'AAAA'
+    assert a.get_starting_data(1234) == 'AAAA'
 
     a.clear_location(1234)
 
@@ -201,3 +212,143 @@ def test_list_file_json():
     # try not equals
     b.define_symbol('DataB', 0x1201)
     assert a != b
+
+
+def test_binary():
+    """
+    Tests saving and loading the binary format
+    """
+    a = ListFile()
+    a.insert_data(0x400, '4e722700')
+    a.insert_data(0x404, 'abcd')
+    a.insert_data(0x1000, '12')
+    a.define_symbol('start', 0x400)
+    a.define_symbol('data', 0x1000)
+    a.set_starting_execution_address(0x400)
+
+    binary = a.to_bytes()
+    # a lot smaller than the JSON, even for a tiny program
+    assert len(binary) < len(a.to_json())
+
+    b = ListFile.from_buffer(binary)
+    assert b.symbols == a.symbols
+    assert b.starting_execution_address == 0x400
+
+    # the segments are views of the buffer, with the data next to each other joined together
+    segments = b.get_segments()
+    assert [(location, bytes(segment)) for location, segment in segments] == \
+        [(0x400, bytes.fromhex('4e722700abcd')), (0x1000, b'\x12')]
+    assert all(isinstance(segment, memoryview) for location, segment in segments)
+
+    # the hex data is made when it is needed
+    assert b.data == {'1024': '4e722700abcd', '4096': '12'}
+    assert ListFile.from_buffer(b.to_bytes()) == a
+    assert ListFile.from_buffer(ListFile().to_bytes()) == ListFile()
+
+    with pytest.raises(AssertionError):
+        ListFile.from_buffer(b'L68J' + binary[4:])
+    with pytest.raises(AssertionError):
+        ListFile.from_buffer(binary[:-1])
+
+
+def test_segments():
+    """
+    Tests that data is joined into segments, while each piece of data can still be looked at
+    """
+    a = ListFile()
+    a.insert_data(0x404, 'abcd')
+    a.insert_data(0x400, '4e722700')
+    a.insert_data(0x406, '12')
+    a.insert_data(0x1000, 'ff')
+
+    assert [(location, bytes(segment)) for location, segment in a.get_segments()] == \
+        [(0x400, bytes.fromhex('4e722700abcd12')), (0x1000, b'\xff')]
+    assert a.data == {'1024': '4e722700', '1028': 'abcd', '1030': '12', '4096': 'ff'}
+
+    # bytes can be read from anywhere in a segment, but not across the gap after it
+    assert a.get_bytes(0x402, 3) == bytes.fromhex('2700ab')
+    with pytest.raises(AssertionError):
+        a.get_bytes(0x406, 2)
+    with pytest.raises(AssertionError):
+        a.get_bytes(0x3FF, 1)
+
+    # data in between two segments joins them together
+    a.insert_data(0x407, '34' * (0x1000 - 0x407))
+    assert len(a.get_segments()) == 1
+    assert a.get_starting_data(0x406) == '12'
+
+    # clearing data splits the segment back up
+    a.clear_location(0x404)
+    assert [location for location, segment in a.get_segments()] == [0x400, 0x406]
+    assert a.get_bytes(0x406, 3) == bytes.fromhex('123434')
+    with pytest.raises(AssertionError):
+        a.get_starting_data(0x404)
+
+    # data written over other data replaces those bytes
+    a.insert_data(0x402, '5678')
+    assert a.get_starting_data(0x400) == '4e72'
+    assert a.get_starting_data(0x402) == '5678'
+
+    b = ListFile()
+    b.data = a.data
+    assert b == a
+
+
+def test_insert_overlapping_data():
+    """
+    Tests inserting data over data that is already there
+    """
+    a = ListFile()
+    a.insert_data(0x100, '11223344')
+
+    # the bytes are written over, and the first piece of data now ends where the new one starts
+    a.insert_data(0x102, 'AaBb')
+    assert a.get_bytes(0x100, 4) == bytes.fromhex('1122aabb')
+    assert a.data == {'256': '1122', '258': 'aabb'}
+
+    # data that starts at the same location replaces it
+    a.insert_data(0x100, 'ABCD')
+    assert a.data == {'256': 'ABCD', '258': 'aabb'}
+    assert len(a.get_segments()) == 1
+
+
+def test_data_is_read_only():
+    """
+    Tests that the data can't be changed by mistake, as the changes wouldn't be kept
+    """
+    a = ListFile()
+    a.insert_data(0x100, 'abcd')
+
+    with pytest.raises(TypeError):
+        a.data['256'] = '1234'
+    assert a.get_starting_data(0x100) == 'abcd'
+
+
+def test_compare_to_other_types():
+    """
+    Tests that a list file is never equal to something that isn't a list file
+    """
+    a = ListFile()
+    assert not a == None
+    assert a != None
+    assert a != {}
+    assert a == ListFile()
+
+
+def test_pickle_loaded_from_buffer():
+    """
+    Tests that a list file loaded from the binary format can be pickled, for running it in other processes
+    """
+    a = ListFile()
+    a.insert_data(0x400, '4e722700')
+    a.insert_data(0x1000, 'abcd')
+    a.define_symbol('start', 0x400)
+    a.set_starting_execution_address(0x400)
+
+    b = pickle.loads(pickle.dumps(ListFile.from_buffer(a.to_bytes())))
+    assert b == a
+    assert b.get_starting_data(0x1000) == 'abcd'
+
+    # the copy can still be changed
+    b.insert_data(0x402, '1234')
+    assert b.get_bytes(0x400, 4) == bytes.fromhex('4e721234')
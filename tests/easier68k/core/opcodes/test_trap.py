@@ -7,6 +7,9 @@ import easier68k.core.util.input as inp
 from easier68k.core.enum.trap_vector import TrapVectors
 from easier68k.core.models.memory_value import MemoryValue
 from easier68k.core.enum.op_size import OpSize
+from easier68k.simulator.console import Console, ScriptedInput, EndOfInputError
+import io
+import pytest
 
 def test_disassemble_instruction():
     val = 0b0100111001001111.to_bytes(2, byteorder='big', signed=False)
@@ -130,8 +133,69 @@ def test_read_null_term_string(capsys):
     sim = M68K()
 
     sim.set_register(Register.A1, MemoryValue(OpSize.WORD, unsigned_int=0x1000))
-    sim.set_register(Register.D0, MemoryValue(OpSize.WORD, unsigned_int=TrapTask.DisplaySingleCharacter))
+    sim.set_register(Register.D0, MemoryValue(OpSize.WORD, unsigned_int=TrapTask.ReadNullTermString))
 
     exec = Trap(TrapVectors.IO)
     exec.use_debug_input = True
     exec.debug_input = 'test123!'
+
+    exec.execute(sim)
+
+    assert sim.memory.read_bytes(0x1000, 9) == b'test123!\x00'
+    assert sim.get_register_int(Register.D1) == 8
+
+
+def test_read_number():
+    sim = M68K(console=Console(input=ScriptedInput(['-12', 'abc', ' 305419896 '])))
+    sim.set_register_int(Register.D0, TrapTask.ReadNumberFromKeyboard)
+
+    exec = Trap(TrapVectors.IO)
+    exec.execute(sim)
+    assert sim.get_register_int(Register.D1) == 0xFFFFFFF4
+
+    # not a number
+    exec.execute(sim)
+    assert sim.get_register_int(Register.D1) == 0
+
+    exec.execute(sim)
+    assert sim.get_register_int(Register.D1) == 0x12345678
+
+
+def test_display_and_read_number():
+    output = io.StringIO()
+    sim = M68K(console=Console(output, ScriptedInput(['42'])))
+    sim.memory.write_bytes(0x1000, b'Number? \x00')
+    sim.set_register_int(Register.A1, 0x1000)
+    sim.set_register_int(Register.D0, TrapTask.DisplayNullTermStringAndReadNumberFromKeyboard)
+
+    Trap(TrapVectors.IO).execute(sim)
+    assert output.getvalue() == 'Number? '
+    assert sim.get_register_int(Register.D1) == 42
+
+
+def test_read_single_character():
+    sim = M68K(console=Console(input=ScriptedInput(['ab', 'c'])))
+    sim.set_register_int(Register.D1, 0x12345600)
+    sim.set_register_int(Register.D0, TrapTask.ReadSingleCharacterFromKeyboard)
+
+    exec = Trap(TrapVectors.IO)
+    # the end of each line is a carriage return
+    characters = []
+    for _ in range(5):
+        exec.execute(sim)
+        characters.append(sim.get_register_int(Register.D1) & 0xFF)
+    assert characters == [ord('a'), ord('b'), ord('\r'), ord('c'), ord('\r')]
+    assert sim.get_register_int(Register.D1) & 0xFFFFFF00 == 0x12345600
+
+    with pytest.raises(EndOfInputError):
+        exec.execute(sim)
+
+
+def test_read_long_string():
+    sim = M68K(console=Console(input=ScriptedInput(['x' * 100])))
+    sim.set_register_int(Register.A1, 0x1000)
+    sim.set_register_int(Register.D0, TrapTask.ReadNullTermString)
+
+    Trap(TrapVectors.IO).execute(sim)
+    assert sim.get_register_int(Register.D1) == 80
+    assert sim.memory.read_null_terminated(0x1000) == b'x' * 80
@@ -0,0 +1,58 @@
+from easier68k.core.util.find_module import opcode_registry, build_decode_table
+from easier68k.core.opcodes.move import Move
+from easier68k.core.opcodes.movea import Movea
+from easier68k.core.opcodes.simhalt import Simhalt
+from easier68k.core.opcodes.lea import Lea
+from easier68k.core.opcodes.trap import Trap
+from easier68k.core.opcodes.opcode_or import Or
+from easier68k.core.opcodes.add import Add
+from easier68k.core.opcodes.dc import DC
+
+
+def _first_word(hex_str: str) -> int:
+    return int(hex_str[0:4], 16)
+
+
+def test_decode_table_lookup():
+    """
+    Test that assembled instructions map to the class that disassembles them
+    """
+    opcode_decode_table = opcode_registry.get_decode_table()
+    assert opcode_decode_table[_first_word('33fcabcd00aaaaaa')] == (Move,)
+    assert opcode_decode_table[_first_word('ffffffff')] == (Simhalt,)
+    assert opcode_decode_table[_first_word('41f900000416')] == (Lea,)
+    assert opcode_decode_table[_first_word('4e4f')] == (Trap,)
+    assert opcode_decode_table[_first_word('8200')] == (Or,)
+    assert opcode_decode_table[_first_word('d307')] == (Add,)
+
+
+def test_decode_table_no_match():
+    """
+    Test that words that no opcode can decode have no candidates
+    """
+    opcode_decode_table = opcode_registry.get_decode_table()
+    # MOVE does not have a size of 00
+    assert opcode_decode_table[0x0000] == ()
+    # DC is never decoded
+    for word in range(0x10000):
+        assert DC not in opcode_decode_table[word]
+
+
+def test_decode_table_specific_first():
+    """
+    Test that more specific opcodes are tried before the general ones they overlap with
+    """
+    table = build_decode_table([Move, Movea])
+
+    # MOVEA.L D0, A1
+    assert table[0x2240] == (Movea, Move)
+
+    # MOVE.L D0, D1
+    assert table[0x2200] == (Move,)
+
+    op = None
+    for cls in table[0x2240]:
+        op = cls.disassemble_instruction(bytearray.fromhex('2240'))
+        if op is not None:
+            break
+    assert isinstance(op, Movea)
@@ -0,0 +1,81 @@
+from easier68k.core.util.opcode_registry import OpcodeRegistry, opcode_registry
+from easier68k.core.util.find_module import find_opcode_cls
+from easier68k.core.opcodes.opcode import Opcode
+from easier68k.core.opcodes.move import Move
+from easier68k.core.opcodes.add import Add
+from easier68k.core.opcodes.movea import Movea
+from easier68k.core.util import opcode_util
+from easier68k.core.models.list_file import ListFile
+from easier68k.core.enum.register import Register
+from easier68k.core.enum.stop_reason import StopReason
+from easier68k.simulator.m68k import M68K
+
+
+def test_builtin_opcodes_registered():
+    assert opcode_registry.find('MOVE.W') is Move
+    assert opcode_registry.find('ADD') is Add
+    assert find_opcode_cls('ADD.L') is Add
+
+    # opcodes which aren't finished yet don't list mnemonics, so they aren't registered
+    assert Movea not in opcode_registry.get_classes()
+    assert find_opcode_cls('MOVEA') is None
+
+    # the mnemonic still has to match
+    assert find_opcode_cls('MOVE.') is Move
+    assert find_opcode_cls('MOVEQ') is None
+
+
+def test_registry_replace():
+    registry = OpcodeRegistry()
+    registry.register(Move)
+    registry.register(Add)
+    assert registry.get_classes() == [Move, Add]
+    assert registry.get_decode_table()[0xD307] == (Add,)
+
+    registry.unregister(Add)
+    assert registry.get_classes() == [Move]
+    assert registry.find('ADD') is None
+    assert registry.get_decode_table()[0xD307] == ()
+
+
+def test_plugin_opcode():
+    class Bump(Opcode):
+        """
+        BUMP: adds one to D0
+        """
+        mnemonics = ['BUMP']
+        decode_patterns = [(0xFFFF, 0x4AFB)]
+        cycles = 4
+
+        def execute(self, simulator: M68K):
+            simulator.set_register_int(Register.D0, simulator.get_register_int(Register.D0) + 1)
+            simulator.increment_program_counter(2)
+
+        def get_cycles(self) -> int:
+            return 4
+
+        @classmethod
+        def command_matches(cls, command: str) -> bool:
+            return opcode_util.command_matches(command, 'BUMP')
+
+        @classmethod
+        def disassemble_instruction(cls, data: bytes) -> Opcode:
+            if data[0:2] == b'\x4a\xfb':
+                return cls()
+            return None
+
+    try:
+        # registered just by being defined
+        assert find_opcode_cls('BUMP') is Bump
+
+        list_file = ListFile()
+        list_file.insert_data(1024, '4afb4afb' + 'ffffffff')
+        list_file.set_starting_execution_address(1024)
+        sim = M68K()
+        sim.load_list_file(list_file)
+        assert sim.run() == StopReason.HALTED
+        assert sim.get_register_int(Register.D0) == 2
+    finally:
+        opcode_registry.unregister(Bump)
+
+    assert find_opcode_cls('BUMP') is None
@@ -0,0 +1,17 @@
+from easier68k.simulator.m68k import M68K
+from easier68k.core.models.list_file import ListFile
+
+
+def load_program(m68k: M68K, data: dict, start: int):
+    """
+    Loads a program into a simulator, the same way an assembled list file is
+    :param m68k: the simulator
+    :param data: location -> the hex data there
+    :param start: the starting execution address
+    :return:
+    """
+    list_file = ListFile()
+    for location, value in data.items():
+        list_file.insert_data(location, value)
+    list_file.set_starting_execution_address(start)
+    m68k.load_list_file(list_file)
@@ -0,0 +1,72 @@
+from easier68k.simulator.m68k import M68K
+from easier68k.core.models.memory_value import MemoryValue
+from easier68k.core.enum.op_size import OpSize
+from easier68k.core.enum.register import Register
+from . import load_program
+
+
+# ADD.B D1, D0
+# ADD.B D1, D0
+# MOVE.W #$ABCD, ($00AAAAAA).L
+# SIMHALT
+PROGRAM = {0x1000: 'd001', 0x1002: 'd001', 0x1004: '33fcabcd00aaaaaa', 0x100C: 'ffffffff'}
+
+
+def test_block_engine_matches_interpreter():
+    results = []
+    for use_block_engine in [False, True]:
+        m68k = M68K()
+        load_program(m68k, PROGRAM, 0x1000)
+        m68k.set_register(Register.D1, MemoryValue(OpSize.LONG, unsigned_int=3))
+
+        m68k.run(use_block_engine=use_block_engine)
+
+        assert m68k.halted
+        results.append((m68k.get_register(Register.D0).get_value_unsigned(),
+                        m68k.get_program_counter_value(),
+                        m68k.memory.get(OpSize.WORD, 0x00AAAAAA).get_value_unsigned()))
+
+    assert results[0] == results[1] == (6, 0x1010, 0xABCD)
+
+
+def test_block_reused():
+    m68k = M68K()
+    load_program(m68k, PROGRAM, 0x1000)
+    m68k.set_register(Register.D1, MemoryValue(OpSize.LONG, unsigned_int=1))
+    engine = m68k.block_engine
+
+    # the first time through the block is recorded
+    engine.step_block()
+    assert engine.blocks_built == 1
+    assert engine.dispatches == 0
+    assert len(engine.blocks[0x1000].instructions) == 4
+    assert m68k.halted
+
+    # run it again, this time as a single dispatch
+    m68k.halted = False
+    m68k.set_program_counter_value(0x1000)
+    engine.step_block()
+    assert engine.blocks_built == 1
+    assert engine.dispatches == 1
+    assert m68k.get_register(Register.D0).get_value_unsigned() == 4
+    assert m68k.halted
+
+
+def test_block_rebuilt_after_code_changes():
+    m68k = M68K()
+    load_program(m68k, PROGRAM, 0x1000)
+    m68k.set_register(Register.D1, MemoryValue(OpSize.LONG, unsigned_int=1))
+    engine = m68k.block_engine
+
+    engine.step_block()
+    assert m68k.get_register(Register.D0).get_value_unsigned() == 2
+
+    # replace the second ADD with OR.B D1, D2
+    m68k.memory.set(OpSize.WORD, 0x1002, MemoryValue(OpSize.WORD, unsigned_int=0x8401))
+
+    m68k.halted = False
+    m68k.set_program_counter_value(0x1000)
+    engine.step_block()
+    assert engine.blocks_built == 2
+    assert m68k.get_register(Register.D0).get_value_unsigned() == 3
+    assert m68k.get_register(Register.D2).get_value_unsigned() == 1
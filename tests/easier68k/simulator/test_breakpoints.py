@@ -0,0 +1,112 @@
+import pytest
+
+from easier68k.simulator.m68k import M68K
+from easier68k.simulator.memory import Memory
+from easier68k.simulator.paged_memory import PagedMemory
+from easier68k.core.enum.register import Register
+from . import load_program
+
+# 1024 MOVE.W #$ABCD, ($00AAAAAA).L
+# 1032 MOVE.L #$12345678, D1
+# 1038 MOVE.W #$1111, ($00AAAAAA).L
+# 1046 LEA ($00AAAAAA).L, A0
+# 1052 MOVE.W (A0), D2
+# 1054 SIMHALT
+PROGRAM = '33fcabcd00aaaaaa' + '223c12345678' + '33fc111100aaaaaa' + '41f900aaaaaa' + '3410' + 'ffffffff'
+
+
+def test_breakpoint():
+    m68k = M68K()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+    m68k.add_breakpoint(1032)
+    m68k.add_breakpoint(1046)
+
+    m68k.run()
+    assert not m68k.halted
+    assert m68k.triggered_breakpoint == 1032
+    assert m68k.get_program_counter_value() == 1032
+    # the instruction at the breakpoint hasn't been executed yet
+    assert m68k.get_register_int(Register.D1) == 0
+
+    # continuing executes the instruction at the breakpoint
+    m68k.resume()
+    assert m68k.triggered_breakpoint == 1046
+    assert m68k.get_register_int(Register.D1) == 0x12345678
+
+    m68k.remove_breakpoint(1046)
+    m68k.resume()
+    assert m68k.halted
+    assert m68k.triggered_breakpoint is None
+    assert m68k.get_register_int(Register.D2) == 0x1111
+
+
+def test_breakpoint_block_engine():
+    m68k = M68K()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+    m68k.add_breakpoint(1038)
+
+    # the breakpoint is in the middle of a block, so blocks aren't used
+    m68k.run(use_block_engine=True)
+    assert m68k.triggered_breakpoint == 1038
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+
+    m68k.resume(use_block_engine=True)
+    assert m68k.halted
+
+
+@pytest.mark.parametrize('memory', [Memory(), PagedMemory()])
+def test_watchpoint(memory):
+    m68k = M68K(memory)
+    load_program(m68k, {1024: PROGRAM}, 1024)
+
+    write = memory.add_watchpoint(0x00aaaaab)
+    m68k.run()
+    # stops after the instruction which wrote to it
+    assert memory.triggered_watchpoint is write
+    assert memory.triggered_location == 0x00aaaaaa
+    assert m68k.get_program_counter_value() == 1032
+
+    m68k.resume()
+    assert m68k.get_program_counter_value() == 1046
+    assert memory.read_u16(0x00aaaaaa) == 0x1111
+
+    # reads through read_bytes, like instruction fetches, don't trigger watchpoints
+    memory.remove_watchpoint(write)
+    memory.clear_triggered_watchpoint()
+    read = memory.add_watchpoint(0x00aaaaaa, 2, on_read=True, on_write=False)
+    memory.read_bytes(0x00aaaaaa, 2)
+    assert memory.triggered_watchpoint is None
+
+    m68k.resume()
+    assert memory.triggered_watchpoint is read
+    assert m68k.get_program_counter_value() == 1054
+    assert m68k.get_register_int(Register.D2) == 0x1111
+
+    memory.remove_watchpoint(read)
+    assert not memory.has_watchpoints()
+    m68k.resume()
+    assert m68k.halted
+
+
+def test_watchpoint_pages():
+    memory = Memory()
+    watchpoint = memory.add_watchpoint(0x1FFE, 4, on_read=True)
+
+    # other locations in the watched pages don't trigger it
+    memory.write_u32(0x2004, 1)
+    memory.read_u8(0x1000)
+    assert memory.triggered_watchpoint is None
+
+    memory.read_u8(0x2001)
+    assert memory.triggered_watchpoint is watchpoint
+    memory.clear_triggered_watchpoint()
+
+    # writes of ranges across pages
+    memory.write_bytes(0x1000, bytes(0x1000))
+    assert memory.triggered_watchpoint is watchpoint
+    assert memory.triggered_location == 0x1000
+
+    memory.remove_watchpoint(watchpoint)
+    memory.clear_triggered_watchpoint()
+    memory.write_u16(0x2000, 1)
+    assert memory.triggered_watchpoint is None
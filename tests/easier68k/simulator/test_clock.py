@@ -0,0 +1,59 @@
+from easier68k.simulator.m68k import M68K
+from easier68k.simulator.clock import ea_cycles
+from easier68k.core.models.list_file import ListFile
+from easier68k.core.models.assembly_parameter import AssemblyParameter
+from easier68k.core.enum.ea_mode import EAMode
+from easier68k.core.enum.op_size import OpSize
+from easier68k.core.opcodes.move import Move
+from easier68k.core.opcodes.add import Add
+from easier68k.core.opcodes.lea import Lea
+from easier68k.core.opcodes.neg import Neg
+from easier68k.core.opcodes.subq import Subq
+
+
+def test_ea_cycles():
+    assert ea_cycles(EAMode.DRD, OpSize.LONG) == 0
+    assert ea_cycles(EAMode.ARI, OpSize.BYTE) == 4
+    assert ea_cycles(EAMode.ARIPD, OpSize.LONG) == 10
+    assert ea_cycles(EAMode.ALA, OpSize.WORD) == 12
+
+
+def test_opcode_cycles():
+    d0 = AssemblyParameter(EAMode.DRD, 0)
+    d1 = AssemblyParameter(EAMode.DRD, 1)
+    a0 = AssemblyParameter(EAMode.ARD, 0)
+    ari = AssemblyParameter(EAMode.ARI, 0)
+    pre_decrement = AssemblyParameter(EAMode.ARIPD, 0)
+    absolute = AssemblyParameter(EAMode.ALA, 0x1000)
+
+    assert Move([d0, d1], OpSize.LONG).get_cycles() == 4
+    assert Move([AssemblyParameter(EAMode.IMM, 1), absolute], OpSize.WORD).get_cycles() == 20
+    # a pre decrement destination doesn't take any longer than (An)
+    assert Move([d0, pre_decrement], OpSize.LONG).get_cycles() == 12
+    assert Move([pre_decrement, d0], OpSize.LONG).get_cycles() == 14
+
+    assert Add([ari, d0], OpSize.WORD).get_cycles() == 8
+    assert Add([d0, d1], OpSize.LONG).get_cycles() == 8
+    assert Add([ari, d0], OpSize.LONG).get_cycles() == 14
+    assert Add([d0, ari], OpSize.LONG).get_cycles() == 20
+
+    assert Lea([absolute, a0]).get_cycles() == 12
+    assert Neg([d0], OpSize.LONG).get_cycles() == 6
+    assert Subq([AssemblyParameter(EAMode.IMM, 1), a0], OpSize.WORD).get_cycles() == 8
+
+
+def test_simulator_cycles():
+    list_file = ListFile()
+    # MOVE.W #$ABCD, ($00AAAAAA).L then SIMHALT
+    list_file.insert_data(1024, '33fcabcd00aaaaaaffffffff')
+    list_file.set_starting_execution_address(1024)
+
+    for use_block_engine in [False, True]:
+        m68k = M68K()
+        m68k.load_list_file(list_file)
+        m68k.run(use_block_engine)
+        assert m68k.halted
+        assert m68k.get_cycles() == 20 + 4
+
+        m68k.clear_cycles()
+        assert m68k.get_cycles() == 0
@@ -0,0 +1,140 @@
+import io
+import pytest
+
+from easier68k.simulator.console import Console, ScriptedInput
+from easier68k.simulator.m68k import M68K
+from easier68k.simulator.memory import Memory, OutOfBoundsMemoryError
+from easier68k.simulator.paged_memory import PagedMemory, PAGE_SIZE
+from easier68k.core.opcodes.trap import Trap
+from easier68k.core.enum.trap_task import TrapTask
+from easier68k.core.enum.trap_vector import TrapVectors
+from easier68k.core.enum.register import Register
+from easier68k.core.enum.stop_reason import StopReason
+from easier68k.core.models.list_file import ListFile
+
+
+def test_console_streams():
+    output = io.StringIO()
+    console = Console(output, io.StringIO('first\nsecond\r\n'))
+    console.write('abc')
+    console.write('def')
+    assert output.getvalue() == 'abcdef'
+    assert console.read_line() == 'first'
+    assert console.read_line() == 'second'
+
+    # callables
+    written = []
+    lines = iter(['line'])
+    console = Console(written.append, lambda: next(lines))
+    console.write('abc')
+    assert written == ['abc']
+    assert console.read_line() == 'line'
+
+
+def test_console_default(capsys):
+    Console().write('abc')
+    assert capsys.readouterr().out == 'abc'
+
+
+@pytest.mark.parametrize('memory', [Memory(), PagedMemory()])
+def test_read_null_terminated(memory):
+    # a string across a page boundary
+    memory.write_bytes(PAGE_SIZE - 2, b'ABCD\x00')
+    assert memory.read_null_terminated(PAGE_SIZE - 2) == b'ABCD'
+    assert memory.read_null_terminated(PAGE_SIZE + 2) == b''
+
+    memory.write_bytes(len(memory) - 2, b'AB')
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.read_null_terminated(len(memory) - 2)
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.read_null_terminated(len(memory))
+
+
+def test_trap_writes_to_console():
+    output = io.StringIO()
+    sim = M68K(console=Console(output))
+
+    sim.memory.write_bytes(0x1000, b'Hello\xe9\x00')
+    sim.set_register_int(Register.A1, 0x1000)
+    sim.set_register_int(Register.D0, TrapTask.DisplayNullTermStringWithCRLF)
+    Trap(TrapVectors.IO).execute(sim)
+
+    sim.set_register_int(Register.D0, TrapTask.DisplaySignedNumber)
+    sim.set_register_int(Register.D1, 0xFFFFFFFF)
+    Trap(TrapVectors.IO).execute(sim)
+
+    assert output.getvalue() == 'Hello\xe9\n-1'
+
+
+def test_waiting_for_input():
+    # MOVE.L #4, D0
+    # TRAP #15 (read a number into D1)
+    # ADD.L D1, D2
+    # TRAP #15
+    # ADD.L D1, D2
+    # SIMHALT
+    list_file = ListFile()
+    list_file.insert_data(1024, '203c00000004' + '4e4f' + 'd481' + '4e4f' + 'd481' + 'ffffffff')
+    list_file.set_starting_execution_address(1024)
+
+    scripted = ScriptedInput(['5'])
+    sim = M68K(console=Console(io.StringIO(), scripted))
+    sim.load_list_file(list_file)
+
+    # stops at the second TRAP, which can be run again once there is more input
+    assert sim.run() == StopReason.WAITING_FOR_INPUT
+    assert sim.get_program_counter_value() == 1034
+    assert sim.get_register_int(Register.D2) == 5
+
+    scripted.feed('6\n')
+    assert sim.run() == StopReason.HALTED
+    assert sim.get_register_int(Register.D2) == 11
+
+    # the input that was read can replay the run
+    replay = M68K(console=Console(io.StringIO(), ScriptedInput(sim.console.input_log)))
+    replay.load_list_file(list_file)
+    assert replay.run() == StopReason.HALTED
+    assert replay.get_register_int(Register.D2) == 11
+
+
+def test_prompt_shown_once_when_waiting():
+    # MOVE.L #18, D0
+    # LEA (prompt).L, A1
+    # TRAP #15 (display the prompt and read a number into D1)
+    # ADD.L D1, D2
+    # TRAP #15
+    # ADD.L D1, D2
+    # SIMHALT
+    # prompt: DC.B 'N?', 0
+    list_file = ListFile()
+    list_file.insert_data(1024, '203c00000012' + '43f900000418' + '4e4f' + 'd481' + '4e4f' + 'd481' + 'ffffffff'
+                          + '4e3f00')
+    list_file.set_starting_execution_address(1024)
+
+    output = io.StringIO()
+    scripted = ScriptedInput()
+    sim = M68K(console=Console(output, scripted))
+    sim.load_list_file(list_file)
+
+    # the first TRAP has no input, so it is run again after the input is fed
+    assert sim.run() == StopReason.WAITING_FOR_INPUT
+    assert output.getvalue() == 'N?'
+    assert sim.run() == StopReason.WAITING_FOR_INPUT
+    assert output.getvalue() == 'N?'
+
+    scripted.feed('5\n')
+    assert sim.run() == StopReason.WAITING_FOR_INPUT
+    assert sim.get_register_int(Register.D2) == 5
+    assert output.getvalue() == 'N?N?'
+
+    scripted.feed('6\n')
+    assert sim.run() == StopReason.HALTED
+    assert sim.get_register_int(Register.D2) == 11
+    assert output.getvalue() == 'N?N?'
+
+    # replaying the input gives exactly the same output
+    replay_output = io.StringIO()
+    replay = M68K(console=Console(replay_output, ScriptedInput(sim.console.input_log)))
+    replay.load_list_file(list_file)
+    assert replay.run() == StopReason.HALTED
+    assert replay_output.getvalue() == output.getvalue()
@@ -0,0 +1,74 @@
+import io
+
+from easier68k.simulator.m68k import M68K
+from easier68k.simulator.instruction_cache import InstructionCache
+from easier68k.core.models.memory_value import MemoryValue
+from easier68k.core.enum.op_size import OpSize
+from easier68k.core.enum.register import Register
+from . import load_program
+
+
+def test_cache_hits_and_misses():
+    m68k = M68K()
+
+    # ADD.B D1, D0
+    load_program(m68k, {0x1000: 'd001', 0x1002: 'ffffffff'}, 0x1000)
+
+    cache = m68k.instruction_cache
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+    m68k.step_instruction()
+    assert cache.misses == 1
+    assert 0x1000 in cache.entries
+
+    # run the same instruction again
+    m68k.set_program_counter_value(0x1000)
+    m68k.step_instruction()
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_invalidated_by_write():
+    m68k = M68K()
+
+    # ADD.B D1, D0
+    load_program(m68k, {0x1000: 'd001', 0x1002: 'ffffffff'}, 0x1000)
+    m68k.set_register(Register.D1, MemoryValue(OpSize.LONG, unsigned_int=1))
+
+    m68k.step_instruction()
+    assert m68k.get_register(Register.D0).get_value_unsigned() == 1
+
+    # overwrite the instruction with OR.B D1, D2
+    m68k.memory.set(OpSize.WORD, 0x1000, MemoryValue(OpSize.WORD, unsigned_int=0x8401))
+    assert 0x1000 not in m68k.instruction_cache.entries
+
+    m68k.set_program_counter_value(0x1000)
+    m68k.step_instruction()
+    assert m68k.get_register(Register.D0).get_value_unsigned() == 1
+    assert m68k.get_register(Register.D2).get_value_unsigned() == 1
+
+
+def test_cache_invalidated_by_write_to_extension_words():
+    cache = InstructionCache()
+    cache.insert(0x10FE, object())
+
+    # unrelated write before the instruction
+    cache.invalidate(0x10F0, 4)
+    assert 0x10FE in cache.entries
+
+    # write inside of the trailing words, which is on the next page
+    cache.invalidate(0x1104, 2)
+    assert 0x10FE not in cache.entries
+    assert cache.invalidations == 1
+
+
+def test_cache_cleared_by_load_memory():
+    m68k = M68K()
+
+    load_program(m68k, {0x1000: 'd001', 0x1002: 'ffffffff'}, 0x1000)
+    m68k.step_instruction()
+    assert m68k.instruction_cache.entries
+
+    m68k.load_memory(io.BytesIO(bytes(16777216)))
+    assert not m68k.instruction_cache.entries
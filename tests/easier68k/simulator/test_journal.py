@@ -0,0 +1,136 @@
+import pytest
+
+from easier68k.simulator.m68k import M68K
+from easier68k.core.enum.register import Register
+from . import load_program
+
+# MOVE.W #$ABCD, ($00AAAAAA).L
+# MOVE.L #$12345678, D1
+# MOVE.W #$1111, ($00AAAAAA).L
+# SIMHALT
+PROGRAM = '33fcabcd00aaaaaa' + '223c12345678' + '33fc111100aaaaaa' + 'ffffffff'
+
+
+def test_step_back():
+    m68k = M68K()
+    m68k.enable_journal()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+
+    m68k.run()
+    assert m68k.halted
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0x1111
+    assert len(m68k.journal) == 4
+
+    # undo the SIMHALT
+    assert m68k.step_back()
+    assert not m68k.halted
+    assert m68k.get_program_counter_value() == 1046
+
+    # undo the second move to memory
+    assert m68k.step_back()
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+    assert m68k.get_register_int(Register.D1) == 0x12345678
+
+    # undo the move to the register
+    assert m68k.step_back()
+    assert m68k.get_register_int(Register.D1) == 0
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+
+    assert m68k.step_back()
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0
+    assert m68k.get_program_counter_value() == 1024
+
+    # nothing left to undo
+    assert not m68k.step_back()
+
+    # run it forwards again, using the block engine
+    m68k.clock_auto_cycle = True
+    m68k.run(use_block_engine=True)
+    assert m68k.halted
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0x1111
+
+
+def test_run_after_stepping_back_over_halt():
+    m68k = M68K()
+    m68k.enable_journal()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+
+    m68k.run()
+    assert m68k.halted
+    assert not m68k.clock_auto_cycle
+
+    # the SIMHALT stopped the automatic execution, undoing it starts it again
+    assert m68k.step_back()
+    assert not m68k.halted
+    assert m68k.clock_auto_cycle
+
+    m68k.run()
+    assert m68k.halted
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0x1111
+    assert len(m68k.journal) == 4
+
+
+def test_writes_between_instructions_are_not_undone():
+    m68k = M68K()
+    m68k.enable_journal()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+
+    m68k.step_instruction()
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+
+    # written by the debugger, not by the instruction
+    m68k.memory.write_u16(0x2000, 0x5555)
+
+    assert m68k.step_back()
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0
+    assert m68k.memory.read_u16(0x2000) == 0x5555
+
+
+def test_run_back_to():
+    m68k = M68K()
+    m68k.enable_journal()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+    m68k.run()
+
+    assert m68k.run_back_to(1038)
+    assert m68k.get_program_counter_value() == 1038
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+
+    # never executed
+    assert not m68k.run_back_to(0x2000)
+    assert m68k.get_program_counter_value() == 1024
+
+
+def test_reload_execution():
+    m68k = M68K()
+    load_program(m68k, {1024: PROGRAM}, 1024)
+    # does nothing without the journal
+    assert not m68k.reload_execution()
+
+    m68k.enable_journal()
+    m68k.step_instruction()
+    m68k.step_instruction()
+    assert m68k.get_program_counter_value() == 1038
+
+    assert m68k.reload_execution()
+    assert m68k.get_program_counter_value() == 1038
+    assert m68k.get_register_int(Register.D1) == 0x12345678
+    assert len(m68k.journal) == 2
+
+
+def test_journal_is_bounded():
+    m68k = M68K()
+    m68k.enable_journal(length=4, write_length=2)
+    load_program(m68k, {1024: PROGRAM}, 1024)
+    m68k.run()
+
+    # there is only room for the memory written by one of the moves,
+    # so the first one was forgotten
+    assert len(m68k.journal) == 3
+    assert m68k.run_back_to(1024) is False
+    assert m68k.get_program_counter_value() == 1032
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+
+    m68k.disable_journal()
+    with pytest.raises(AssertionError):
+        m68k.step_back()
@@ -6,6 +6,7 @@ from easier68k.core.models.list_file import ListFile
 from easier68k.simulator.memory import Memory
 from easier68k.core.models.memory_value import MemoryValue
 from easier68k.core.enum.op_size import OpSize
+from easier68k.core.enum.condition_status_code import ConditionStatusCode
 
 def test_address_registers():
     """
@@ -151,6 +152,52 @@ def test_condition_code_register():
     assert a.get_register(Register.ConditionCodeRegister).get_value_unsigned() == 0xAF
     assert a.get_register(Register.CCR).get_value_unsigned() == 0xAF
 
+def test_set_condition_status_codes():
+    """
+    Test setting several condition codes at once
+    :return:
+    """
+    a = M68K()
+
+    a.set_condition_status_codes(ConditionStatusCode.ALL, ConditionStatusCode.X | ConditionStatusCode.Z)
+    assert a.get_register(Register.CCR) == 0b10100
+
+    # codes outside of the mask are not modified
+    a.set_condition_status_codes(ConditionStatusCode.NZVC, ConditionStatusCode.N | ConditionStatusCode.X)
+    assert a.get_condition_status_code(ConditionStatusCode.X)
+    assert a.get_condition_status_code(ConditionStatusCode.N)
+    assert not a.get_condition_status_code(ConditionStatusCode.Z)
+    assert a.get_register(Register.CCR) == 0b11000
+
+    a.set_condition_status_codes(ConditionStatusCode.ALL, 0)
+    assert a.get_register(Register.CCR) == 0
+
+def test_register_int_interface():
+    """
+    Test reading and writing the registers as plain ints
+    :return:
+    """
+    a = M68K()
+
+    a.set_register_int(Register.D3, 0xDEADBEEF)
+    assert a.get_register_int(Register.D3) == 0xDEADBEEF
+    assert a.get_register(Register.D3).get_size() == OpSize.LONG
+
+    # values set with a MemoryValue keep their size
+    a.set_register(Register.D3, MemoryValue(OpSize.BYTE, unsigned_int=0x85))
+    assert a.get_register_int(Register.D3) == 0x85
+    assert a.get_register(Register.D3).get_size() == OpSize.BYTE
+    assert a.get_register(Register.D3).get_value_signed() == -123
+
+    a.set_register_int(Register.A7, 0x1000)
+    assert a.get_register(Register.A7) == 0x1000
+
+    with pytest.raises(AssertionError):
+        a.set_register_int(Register.D0, 0x100000000)
+
+    with pytest.raises(AssertionError):
+        a.set_register_int(Register.CCR, 0x100)
+
 def test_full_integration():
     m68k = M68K()
 
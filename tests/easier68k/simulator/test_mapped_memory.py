@@ -0,0 +1,63 @@
+from easier68k.simulator.mapped_memory import MappedMemory
+from easier68k.simulator.memory import Memory, MEMORY_SIZE
+from easier68k.simulator.m68k import M68K
+from easier68k.core.models.memory_value import MemoryValue
+from easier68k.core.enum.op_size import OpSize
+
+
+def test_mapped_memory_flush(tmpdir):
+    path = tmpdir.join('mapped.raw').strpath
+
+    # a new file is made the full size of memory
+    memory = MappedMemory(path)
+    assert len(memory) == MEMORY_SIZE
+    assert memory.read_u32(0x100000) == 0
+
+    memory.set(OpSize.LONG, 0x100000, MemoryValue(OpSize.LONG, unsigned_int=0x456789AB))
+    memory.write_u16(0x00, 0xBEEF)
+    assert memory.get_dirty_page_count() == 2
+
+    memory.flush()
+    assert memory.get_dirty_page_count() == 0
+    memory.close()
+
+    # the file is the same format as save_memory
+    load_test = Memory()
+    load_test.load_memory(open(path, 'rb'))
+    assert load_test.read_u32(0x100000) == 0x456789AB
+    assert load_test.read_u16(0x00) == 0xBEEF
+
+    # and can be mapped again
+    memory = MappedMemory(path)
+    assert memory.read_u32(0x100000) == 0x456789AB
+    memory.close()
+
+
+def test_mapped_memory_save_load(tmpdir):
+    path = tmpdir.join('memoryDump.raw').strpath
+
+    source = Memory()
+    source.write_u32(0x1000, 0x01230000)
+    source.save_memory(open(path, 'wb'))
+
+    memory = MappedMemory(tmpdir.join('mapped.raw').strpath)
+    memory.load_memory(open(path, 'rb'))
+    assert memory.read_u32(0x1000) == 0x01230000
+
+    # saving writes the whole of memory
+    memory.save_memory(open(path, 'wb'))
+    assert open(path, 'rb').read() == source.memory
+    memory.close()
+
+
+def test_mapped_memory_simulator(tmpdir):
+    m68k = M68K(MappedMemory(tmpdir.join('mapped.raw').strpath))
+
+    # MOVE.W #$ABCD, ($00AAAAAA).L then SIMHALT
+    m68k.memory.write_bytes(1024, bytes.fromhex('33fcabcd00aaaaaaffffffff'))
+    m68k.set_program_counter_value(1024)
+    m68k.run()
+
+    assert m68k.halted
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+    m68k.memory.close()
@@ -3,6 +3,7 @@ import pytest
 from easier68k.simulator.memory import Memory, UnalignedMemoryAccessError, OutOfBoundsMemoryError
 from easier68k.core.models.memory_value import MemoryValue
 from easier68k.core.enum.op_size import OpSize
+from easier68k.core.models.list_file import ListFile
 
 def test_memory_set_get():
     memory = Memory()
@@ -91,3 +92,64 @@ def test_memory_save_load(tmpdir):
     assert load_test.get(OpSize.LONG, 0x00).get_value_unsigned() == 0xFF00BEEF
     assert load_test.get(OpSize.LONG, 0x001000).get_value_unsigned() == 0x01230000
     assert load_test.get(OpSize.LONG, 0x100000).get_value_unsigned() == 0x456789AB
+
+def test_memory_read_write_unsigned():
+    memory = Memory()
+
+    memory.write_u32(0x100, 0xDEADBEEF)
+    assert memory.read_u32(0x100) == 0xDEADBEEF
+    assert memory.read_u16(0x100) == 0xDEAD
+    assert memory.read_u16(0x102) == 0xBEEF
+    assert memory.read_u8(0x103) == 0xEF
+
+    memory.write_u16(0x104, 0x1234)
+    memory.write_u8(0x107, 0x56)
+    assert memory.read_u32(0x104) == 0x12340056
+
+    # the generic versions are the same as the sized ones
+    memory.write_unsigned(OpSize.BYTE, 0x106, 0xAB)
+    assert memory.read_unsigned(OpSize.LONG, 0x104) == 0x1234AB56
+    assert memory.get(OpSize.WORD, 0x106).get_value_unsigned() == 0xAB56
+
+    # writes are seen by the write listeners
+    writes = []
+    memory.add_write_listener(lambda location, length: writes.append((location, length)))
+    memory.write_u16(0x200, 0xFFFF)
+    assert writes == [(0x200, 2)]
+
+    with pytest.raises(UnalignedMemoryAccessError):
+        memory.read_u16(0x101)
+    with pytest.raises(UnalignedMemoryAccessError):
+        memory.write_u32(0x102, 0)
+
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.read_u8(0x1000000)
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.write_u32(-4, 0)
+
+def test_memory_load_list_file():
+    memory = Memory()
+
+    list_file = ListFile()
+    list_file.insert_data(0x401, 'abcdef')
+    list_file.insert_data(0x1000, '00' * 0x1000)
+    list_file.insert_data(0x2000, '12')
+
+    writes = []
+    memory.add_write_listener(lambda location, length: writes.append((location, length)))
+    memory.load_list_file(list_file)
+
+    # one write per run of data, which doesn't need to be aligned
+    # and data that is next to each other is written together
+    assert sorted(writes) == [(0x401, 3), (0x1000, 0x1001)]
+    assert memory.read_bytes(0x400, 5) == b'\x00\xAB\xCD\xEF\x00'
+    assert memory.read_u8(0x2000) == 0x12
+
+    # data past the end of memory is rejected
+    list_file = ListFile()
+    list_file.insert_data(0xFFFFFF, 'abcd')
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.load_list_file(list_file)
+
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.read_bytes(0xFFFFFF, 2)
@@ -0,0 +1,114 @@
+import pytest
+
+from easier68k.simulator.paged_memory import PagedMemory, PAGE_SIZE
+from easier68k.simulator.memory import Memory, UnalignedMemoryAccessError, OutOfBoundsMemoryError, MEMORY_SIZE
+from easier68k.simulator.m68k import M68K
+from easier68k.core.models.memory_value import MemoryValue
+from easier68k.core.models.list_file import ListFile
+from easier68k.core.enum.op_size import OpSize
+
+
+def test_paged_memory_set_get():
+    memory = PagedMemory()
+
+    assert len(memory) == MEMORY_SIZE
+    # nothing is allocated until it is written
+    assert memory.get(OpSize.LONG, 0x00).get_value_unsigned() == 0
+    assert memory.get(OpSize.BYTE, 0xFFFFFF).get_value_unsigned() == 0
+    assert memory.get_allocated_page_count() == 0
+
+    memory.set(OpSize.LONG, 0x100000, MemoryValue(OpSize.LONG, unsigned_int=0x456789AB))
+    assert memory.get(OpSize.LONG, 0x100000).get_value_unsigned() == 0x456789AB
+    assert memory.get(OpSize.WORD, 0x100002).get_value_unsigned() == 0x89AB
+    assert memory.get_allocated_page_count() == 1
+
+    with pytest.raises(UnalignedMemoryAccessError):
+        memory.get(OpSize.WORD, 0x000001)
+    with pytest.raises(UnalignedMemoryAccessError):
+        memory.set(OpSize.LONG, 0x000001, MemoryValue(OpSize.WORD, bytes=b'\xDE\xAD'))
+
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.get(OpSize.LONG, 0xFFFFFF4)
+    with pytest.raises(OutOfBoundsMemoryError):
+        memory.get(OpSize.BYTE, -1)
+
+
+def test_paged_memory_bytes_across_pages():
+    memory = PagedMemory()
+
+    data = bytes(range(256)) * 40
+    memory.write_bytes(PAGE_SIZE - 3, data)
+
+    assert memory.read_bytes(PAGE_SIZE - 3, len(data)) == data
+    assert memory.read_u8(PAGE_SIZE - 1) == 2
+    assert memory.read_u16(PAGE_SIZE) == 0x0304
+    assert memory.get_allocated_page_count() == 4
+
+
+def test_paged_memory_fork():
+    memory = PagedMemory()
+    memory.write_u32(0x1000, 0xDEADBEEF)
+
+    fork = memory.fork()
+    assert fork.read_u32(0x1000) == 0xDEADBEEF
+
+    # writes to either copy are not seen by the other
+    fork.write_u16(0x1000, 0x1234)
+    memory.write_u16(0x1002, 0x5678)
+    assert fork.read_u32(0x1000) == 0x1234BEEF
+    assert memory.read_u32(0x1000) == 0xDEAD5678
+
+    # the copies only share the pages neither one has written to
+    fork.write_u8(0x5000, 1)
+    assert memory.read_u8(0x5000) == 0
+
+
+def test_paged_memory_save_load(tmpdir):
+    memory = PagedMemory()
+    path = tmpdir.join('memoryDump.raw').strpath
+
+    memory.write_u32(0x00, 0xFF00BEEF)
+    memory.write_u32(0x100000, 0x456789AB)
+    memory.save_memory(open(path, 'wb'))
+
+    # the same file as the bytearray memory
+    load_test = Memory()
+    load_test.load_memory(open(path, 'rb'))
+    assert len(load_test) == MEMORY_SIZE
+    assert load_test.read_u32(0x00) == 0xFF00BEEF
+    assert load_test.read_u32(0x100000) == 0x456789AB
+
+    load_test = PagedMemory()
+    load_test.load_memory(open(path, 'rb'))
+    assert load_test.read_u32(0x00) == 0xFF00BEEF
+    assert load_test.read_u32(0x100000) == 0x456789AB
+    # the empty parts of the file are not allocated
+    assert load_test.get_allocated_page_count() == 2
+
+
+def test_paged_memory_simulator():
+    list_file = ListFile()
+    list_file.load_from_json("""
+{
+    "data": {
+        "1024": "33fcabcd00aaaaaa",
+        "1032": "ffffffff"
+    },
+    "startingExecutionAddress": 1024,
+    "symbols": {}
+}
+    """)
+
+    image = PagedMemory()
+    image.load_list_file(list_file)
+
+    # run two simulators from copies of the same loaded image
+    for _ in range(2):
+        m68k = M68K(image.fork())
+        m68k.set_program_counter_value(list_file.starting_execution_address)
+        m68k.run()
+
+        assert m68k.halted
+        assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+
+    assert image.read_u16(0x00aaaaaa) == 0
@@ -0,0 +1,89 @@
+import pytest
+
+from easier68k.simulator.m68k import M68K, IllegalInstructionError, BUDGET_CHECK_INTERVAL
+from easier68k.simulator.memory import UnalignedMemoryAccessError
+from easier68k.core.enum.register import Register
+from easier68k.core.enum.stop_reason import StopReason
+from . import load_program
+
+# ADD.L D1, D0, a million times
+# there are no branches yet, so this is the closest thing to an endless loop
+LONG_PROGRAM = bytes.fromhex('d081') * 1000000
+
+
+def _load_long(m68k: M68K):
+    m68k.memory.write_bytes(1024, LONG_PROGRAM)
+    m68k.set_program_counter_value(1024)
+    m68k.set_register_int(Register.D1, 1)
+
+
+@pytest.mark.parametrize('use_block_engine', [False, True])
+def test_instruction_limit(use_block_engine):
+    m68k = M68K()
+    _load_long(m68k)
+
+    assert m68k.run(use_block_engine, max_instructions=10) == StopReason.INSTRUCTION_LIMIT
+    assert StopReason.INSTRUCTION_LIMIT.is_budget_exhausted()
+    assert m68k.get_register_int(Register.D0) == 10
+    assert m68k.get_cycles() == 10 * 8
+
+    # the budget is counted from each call, and running can be continued
+    assert m68k.run(use_block_engine, max_instructions=5) == StopReason.INSTRUCTION_LIMIT
+    assert m68k.get_register_int(Register.D0) == 15
+
+    # long enough for the block engine to use whole blocks, but still exact
+    assert m68k.run(use_block_engine, max_instructions=1000) == StopReason.INSTRUCTION_LIMIT
+    assert m68k.get_register_int(Register.D0) == 1015
+
+
+def test_cycle_limit():
+    m68k = M68K()
+    _load_long(m68k)
+
+    assert m68k.run(max_cycles=1000) == StopReason.CYCLE_LIMIT
+    # only checked every so often
+    assert 1000 <= m68k.get_cycles() < 1000 + BUDGET_CHECK_INTERVAL * 8
+
+
+def test_timeout():
+    m68k = M68K()
+    _load_long(m68k)
+
+    assert m68k.run(timeout=0.01) == StopReason.TIMEOUT
+    assert m68k.clock_auto_cycle
+    assert not m68k.halted
+
+
+def test_stop_reasons():
+    m68k = M68K()
+    # MOVE.L #$12345678, D1
+    # SIMHALT
+    load_program(m68k, {1024: '223c12345678' + 'ffffffff'}, 1024)
+    m68k.add_breakpoint(1030)
+
+    assert m68k.run(max_instructions=100) == StopReason.BREAKPOINT
+    assert m68k.resume() == StopReason.HALTED
+    assert m68k.run() == StopReason.HALTED
+
+    m68k = M68K()
+    load_program(m68k, {1024: '223c12345678' + 'ffffffff'}, 1024)
+    m68k.clock_auto_cycle = False
+    assert m68k.run() == StopReason.PAUSED
+    assert m68k.get_register_int(Register.D1) == 0x12345678
+
+
+def test_errors():
+    m68k = M68K()
+    # MOVE.W D0, (A0)
+    load_program(m68k, {1024: '3080'}, 1024)
+    m68k.set_register_int(Register.A0, 1)
+
+    assert m68k.run(timeout=10) == StopReason.ERROR
+    assert isinstance(m68k.last_error, UnalignedMemoryAccessError)
+    assert not m68k.clock_auto_cycle
+
+    # an instruction that can't be decoded stops execution instead of looping forever
+    m68k = M68K()
+    load_program(m68k, {1024: 'a000'}, 1024)
+    assert m68k.run() == StopReason.ERROR
+    assert isinstance(m68k.last_error, IllegalInstructionError)
@@ -0,0 +1,85 @@
+import pytest
+
+from easier68k.simulator.m68k import M68K
+from easier68k.simulator.paged_memory import PagedMemory
+from easier68k.core.enum.register import Register
+from easier68k.core.enum.condition_status_code import ConditionStatusCode
+from . import load_program
+
+
+def test_snapshot_restore():
+    m68k = M68K()
+    load_program(m68k, {1024: '33fcabcd00aaaaaa', 1032: 'ffffffff'}, 1024)
+    m68k.set_register_int(Register.D1, 0x1234)
+
+    snap = m68k.snapshot()
+
+    # run the program to change memory, the PC and the halted flag
+    m68k.set_register_int(Register.D1, 0x5678)
+    m68k.set_condition_status_code(ConditionStatusCode.Z, True)
+    m68k.run()
+    assert m68k.halted
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+    # only the pages which were written are saved
+    assert len(snap.saved_pages) == 1
+
+    m68k.restore(snap)
+    assert not m68k.halted
+    assert m68k.get_program_counter_value() == 1024
+    assert m68k.get_register_int(Register.D1) == 0x1234
+    assert not m68k.get_condition_status_code(ConditionStatusCode.Z)
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0
+    assert snap.saved_pages == {}
+
+    # the same snapshot can be restored again
+    m68k.clock_auto_cycle = True
+    m68k.run()
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0xABCD
+    m68k.restore(snap)
+    assert m68k.memory.read_u16(0x00aaaaaa) == 0
+
+
+def test_snapshot_restore_older():
+    m68k = M68K(PagedMemory())
+
+    m68k.memory.write_u32(0x2000, 1)
+    first = m68k.snapshot()
+    m68k.memory.write_u32(0x2000, 2)
+    m68k.memory.write_u32(0x9000, 2)
+    second = m68k.snapshot()
+    m68k.memory.write_u32(0x2000, 3)
+
+    m68k.restore(second)
+    assert m68k.memory.read_u32(0x2000) == 2
+    assert m68k.memory.read_u32(0x9000) == 2
+
+    m68k.memory.write_u32(0x2000, 4)
+    m68k.restore(first)
+    assert m68k.memory.read_u32(0x2000) == 1
+    assert m68k.memory.read_u32(0x9000) == 0
+
+    # snapshots made after the one restored are gone
+    with pytest.raises(AssertionError):
+        m68k.restore(second)
+
+    m68k.clear_snapshots()
+    with pytest.raises(AssertionError):
+        m68k.restore(first)
+
+
+def test_snapshot_restore_code():
+    """
+    Restoring overwritten code must not run the cached instructions
+    """
+    m68k = M68K()
+    load_program(m68k, {1024: '33fcabcd00aaaaaa', 1032: 'ffffffff'}, 1024)
+    snap = m68k.snapshot()
+
+    m68k.step_instruction()
+    # overwrite the SIMHALT with another MOVE
+    m68k.memory.write_bytes(1032, bytes.fromhex('33fcabcd00aaaaaa'))
+
+    m68k.restore(snap)
+    m68k.run(use_block_engine=True)
+    assert m68k.halted
+    assert m68k.get_program_counter_value() == 1036
@@ -0,0 +1,88 @@
+import pytest
+
+from easier68k.batch import BatchJob, BatchWorker, run_job, run_batch
+from easier68k.core.models.list_file import ListFile
+from easier68k.core.enum.register import Register
+from easier68k.core.enum.stop_reason import StopReason
+from easier68k.core.enum.trap_task import TrapTask
+
+
+def _list_file() -> ListFile:
+    # TRAP #15
+    # ADD.L D1, D2
+    # SIMHALT
+    list_file = ListFile()
+    list_file.insert_data(1024, '4e4f' + 'd481' + 'ffffffff')
+    list_file.set_starting_execution_address(1024)
+    return list_file
+
+
+def _job(character: str, memory: dict = None) -> BatchJob:
+    return BatchJob(_list_file(), registers={
+        Register.D0: TrapTask.DisplaySingleCharacter,
+        Register.D1: ord(character)
+    }, memory=memory)
+
+
+def test_batch_worker():
+    worker = BatchWorker()
+
+    first = worker.run(_job('a'))
+    assert first.stop_reason == StopReason.HALTED
+    assert first.output == 'a'
+    assert first.get_register(Register.D2) == ord('a')
+    assert first.error is None
+
+    # the simulator is reset between jobs
+    second = worker.run(_job('b', {0x2000: b'\x01\x02'}))
+    assert second.output == 'b'
+    assert second.get_register(Register.D2) == ord('b')
+    assert second.cycles == first.cycles
+    assert second.memory_digest != first.memory_digest
+
+    # putting memory back the way it was gives the same digest
+    third = worker.run(_job('c', {0x2000: b'\x00\x00'}))
+    assert third.memory_digest == first.memory_digest
+
+    # an endless program is stopped by its budget
+    list_file = ListFile()
+    list_file.insert_data(1024, 'd481' * 100)
+    list_file.set_starting_execution_address(1024)
+    result = worker.run(BatchJob(list_file, max_instructions=10))
+    assert result.stop_reason == StopReason.INSTRUCTION_LIMIT
+    assert result.memory_digest != first.memory_digest
+
+    result = worker.run(BatchJob(list_file, max_instructions=1000))
+    assert result.stop_reason == StopReason.ERROR
+    assert 'IllegalInstructionError' in result.error
+
+
+def test_run_job():
+    assert run_job(_job('x')).output == 'x'
+
+
+def test_run_batch():
+    characters = 'easier68k'
+    results = run_batch([_job(c) for c in characters], max_workers=2, chunksize=2)
+
+    assert ''.join(result.output for result in results) == characters
+    assert all(result.stop_reason == StopReason.HALTED for result in results)
+    assert len(set(result.memory_digest for result in results)) == 1
+
+
+def test_run_batch_from_buffer():
+    # the segments of a list file loaded from the binary format are views of the buffer
+    list_file = ListFile.from_buffer(_list_file().to_bytes())
+    jobs = [BatchJob(list_file, registers={
+        Register.D0: TrapTask.DisplaySingleCharacter,
+        Register.D1: ord(c)
+    }) for c in 'ab']
+    results = run_batch(jobs, max_workers=1)
+
+    assert [result.output for result in results] == ['a', 'b']
+    assert all(result.stop_reason == StopReason.HALTED for result in results)
+
+
+def test_job_needs_list_file():
+    with pytest.raises(AssertionError):
+        BatchJob(_list_file().to_bytes())
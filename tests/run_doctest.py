@@ -15,6 +15,8 @@ test_modules = [
     'easier68k.core.util.conversions',
     'easier68k.core.util.parsing',
     'easier68k.core.util.split_bits',
+    'easier68k.core.util.find_module',
+    'easier68k.core.util.opcode_registry',
     'easier68k.assembler.assembler',
     'easier68k.core.opcodes.move',
     'easier68k.core.opcodes.movea',
@@ -38,7 +40,8 @@ test_modules = [
     'easier68k.core.util.opcode_util',
     'easier68k.core.enum.op_size',
     'easier68k.core.opcodes.cmp',
-    'easier68k.core.opcodes.cmpi'
+    'easier68k.core.opcodes.cmpi',
+    'easier68k.core.enum.stop_reason'
 ]
 
 def load_tests(tests):